@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 
+from backend.api.lifespan import lifespan
 from backend.api.routes import reportes
 
 
@@ -7,6 +8,7 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="ReporteSurtido · Reportes",
         version="2.0.0",
+        lifespan=lifespan,
     )
 
     # ─────────────────────────────────────────
@@ -0,0 +1,59 @@
+"""
+Compresión de respuestas de la API.
+
+RESPONSABILIDAD:
+- Elegir codificación según Accept-Encoding
+  (brotli si está instalado, si no gzip)
+- Comprimir cuerpos YA serializados
+
+NO CONTIENE:
+- Lógica de negocio
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Cuerpos más chicos no se comprimen (no compensa)
+MINIMO_BYTES = 1024
+
+NIVEL_GZIP = 6
+CALIDAD_BROTLI = 5
+
+
+def _aceptadas(accept_encoding: str) -> set:
+    """
+    Codificaciones aceptadas por el cliente (sin las q=0).
+    """
+    aceptadas = set()
+
+    for parte in (accept_encoding or "").split(","):
+        nombre, _, params = parte.strip().partition(";")
+        q = params.strip().replace(" ", "")
+        if nombre and q not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            aceptadas.add(nombre.strip().lower())
+
+    return aceptadas
+
+
+def comprimir(cuerpo: bytes, accept_encoding: str):
+    """
+    Devuelve (cuerpo, codificación); codificación None =
+    sin comprimir.
+    """
+    if len(cuerpo) < MINIMO_BYTES:
+        return cuerpo, None
+
+    aceptadas = _aceptadas(accept_encoding)
+
+    if brotli and "br" in aceptadas:
+        return brotli.compress(cuerpo, quality=CALIDAD_BROTLI), "br"
+
+    if "gzip" in aceptadas:
+        return gzip.compress(cuerpo, compresslevel=NIVEL_GZIP, mtime=0), "gzip"
+
+    return cuerpo, None
@@ -15,8 +15,13 @@ NO HACE:
 
 GRAFO CORRECTO:
 MongoClientProvider → ReportesQueries → ReportesService
+
+⚠️ El MongoClientProvider es ÚNICO por proceso
+(se crea en el lifespan de la app). Aquí solo se reutiliza.
 """
 
+import os
+
 # ─────────────────────────────────────────
 # DB PROVIDER (SOLO LECTURA)
 # ─────────────────────────────────────────
@@ -26,12 +31,11 @@ from backend.db.mongo.client import MongoClientProvider
 
 def get_database() -> MongoClientProvider:
     """
-    Devuelve el proveedor Mongo en modo SOLO LECTURA.
+    Devuelve el proveedor Mongo COMPARTIDO en modo SOLO LECTURA.
+
+    NO crea conexiones: reutiliza el pool abierto en el lifespan.
     """
-    print("\n🔗 [dependencies] get_database()")
-    provider = get_db()
-    print("   ✔ MongoClientProvider listo")
-    return provider
+    return get_db()
 
 
 # ─────────────────────────────────────────
@@ -61,7 +65,29 @@ def get_reportes_queries() -> ReportesQueries:
 # ─────────────────────────────────────────
 # SERVICE (ORQUESTADOR)
 # ─────────────────────────────────────────
-from backend.services.reportes.service import ReportesService
+from backend.services.reportes.service import (
+    ReportesService,
+    MODO_DETALLE,
+    TAMANO_LOTE,
+    LIMITE_MEMORIA_MB,
+)
+
+
+def _opciones_service() -> dict:
+    """
+    Configuración del service leída del entorno.
+
+    - REPORTES_MODO: "detalle" | "diario" | "streaming"
+    - REPORTES_TAMANO_LOTE: filas por lote (streaming)
+    - REPORTES_LIMITE_MEMORIA_MB: techo de memoria (streaming)
+    """
+    return {
+        "modo": os.getenv("REPORTES_MODO", MODO_DETALLE),
+        "tamano_lote": int(os.getenv("REPORTES_TAMANO_LOTE", TAMANO_LOTE)),
+        "limite_memoria_mb": float(
+            os.getenv("REPORTES_LIMITE_MEMORIA_MB", LIMITE_MEMORIA_MB)
+        ),
+    }
 
 
 def get_reportes_service() -> ReportesService:
@@ -70,12 +96,109 @@ def get_reportes_service() -> ReportesService:
 
     Inyecta:
     - ReportesQueries (lectura Mongo)
+    - Configuración de carga (ver _opciones_service)
+    - Caches de resultados y de cubos por día compartidos
     """
     print("\n🧠 [dependencies] get_reportes_service()")
 
     queries = get_reportes_queries()
 
-    service = ReportesService(reportes_queries=queries)
+    service = ReportesService(
+        reportes_queries=queries,
+        cache=get_cache_resultados(),
+        cache_dias=get_cache_dias(),
+        **_opciones_service(),
+    )
 
     print("   ✔ ReportesService listo")
     return service
+
+
+# ─────────────────────────────────────────
+# VARIANTE ASYNC (PyMongo async)
+# ─────────────────────────────────────────
+from backend.db.factory import get_db_async
+from backend.db.mongo.async_client import AsyncMongoClientProvider
+from backend.db.mongo.reportes.async_queries import AsyncReportesQueries
+from backend.services.reportes.async_service import AsyncReportesService
+
+
+def get_database_async() -> AsyncMongoClientProvider:
+    """
+    Devuelve el proveedor Mongo async COMPARTIDO (solo lectura).
+    """
+    return get_db_async()
+
+
+def get_reportes_service_async() -> AsyncReportesService:
+    """
+    Proveedor del servicio de reportes asíncrono.
+
+    Inyecta:
+    - AsyncReportesQueries (lectura Mongo async)
+    - Configuración de carga (ver _opciones_service)
+    - Caches de resultados y de cubos por día compartidos
+    """
+    queries = AsyncReportesQueries(get_database_async())
+
+    return AsyncReportesService(
+        reportes_queries=queries,
+        cache=get_cache_resultados(),
+        cache_dias=get_cache_dias(),
+        **_opciones_service(),
+    )
+
+
+# ─────────────────────────────────────────
+# CACHE DE DIMENSIONES
+# ─────────────────────────────────────────
+from backend.db.mongo.reportes.cache import CacheDimensiones, cache_dimensiones
+
+
+def get_cache_dimensiones() -> CacheDimensiones:
+    """
+    Cache de personas / asignaciones COMPARTIDO por proceso.
+    """
+    return cache_dimensiones
+
+
+# ─────────────────────────────────────────
+# CACHES DE RESULTADOS / DÍAS
+# ─────────────────────────────────────────
+from backend.services.reportes.cache import (
+    CacheDias,
+    CacheResultados,
+    cache_dias,
+    cache_resultados,
+)
+
+
+def get_cache_resultados() -> CacheResultados:
+    """
+    Cache de payloads de reportes COMPARTIDO por proceso.
+    """
+    return cache_resultados
+
+
+def get_cache_dias() -> CacheDias:
+    """
+    Cache de cubos parciales por día COMPARTIDO por proceso.
+    """
+    return cache_dias
+
+
+# ─────────────────────────────────────────
+# PRECALENTADO DE CACHE
+# ─────────────────────────────────────────
+from backend.services.reportes.precalentado import (
+    PrecalentadorReportes,
+    precalentador,
+)
+
+
+def get_precalentador() -> PrecalentadorReportes:
+    """
+    Precalentador de reportes COMPARTIDO por proceso
+    (se inicia en el lifespan).
+    """
+    return precalentador
@@ -0,0 +1,48 @@
+"""
+Ciclo de vida de la aplicación.
+
+RESPONSABILIDAD:
+- Abrir los proveedores Mongo compartidos al arrancar
+  (sync para rutas normales, async para rutas async)
+- Cerrarlos limpiamente al apagar
+- Iniciar / detener el precalentado del cache de reportes
+
+Todos los requests reutilizan el mismo pool de conexiones.
+"""
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from backend.api.dependencies import get_precalentador, get_reportes_service
+from backend.db.factory import (
+    iniciar_db,
+    cerrar_db,
+    iniciar_db_async,
+    cerrar_db_async,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ─────────────────────────
+    # ARRANQUE
+    # ─────────────────────────
+    print("\n🚀 [lifespan] Iniciando proveedor Mongo compartido")
+    app.state.db = iniciar_db()
+    app.state.db_async = iniciar_db_async()
+
+    # Precalentado del cache (tarea de fondo, usa el pool sync)
+    precalentador = get_precalentador()
+    precalentador.iniciar(get_reportes_service)
+
+    yield
+
+    # ─────────────────────────
+    # APAGADO
+    # ─────────────────────────
+    await precalentador.detener()
+
+    print("\n🛑 [lifespan] Cerrando proveedores Mongo")
+    await cerrar_db_async()
+    cerrar_db()
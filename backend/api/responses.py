@@ -0,0 +1,125 @@
+"""
+Respuestas HTTP de la API.
+
+RESPONSABILIDAD:
+- Serializar payloads de reportes con serializar_json
+  (orjson si está instalado, json estándar si no)
+- Serializar payloads en Arrow IPC (clientes analíticos,
+  pyarrow opcional)
+- Comprimir según Accept-Encoding (ver compresion.py)
+- Codificar la tabla en streaming (NDJSON / CSV) bloque a bloque
+
+NO CONTIENE:
+- Lógica de negocio
+"""
+
+import csv
+import io
+
+from fastapi.responses import JSONResponse, Response
+
+from backend.api.compresion import comprimir
+from backend.services.reportes.utils.arrow import (
+    MEDIA_TYPE_ARROW,
+    serializar_arrow,
+)
+from backend.services.reportes.utils.json import serializar_json
+
+
+def _comprimir_respuesta(respuesta: Response, accept_encoding: str) -> None:
+    """
+    Comprime el body ya renderizado y ajusta los headers.
+    """
+    respuesta.headers["vary"] = "Accept-Encoding"
+
+    respuesta.body, codificacion = comprimir(respuesta.body, accept_encoding)
+    if codificacion:
+        respuesta.headers["content-encoding"] = codificacion
+        respuesta.headers["content-length"] = str(len(respuesta.body))
+
+
+class ReporteJSONResponse(JSONResponse):
+    """
+    JSONResponse con serializador nativo.
+
+    Acepta el payload (dict / list) o bytes YA serializados
+    (p.ej. serializados en un hilo aparte).
+
+    accept_encoding: header Accept-Encoding del request
+    ("" = sin comprimir).
+    """
+
+    def __init__(self, content, *args, accept_encoding: str = "", **kwargs):
+        super().__init__(content, *args, **kwargs)
+        _comprimir_respuesta(self, accept_encoding)
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return serializar_json(content)
+
+
+class ReporteArrowResponse(Response):
+    """
+    Payload de reporte (formato "columnas") como Arrow IPC:
+    un stream por sección (ver utils/arrow.py).
+
+    Requiere pyarrow; acepta también bytes YA serializados.
+    """
+
+    media_type = MEDIA_TYPE_ARROW
+
+    def __init__(self, content, *args, accept_encoding: str = "", **kwargs):
+        super().__init__(content, *args, **kwargs)
+        _comprimir_respuesta(self, accept_encoding)
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return serializar_arrow(content)
+
+
+# ─────────────────────────────
+# TABLA EN STREAMING
+# ─────────────────────────────
+# Orden de columnas del CSV (las dimensiones ausentes van vacías)
+COLUMNAS_TABLA = (
+    "fecha",
+    "zona",
+    "pasillo",
+    "persona_id",
+    "persona",
+    "devoluciones",
+    "piezas",
+    "importe",
+)
+
+
+def ndjson_por_bloques(bloques):
+    """
+    Bloques de filas → un chunk NDJSON por bloque
+    (un objeto JSON por línea).
+    """
+    for filas in bloques:
+        yield b"".join(serializar_json(fila) + b"\n" for fila in filas)
+
+
+def csv_por_bloques(bloques):
+    """
+    Bloques de filas → chunks CSV (cabecera en el primero).
+    None / dimensión ausente → celda vacía.
+    """
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\n")
+
+    escritor.writerow(COLUMNAS_TABLA)
+    yield buffer.getvalue().encode("utf-8")
+
+    for filas in bloques:
+        buffer.seek(0)
+        buffer.truncate()
+
+        escritor.writerows(
+            [fila.get(col) for col in COLUMNAS_TABLA] for fila in filas
+        )
+        yield buffer.getvalue().encode("utf-8")
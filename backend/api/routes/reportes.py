@@ -5,7 +5,10 @@ RESPONSABILIDAD:
 - Recibir parámetros HTTP
 - Validar entrada mínima
 - Delegar a ReportesService.generar()
-- Devolver JSON serializado
+- Devolver JSON serializado (comprimido si el cliente lo acepta)
+- Accept: application/vnd.apache.arrow.stream → Arrow IPC
+- GET: ETag + If-None-Match → 304 sin recalcular
+- GET /tabla: tabla de detalle en streaming (NDJSON / CSV)
 
 NO CONTIENE:
 - Lógica de negocio
@@ -13,15 +16,35 @@ NO CONTIENE:
 - Pandas / numpy como dependencia lógica
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+import asyncio
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from datetime import datetime, date
 from decimal import Decimal
 
-from backend.api.dependencies import get_reportes_service
-from backend.api.schemas.reportes import ReportesFiltros
-from backend.services.reportes.service import ReportesService
-from backend.services.reportes.utils.json import limpiar_json
+from backend.api.dependencies import (
+    get_cache_dimensiones,
+    get_cache_dias,
+    get_cache_resultados,
+    get_precalentador,
+    get_reportes_service,
+    get_reportes_service_async,
+)
+from backend.api.responses import (
+    ReporteArrowResponse,
+    ReporteJSONResponse,
+    csv_por_bloques,
+    ndjson_por_bloques,
+)
+from backend.api.schemas.reportes import FormatoSeries, ReportesFiltros, Seccion
+from backend.db.mongo.reportes.cache import CacheDimensiones
+from backend.services.reportes.service import FORMATO_COLUMNAS, ReportesService
+from backend.services.reportes.async_service import AsyncReportesService
+from backend.services.reportes.cache import CacheDias, CacheResultados
+from backend.services.reportes.precalentado import PrecalentadorReportes
+from backend.services.reportes.utils.arrow import MEDIA_TYPE_ARROW, pa
 
 
 router = APIRouter(tags=["Reportes"])
@@ -46,12 +69,88 @@ def _serialize_data(data):
     return data
 
 
+# ─────────────────────────────
+# ETAG / CACHE HTTP
+# ─────────────────────────────
+# El navegador guarda la respuesta pero revalida siempre
+CACHE_CONTROL = "private, no-cache"
+
+
+def _coincide_etag(if_none_match: str | None, etag: str | None) -> bool:
+    """
+    Comparación débil de If-None-Match (lista de ETags o "*").
+    """
+    if not if_none_match or not etag:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaco(valor):
+        valor = valor.strip()
+        return valor[2:] if valor.startswith("W/") else valor
+
+    return any(
+        opaco(candidato) == opaco(etag)
+        for candidato in if_none_match.split(",")
+    )
+
+
+def _etag_reporte(service: ReportesService, arrow: bool, **argumentos) -> str | None:
+    """
+    ETag del service; Arrow lleva uno propio por representación.
+    """
+    etag = service.etag(**argumentos)
+    return etag[:-1] + '-arrow"' if etag and arrow else etag
+
+
+# ─────────────────────────────
+# NEGOCIACIÓN DE FORMATO (JSON / ARROW)
+# ─────────────────────────────
+def _quiere_arrow(request: Request) -> bool:
+    """
+    True si el cliente pide Arrow IPC (Accept).
+    Sin pyarrow instalado → 406.
+    """
+    if MEDIA_TYPE_ARROW not in request.headers.get("accept", ""):
+        return False
+
+    if pa is None:
+        raise HTTPException(
+            status_code=406,
+            detail="Formato Arrow no disponible: pyarrow no está instalado",
+        )
+
+    return True
+
+
+def _respuesta(resultado, request: Request, arrow: bool, headers=None):
+    """
+    Payload → respuesta HTTP en el formato negociado.
+
+    Los resultados con "error" siempre salen como JSON.
+    """
+    clase = (
+        ReporteArrowResponse
+        if arrow and not resultado.get("error")
+        else ReporteJSONResponse
+    )
+
+    return clase(
+        content=resultado,
+        status_code=200,
+        headers=headers,
+        accept_encoding=request.headers.get("accept-encoding", ""),
+    )
+
+
 # ─────────────────────────────
 # ENDPOINT
 # ─────────────────────────────
 @router.post("", summary="Generar reportes")
 def generar_reportes(
     filtros: ReportesFiltros,
+    request: Request,
     service: ReportesService = Depends(get_reportes_service),
 ):
     """
@@ -59,8 +158,13 @@ def generar_reportes(
     {
         "desde": "YYYY-MM-DD",
         "hasta": "YYYY-MM-DD",
-        "agrupar": "Dia | Semana | Mes | Anio"
+        "agrupar": "Dia | Semana | Mes | Anio",
+        "secciones": ["general", ...],  (opcional; default: todas)
+        "formato": "filas | columnas"   (opcional; default: filas)
     }
+
+    Accept: application/vnd.apache.arrow.stream → Arrow IPC
+    (una tabla por sección; ver utils/arrow.py).
     """
 
     # ─────────────────────────
@@ -72,6 +176,8 @@ def generar_reportes(
             detail="La fecha 'desde' no puede ser mayor que 'hasta'",
         )
 
+    arrow = _quiere_arrow(request)
+
     # ─────────────────────────
     # Delegar a Service
     # ─────────────────────────
@@ -80,12 +186,265 @@ def generar_reportes(
         hasta=filtros.hasta,
         agrupar=filtros.agrupar,
         kpis=filtros.kpis if hasattr(filtros, "kpis") else None,
+        secciones=filtros.secciones,
+        formato=FORMATO_COLUMNAS if arrow else filtros.formato,
     )
 
     # ─────────────────────────
     # Respuesta serializada
     # ─────────────────────────
-    return JSONResponse(
-        content=limpiar_json(resultado),
-        status_code=200
+    return _respuesta(resultado, request, arrow)
+
+
+# ─────────────────────────────
+# ENDPOINT GET (CACHEABLE)
+# ─────────────────────────────
+@router.get("", summary="Generar reportes (GET con ETag)")
+def generar_reportes_get(
+    request: Request,
+    desde: date,
+    hasta: date,
+    agrupar: Literal["Dia", "Semana", "Mes", "Anio"],
+    secciones: Optional[List[Seccion]] = Query(None),
+    formato: FormatoSeries = "filas",
+    service: ReportesService = Depends(get_reportes_service),
+):
+    """
+    Mismo contrato que POST /reportes, por query string:
+
+        ?desde=YYYY-MM-DD&hasta=YYYY-MM-DD&agrupar=Mes
+        &secciones=general&secciones=tabla   (opcional)
+        &formato=columnas                      (opcional)
+
+    - Responde con ETag de la entrada del cache de resultados
+      que se sirve (caduca con ella: TTL del cache)
+    - If-None-Match vigente → 304 SIN recalcular el reporte
+    - Accept Arrow → Arrow IPC (ETag propio por representación)
+    """
+
+    # ─────────────────────────
+    # Validación mínima
+    # ─────────────────────────
+    if desde > hasta:
+        raise HTTPException(
+            status_code=400,
+            detail="La fecha 'desde' no puede ser mayor que 'hasta'",
+        )
+
+    arrow = _quiere_arrow(request)
+    if arrow:
+        formato = FORMATO_COLUMNAS
+
+    # ─────────────────────────
+    # Revalidación (sin recalcular)
+    # ─────────────────────────
+    argumentos = {
+        "desde": desde,
+        "hasta": hasta,
+        "agrupar": agrupar,
+        "secciones": secciones,
+        "formato": formato,
+    }
+
+    etag = _etag_reporte(service, arrow, **argumentos)
+
+    cabeceras = {"cache-control": CACHE_CONTROL}
+
+    if _coincide_etag(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=304,
+            headers={
+                **cabeceras,
+                "etag": etag,
+                "vary": "Accept, Accept-Encoding",
+            },
+        )
+
+    # ─────────────────────────
+    # Delegar a Service
+    # ─────────────────────────
+    resultado = service.generar(**argumentos)
+
+    # ETag del payload servido (None si no quedó en cache)
+    etag = _etag_reporte(service, arrow, resultado=resultado, **argumentos)
+    if etag:
+        cabeceras["etag"] = etag
+
+    respuesta = _respuesta(resultado, request, arrow, headers=cabeceras)
+    respuesta.headers["vary"] = "Accept, Accept-Encoding"
+
+    return respuesta
+
+
+# ─────────────────────────────
+# TABLA EN STREAMING
+# ─────────────────────────────
+@router.get("/tabla", summary="Tabla de detalle en streaming (NDJSON / CSV)")
+def tabla_streaming(
+    desde: date,
+    hasta: date,
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    service: ReportesService = Depends(get_reportes_service),
+):
+    """
+    Filas de la tabla de detalle (fecha, zona, pasillo, persona
+    + KPIs), las mismas que la sección "tabla" con agrupar=Dia.
+
+    - Se emiten por bloques de días a medida que se agregan:
+      primer byte sin esperar al rango completo y memoria
+      acotada por bloque
+    - ndjson: un objeto JSON por línea
+    - csv: cabecera + una fila por línea
+    """
+
+    # ─────────────────────────
+    # Validación mínima
+    # ─────────────────────────
+    if desde > hasta:
+        raise HTTPException(
+            status_code=400,
+            detail="La fecha 'desde' no puede ser mayor que 'hasta'",
+        )
+
+    bloques = service.tabla_por_bloques(desde, hasta)
+
+    if formato == "csv":
+        return StreamingResponse(
+            csv_por_bloques(bloques),
+            media_type="text/csv; charset=utf-8",
+            headers={
+                "content-disposition":
+                    f'attachment; filename="tabla_{desde}_{hasta}.csv"',
+            },
+        )
+
+    return StreamingResponse(
+        ndjson_por_bloques(bloques),
+        media_type="application/x-ndjson",
+    )
+
+
+# ─────────────────────────────
+# ENDPOINT ASYNC
+# ─────────────────────────────
+@router.post("/async", summary="Generar reportes (async)")
+async def generar_reportes_async(
+    filtros: ReportesFiltros,
+    request: Request,
+    service: AsyncReportesService = Depends(get_reportes_service_async),
+):
+    """
+    Mismo contrato que POST /reportes.
+
+    - Las lecturas Mongo se esperan sin ocupar un hilo
+    - pandas, la serialización (JSON / Arrow) y la compresión corren
+      en un hilo aparte
+    """
+
+    # ─────────────────────────
+    # Validación mínima
+    # ─────────────────────────
+    if filtros.desde > filtros.hasta:
+        raise HTTPException(
+            status_code=400,
+            detail="La fecha 'desde' no puede ser mayor que 'hasta'",
+        )
+
+    arrow = _quiere_arrow(request)
+
+    # ─────────────────────────
+    # Delegar a Service
+    # ─────────────────────────
+    resultado = await service.generar(
+        desde=filtros.desde,
+        hasta=filtros.hasta,
+        agrupar=filtros.agrupar,
+        kpis=filtros.kpis if hasattr(filtros, "kpis") else None,
+        secciones=filtros.secciones,
+        formato=FORMATO_COLUMNAS if arrow else filtros.formato,
     )
+
+    # ─────────────────────────
+    # Respuesta serializada
+    # ─────────────────────────
+    return await asyncio.to_thread(_respuesta, resultado, request, arrow)
+
+
+# ─────────────────────────────
+# CACHE DE DIMENSIONES
+# ─────────────────────────────
+@router.get("/cache/dimensiones", summary="Estado del cache de dimensiones")
+def estado_cache_dimensiones(
+    cache: CacheDimensiones = Depends(get_cache_dimensiones),
+):
+    """
+    Aciertos / fallos y edad de cada entrada (personas, asignaciones).
+    """
+    return cache.stats()
+
+
+@router.delete("/cache/dimensiones", summary="Invalidar cache de dimensiones")
+def invalidar_cache_dimensiones(
+    cache: CacheDimensiones = Depends(get_cache_dimensiones),
+    resultados: CacheResultados = Depends(get_cache_resultados),
+    dias: CacheDias = Depends(get_cache_dias),
+):
+    """
+    Fuerza releer personas / asignaciones en el próximo reporte
+    (p.ej. tras cambiar asignaciones de pasillo).
+
+    También descarta resultados y cubos por día cacheados:
+    dependen de las asignaciones.
+    """
+    cache.invalidar()
+    resultados.invalidar()
+    dias.invalidar()
+    return cache.stats()
+
+
+# ─────────────────────────────
+# CACHE DE RESULTADOS
+# ─────────────────────────────
+@router.get("/cache", summary="Estado del cache de resultados")
+def estado_cache_resultados(
+    cache: CacheResultados = Depends(get_cache_resultados),
+):
+    """
+    Aciertos / fallos / desalojos y edad + TTL de cada reporte cacheado.
+    """
+    return cache.stats()
+
+
+@router.delete("/cache", summary="Vaciar cache de resultados")
+def invalidar_cache_resultados(
+    cache: CacheResultados = Depends(get_cache_resultados),
+    dias: CacheDias = Depends(get_cache_dias),
+):
+    """
+    Descarta todos los reportes cacheados (p.ej. tras corregir
+    datos de un periodo cerrado), incluidos los cubos por día.
+    """
+    cache.invalidar()
+    dias.invalidar()
+    return cache.stats()
+
+
+@router.get("/cache/dias", summary="Estado del cache de cubos por día")
+def estado_cache_dias(
+    cache: CacheDias = Depends(get_cache_dias),
+):
+    """
+    Aciertos / fallos por día, días guardados y rango cubierto.
+    """
+    return cache.stats()
+
+
+@router.get("/cache/precalentado", summary="Estado del precalentado de cache")
+def estado_precalentado(
+    precalentador: PrecalentadorReportes = Depends(get_precalentador),
+):
+    """
+    Configuración del precalentado, última vuelta y cada clave
+    calentada con su edad / vigencia en el cache de resultados.
+    """
+    return precalentador.estado()
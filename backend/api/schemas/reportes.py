@@ -7,13 +7,43 @@ from datetime import date
 # FILTROS DE ENTRADA
 # ─────────────────────────────
 
+Seccion = Literal[
+    "general",
+    "por_zona",
+    "por_pasillo",
+    "por_persona",
+    "personas_series",
+    "tabla",
+]
+
+# Formato de las series (general / por_zona / por_pasillo /
+# personas_series): "filas" = un dict por punto (contrato
+# original); "columnas" = arreglos paralelos por KPI y
+# matrices persona × punto
+FormatoSeries = Literal["filas", "columnas"]
+
+
 class ReportesFiltros(BaseModel):
     """
     Filtros enviados desde el frontend.
+
+    secciones: secciones a calcular (None = todas). Cada vista
+    pide solo lo que pinta:
+    - general   → ["general"]
+    - pasillos  → ["por_pasillo"]
+    - zonas     → ["por_zona"]
+    - personas  → ["por_persona"]
+    - detalle   → ["tabla"]
+    kpis / resumen / personas siempre se devuelven.
+
+    formato: "columnas" para vistas con muchas gráficas
+    (payload más chico); default "filas".
     """
     desde: date
     hasta: date
     agrupar: Literal["Dia", "Semana", "Mes", "Anio"]
+    secciones: Optional[List[Seccion]] = None
+    formato: FormatoSeries = "filas"
 
 
 # ─────────────────────────────
@@ -1,8 +1,10 @@
 import os
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
 
 from backend.db.mongo.client import MongoClientProvider
+from backend.db.mongo.async_client import AsyncMongoClientProvider
 
 
 # ─────────────────────────────────────────────
@@ -15,16 +17,51 @@ load_dotenv(dotenv_path=ENV_PATH)
 
 
 # ─────────────────────────────────────────────
-# DB PROVIDER (SOLO LECTURA)
+# PROVIDER COMPARTIDO (UNO POR PROCESO)
 # ─────────────────────────────────────────────
-def get_db() -> MongoClientProvider:
+_provider: MongoClientProvider | None = None
+_provider_async: AsyncMongoClientProvider | None = None
+_lock = threading.Lock()
+
+
+def _env_int(nombre: str, default: int | None) -> int | None:
+    valor = os.getenv(nombre)
+    if valor is None or not valor.strip():
+        return default
+    return int(valor)
+
+
+def _opciones_pool() -> dict:
     """
-    Devuelve el proveedor Mongo para consultas de REPORTES.
-    
-    ❌ No expone repos
-    ❌ No permite escritura
-    ✅ Solo acceso a colecciones
+    Opciones del pool leídas del entorno.
+
+    Variables (todas opcionales):
+    - MONGO_MAX_POOL_SIZE                (default 50)
+    - MONGO_MIN_POOL_SIZE                (default 0)
+    - MONGO_SERVER_SELECTION_TIMEOUT_MS  (default 5000)
+    - MONGO_CONNECT_TIMEOUT_MS           (default 5000)
+    - MONGO_SOCKET_TIMEOUT_MS            (default sin límite)
+    - MONGO_COMPRESSORS                  (ej. "zstd,snappy,zlib")
     """
+    compresores = [
+        c.strip()
+        for c in os.getenv("MONGO_COMPRESSORS", "").split(",")
+        if c.strip()
+    ]
+
+    return {
+        "max_pool_size": _env_int("MONGO_MAX_POOL_SIZE", 50),
+        "min_pool_size": _env_int("MONGO_MIN_POOL_SIZE", 0),
+        "server_selection_timeout_ms": _env_int(
+            "MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000
+        ),
+        "connect_timeout_ms": _env_int("MONGO_CONNECT_TIMEOUT_MS", 5000),
+        "socket_timeout_ms": _env_int("MONGO_SOCKET_TIMEOUT_MS", None),
+        "compressors": compresores or None,
+    }
+
+
+def _uri_y_db() -> tuple[str, str]:
     uri = os.getenv("MONGO_URI")
     db_name = os.getenv("MONGO_DB")
 
@@ -33,4 +70,103 @@ def get_db() -> MongoClientProvider:
             "Variables de entorno MONGO_URI y MONGO_DB no definidas"
         )
 
-    return MongoClientProvider(uri, db_name)
+    return uri, db_name
+
+
+def crear_db() -> MongoClientProvider:
+    """
+    Crea un proveedor Mongo NUEVO con la configuración del entorno.
+
+    ⚠️ Cada llamada abre un pool propio.
+    Usar get_db() salvo que se necesite aislamiento explícito.
+    """
+    uri, db_name = _uri_y_db()
+    return MongoClientProvider(uri, db_name, **_opciones_pool())
+
+
+# ─────────────────────────────────────────────
+# DB PROVIDER (SOLO LECTURA)
+# ─────────────────────────────────────────────
+def iniciar_db() -> MongoClientProvider:
+    """
+    Crea el proveedor compartido si aún no existe.
+
+    Se llama desde el lifespan de la app (idempotente).
+    """
+    global _provider
+
+    with _lock:
+        if _provider is None:
+            _provider = crear_db()
+        return _provider
+
+
+def get_db() -> MongoClientProvider:
+    """
+    Devuelve el proveedor Mongo para consultas de REPORTES.
+
+    ❌ No expone repos
+    ❌ No permite escritura
+    ✅ Solo acceso a colecciones
+    ✅ Siempre el MISMO proveedor (pool compartido)
+    """
+    if _provider is not None:
+        return _provider
+
+    # Scripts / uso fuera de la app: inicialización perezosa
+    return iniciar_db()
+
+
+def cerrar_db() -> None:
+    """
+    Cierra el proveedor compartido (apagado de la app).
+    """
+    global _provider
+
+    with _lock:
+        if _provider is not None:
+            _provider.close()
+            _provider = None
+
+
+# ─────────────────────────────────────────────
+# DB PROVIDER ASYNC (SOLO LECTURA)
+# ─────────────────────────────────────────────
+def iniciar_db_async() -> AsyncMongoClientProvider:
+    """
+    Crea el proveedor async compartido si aún no existe.
+
+    ⚠️ Llamar desde el event loop (lifespan de la app).
+    """
+    global _provider_async
+
+    with _lock:
+        if _provider_async is None:
+            uri, db_name = _uri_y_db()
+            _provider_async = AsyncMongoClientProvider(
+                uri, db_name, **_opciones_pool()
+            )
+        return _provider_async
+
+
+def get_db_async() -> AsyncMongoClientProvider:
+    """
+    Devuelve el proveedor Mongo async compartido.
+    """
+    if _provider_async is not None:
+        return _provider_async
+
+    return iniciar_db_async()
+
+
+async def cerrar_db_async() -> None:
+    """
+    Cierra el proveedor async compartido (apagado de la app).
+    """
+    global _provider_async
+
+    provider = _provider_async
+    _provider_async = None
+
+    if provider is not None:
+        await provider.close()
@@ -0,0 +1,77 @@
+from pymongo import AsyncMongoClient
+from typing import Any, Dict, List
+
+
+class AsyncMongoClientProvider:
+    """
+    Proveedor ASÍNCRONO de acceso a MongoDB (SOLO LECTURA).
+
+    Usa la API async nativa de PyMongo (AsyncMongoClient).
+
+    RESPONSABILIDADES:
+    - Crear y cerrar la conexión (pool compartido por proceso)
+    - Exponer acceso controlado a colecciones
+    - NO escribir datos
+    - NO contener lógica de negocio
+
+    ⚠️ Debe crearse dentro del event loop (lifespan de la app).
+    """
+
+    # ─────────────────────────────
+    # 🔹 INIT
+    # ─────────────────────────────
+    def __init__(
+        self,
+        uri: str,
+        db_name: str,
+        *,
+        max_pool_size: int = 50,
+        min_pool_size: int = 0,
+        server_selection_timeout_ms: int = 5000,
+        connect_timeout_ms: int = 5000,
+        socket_timeout_ms: int | None = None,
+        compressors: List[str] | None = None,
+        app_name: str = "reportes-dashboard",
+    ):
+        print("\n🔌 [AsyncMongoClientProvider] Conectando a MongoDB (async)...")
+        print("   DB :", db_name)
+
+        opciones: Dict[str, Any] = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+            "serverSelectionTimeoutMS": server_selection_timeout_ms,
+            "connectTimeoutMS": connect_timeout_ms,
+            "appname": app_name,
+        }
+
+        if socket_timeout_ms:
+            opciones["socketTimeoutMS"] = socket_timeout_ms
+
+        if compressors:
+            opciones["compressors"] = ",".join(compressors)
+
+        self._client = AsyncMongoClient(uri, **opciones)
+        self._db = self._client[db_name]
+        self._cerrado = False
+
+        print("✅ [AsyncMongoClientProvider] Cliente creado")
+
+    # ─────────────────────────────
+    # 🔹 ACCESO GENÉRICO
+    # ─────────────────────────────
+    def get_collection(self, name: str):
+        """
+        Devuelve una colección async (AsyncCollection).
+        """
+        return self._db[name]
+
+    # ─────────────────────────────
+    # 🔹 LIFECYCLE
+    # ─────────────────────────────
+    async def close(self):
+        if self._cerrado:
+            return
+
+        print("\n🔌 [AsyncMongoClientProvider] Cerrando conexión MongoDB")
+        await self._client.close()
+        self._cerrado = True
@@ -13,23 +13,62 @@ class MongoClientProvider:
     - Ejecutar consultas find / aggregate
     - NO escribir datos
     - NO contener lógica de negocio
+
+    CICLO DE VIDA:
+    - Se crea UNA vez por proceso (lifespan de la app)
+    - El MongoClient interno mantiene un pool de conexiones
+      compartido por todos los requests
+    - close() se llama al apagar la app
     """
 
     # ─────────────────────────────
     # 🔹 INIT
     # ─────────────────────────────
-    def __init__(self, uri: str, db_name: str):
+    def __init__(
+        self,
+        uri: str,
+        db_name: str,
+        *,
+        max_pool_size: int = 50,
+        min_pool_size: int = 0,
+        server_selection_timeout_ms: int = 5000,
+        connect_timeout_ms: int = 5000,
+        socket_timeout_ms: int | None = None,
+        compressors: List[str] | None = None,
+        app_name: str = "reportes-dashboard",
+    ):
         print("\n🔌 [MongoClientProvider] Conectando a MongoDB...")
-        print("   URI:", uri)
         print("   DB :", db_name)
+        print("   Pool:", f"{min_pool_size}..{max_pool_size}")
+        print("   Compresión:", compressors or "ninguna")
+
+        opciones: Dict[str, Any] = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+            "serverSelectionTimeoutMS": server_selection_timeout_ms,
+            "connectTimeoutMS": connect_timeout_ms,
+            "appname": app_name,
+        }
+
+        if socket_timeout_ms:
+            opciones["socketTimeoutMS"] = socket_timeout_ms
 
-        self._client = MongoClient(uri)
+        if compressors:
+            opciones["compressors"] = ",".join(compressors)
+
+        self._client = MongoClient(uri, **opciones)
         self._db = self._client[db_name]
+        self._cerrado = False
 
         print("✅ [MongoClientProvider] Conexión creada")
-        print("📦 [MongoClientProvider] Colecciones disponibles:")
+
+        # Se listan UNA sola vez: get_collection() ya no
+        # hace un round-trip por llamada.
+        self._colecciones: set[str] = set()
         try:
-            for c in self._db.list_collection_names():
+            self._colecciones = set(self._db.list_collection_names())
+            print("📦 [MongoClientProvider] Colecciones disponibles:")
+            for c in sorted(self._colecciones):
                 print("   -", c)
         except Exception as e:
             print("❌ Error listando colecciones:", e)
@@ -40,10 +79,10 @@ class MongoClientProvider:
     def get_collection(self, name: str):
         """
         Devuelve una colección Mongo (uso interno por services / queries).
-        """
-        print(f"\n📁 [MongoClientProvider] get_collection('{name}')")
 
-        if name not in self._db.list_collection_names():
+        No consulta al servidor: usa el listado tomado al conectar.
+        """
+        if self._colecciones and name not in self._colecciones:
             print(f"⚠️  Colección '{name}' NO existe en la base")
 
         return self._db[name]
@@ -181,5 +220,9 @@ class MongoClientProvider:
     # 🔹 LIFECYCLE
     # ─────────────────────────────
     def close(self):
+        if self._cerrado:
+            return
+
         print("\n🔌 [MongoClientProvider] Cerrando conexión MongoDB")
         self._client.close()
+        self._cerrado = True
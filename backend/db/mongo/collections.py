@@ -4,3 +4,7 @@ PERSONAL = "personal"
 VENDEDORES = "vendedores"
 ASIGNACIONES = "asignaciones_pasillo"
 PRODUCTOS = "productos"
+
+# Derivadas (rollups materializados)
+DEVOLUCIONES_DIARIAS = "devoluciones_diarias"
+ROLLUPS_ESTADO = "rollups_estado"
@@ -5,6 +5,7 @@ from .collections import (
     VENDEDORES,
     ASIGNACIONES,
     PRODUCTOS,
+    DEVOLUCIONES_DIARIAS,
 )
 
 
@@ -44,3 +45,15 @@ def ensure_indexes(db: Database):
     col.create_index("clave", unique=True)
     col.create_index("nombre")
     col.create_index("linea")
+
+    # ───────── ROLLUPS ─────────
+    ensure_indexes_rollups(db)
+
+
+def ensure_indexes_rollups(db: Database):
+    """
+    Índices de las colecciones derivadas (rollups).
+    """
+    col = db[DEVOLUCIONES_DIARIAS]
+    col.create_index("fecha")
+    col.create_index([("fecha", 1), ("actualizado", 1)])
@@ -0,0 +1,150 @@
+import asyncio
+import pandas as pd
+from typing import Dict, List
+
+from .cache import cache_dimensiones
+from .pipelines import (
+    pipeline_devoluciones_detalle,
+    pipeline_devoluciones_diario,
+)
+from .queries import COLUMNAS_DETALLE
+
+
+class AsyncReportesQueries:
+    """
+    Variante ASÍNCRONA de ReportesQueries (PyMongo async).
+
+    RESPONSABILIDAD:
+    - Ejecutar los MISMOS pipelines que ReportesQueries
+    - Devolver datos CRUDOS (DataFrame o list)
+    - Permitir que el caller espere varias lecturas a la vez
+
+    NO HACE:
+    - Lógica de negocio
+    - Agrupaciones analíticas finales
+    """
+
+    # ─────────────────────────────
+    # INIT
+    # ─────────────────────────────
+    def __init__(self, provider, cache=None):
+        """
+        provider: AsyncMongoClientProvider
+        cache: CacheDimensiones (default: compartido por proceso)
+        """
+        self.provider = provider
+        self.cache = cache if cache is not None else cache_dimensiones
+
+        # 🔑 Colecciones REALES (AsyncCollection)
+        self.devoluciones = provider.get_collection("devoluciones")
+        self.personas = provider.get_collection("personal")
+        self.asignaciones = provider.get_collection("asignaciones")
+
+    # ─────────────────────────────
+    # HELPERS
+    # ─────────────────────────────
+    async def _aggregate(self, pipeline: List[Dict]) -> List[Dict]:
+        cursor = await self.devoluciones.aggregate(pipeline)
+        return await cursor.to_list()
+
+    async def _dimension(self, clave: str, leer):
+        """
+        Lectura de dimensión a través del cache compartido.
+        """
+        encontrado, valor = self.cache.consultar(clave)
+        if encontrado:
+            return valor
+
+        generacion = self.cache.generacion
+        valor = await leer()
+        self.cache.guardar(clave, valor, generacion)
+        return valor
+
+    @staticmethod
+    async def _dataframe(data: List[Dict]) -> pd.DataFrame:
+        """
+        Construir el DataFrame es CPU: se hace fuera del event loop.
+        """
+        if not data:
+            return pd.DataFrame(columns=COLUMNAS_DETALLE)
+
+        return await asyncio.to_thread(pd.DataFrame, data)
+
+    # ─────────────────────────────
+    # DEVOLUCIONES (BASE ANALÍTICA)
+    # ─────────────────────────────
+    async def devoluciones_detalle(self, filtros: Dict) -> pd.DataFrame:
+        """
+        Devuelve eventos base de devoluciones
+        (UNA FILA POR ARTÍCULO).
+        """
+        print("\n📊 [AsyncReportesQueries] devoluciones_detalle()")
+
+        data = await self._aggregate(pipeline_devoluciones_detalle(filtros))
+        print("📦 Filas devueltas por aggregate:", len(data))
+
+        return await self._dataframe(data)
+
+    async def devoluciones_diarias(self, filtros: Dict) -> pd.DataFrame:
+        """
+        Devuelve buckets diarios (DÍA × ZONA × PASILLO).
+        """
+        print("\n📊 [AsyncReportesQueries] devoluciones_diarias()")
+
+        data = await self._aggregate(pipeline_devoluciones_diario(filtros))
+        print("📦 Buckets devueltos por aggregate:", len(data))
+
+        return await self._dataframe(data)
+
+    # ─────────────────────────────
+    # PERSONAS (DIMENSIÓN)
+    # ─────────────────────────────
+    async def personas_activas(self) -> Dict[str, str]:
+        """
+        RETURN:
+        { persona_id: nombre }
+        """
+        personas = await self._dimension(
+            self.personas.full_name,
+            self._leer_personas_activas,
+        )
+        return dict(personas)
+
+    async def _leer_personas_activas(self) -> Dict[str, str]:
+        cursor = self.personas.find(
+            {"activo": True},
+            {"_id": 1, "nombre": 1}
+        )
+
+        return {
+            str(p["_id"]): p["nombre"]
+            for p in await cursor.to_list()
+        }
+
+    # ─────────────────────────────
+    # ASIGNACIONES (DIMENSIÓN)
+    # ─────────────────────────────
+    async def asignaciones_personal(self) -> List[Dict]:
+        """
+        Devuelve TODAS las asignaciones de personal
+        (SIN lógica temporal).
+        """
+        asignaciones = await self._dimension(
+            self.asignaciones.full_name,
+            self._leer_asignaciones_personal,
+        )
+        return list(asignaciones)
+
+    async def _leer_asignaciones_personal(self) -> List[Dict]:
+        cursor = self.asignaciones.find(
+            {},
+            {
+                "_id": 0,
+                "pasillo": 1,
+                "persona_id": 1,
+                "fecha_desde": 1,
+                "fecha_hasta": 1,
+            }
+        )
+
+        return await cursor.to_list()
@@ -0,0 +1,148 @@
+"""
+Cache en memoria para DIMENSIONES de reportes.
+
+RESPONSABILIDAD:
+- Evitar releer `personal` / `asignaciones` en cada reporte
+  (cambian muy poco; se leen varias veces por request)
+- TTL por entrada + invalidación explícita
+- Seguro bajo concurrencia (threadpool de FastAPI)
+- Contadores de aciertos / fallos
+
+REGLAS:
+- Los valores cacheados son de SOLO LECTURA para el caller
+- Una invalidación descarta también las cargas en curso
+  (no se guardan datos leídos antes de invalidar)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+# TTL por defecto de las dimensiones (segundos)
+TTL_DIMENSIONES = 300.0
+
+
+class CacheDimensiones:
+    """
+    Cache TTL compartido entre requests.
+    """
+
+    def __init__(self, ttl_segundos: float = TTL_DIMENSIONES):
+        self.ttl = float(ttl_segundos)
+
+        self._lock = threading.Lock()
+        self._datos: Dict[Hashable, Tuple[float, float, Any]] = {}
+        self._cargas: Dict[Hashable, threading.Lock] = {}
+        self._generacion = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidaciones = 0
+
+    # ─────────────────────────────
+    # LECTURA
+    # ─────────────────────────────
+    def consultar(self, clave: Hashable) -> Tuple[bool, Any]:
+        """
+        Devuelve (encontrado, valor) y cuenta hit / miss.
+        """
+        with self._lock:
+            entrada = self._datos.get(clave)
+
+            if entrada and entrada[0] > time.monotonic():
+                self.hits += 1
+                return True, entrada[2]
+
+            self.misses += 1
+            return False, None
+
+    def obtener(self, clave: Hashable, cargar: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor vigente o lo carga con `cargar()`.
+
+        Solo UN hilo carga cada clave; los demás esperan
+        y reutilizan el resultado.
+        """
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada and entrada[0] > time.monotonic():
+                self.hits += 1
+                return entrada[2]
+
+            lock_clave = self._cargas.setdefault(clave, threading.Lock())
+
+        with lock_clave:
+            encontrado, valor = self.consultar(clave)
+            if encontrado:
+                return valor
+
+            generacion = self.generacion
+            valor = cargar()
+            self.guardar(clave, valor, generacion)
+            return valor
+
+    # ─────────────────────────────
+    # ESCRITURA
+    # ─────────────────────────────
+    @property
+    def generacion(self) -> int:
+        with self._lock:
+            return self._generacion
+
+    def guardar(self, clave: Hashable, valor: Any, generacion: int) -> None:
+        """
+        Guarda `valor` solo si no hubo invalidación desde `generacion`.
+        """
+        ahora = time.monotonic()
+
+        with self._lock:
+            if generacion != self._generacion:
+                return
+            self._datos[clave] = (ahora + self.ttl, ahora, valor)
+
+    def invalidar(self, clave: Hashable | None = None) -> None:
+        """
+        Invalida una clave o TODO el cache (clave=None).
+        """
+        with self._lock:
+            if clave is None:
+                self._datos.clear()
+            else:
+                self._datos.pop(clave, None)
+
+            self._generacion += 1
+            self.invalidaciones += 1
+
+    # ─────────────────────────────
+    # OBSERVABILIDAD
+    # ─────────────────────────────
+    def stats(self) -> dict:
+        ahora = time.monotonic()
+
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "ttl_segundos": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+                "invalidaciones": self.invalidaciones,
+                "entradas": {
+                    str(clave): {
+                        "edad_segundos": round(ahora - creado, 3),
+                        "vigente": expira > ahora,
+                    }
+                    for clave, (expira, creado, _) in self._datos.items()
+                },
+            }
+
+
+# ─────────────────────────────────────────────
+# INSTANCIA COMPARTIDA (UNA POR PROCESO)
+# REPORTES_CACHE_DIMENSIONES_TTL: segundos (0 = sin cache)
+# ─────────────────────────────────────────────
+cache_dimensiones = CacheDimensiones(
+    float(os.getenv("REPORTES_CACHE_DIMENSIONES_TTL", TTL_DIMENSIONES))
+)
@@ -0,0 +1,147 @@
+"""
+Lectura COLUMNAR de aggregates de reportes.
+
+OBJETIVO:
+- Construir el DataFrame de detalle SIN pasar por una lista de dicts
+- Cada columna se llena en un arreglo tipado (int64 / float64 / ms)
+
+ESTRATEGIA:
+- Si `pymongoarrow` está instalado: BSON → Arrow → pandas
+  (decodificación nativa por lotes, sin objetos Python por fila)
+- Si no: el cursor se consume documento a documento directo a
+  `array.array` tipados; las fechas llegan como DatetimeMS (int)
+  y nunca se materializa la lista completa de documentos
+
+Columnas esperadas (ver COLUMNAS_DETALLE):
+fecha, zona, pasillo, piezas, importe, devoluciones
+"""
+
+from array import array
+
+import numpy as np
+import pandas as pd
+from bson.codec_options import CodecOptions, DatetimeConversion
+
+try:
+    import pyarrow as pa
+    from pymongoarrow.api import Schema, aggregate_pandas_all
+except ImportError:
+    pa = None
+    Schema = None
+    aggregate_pandas_all = None
+
+
+# Tamaño de lote del cursor (menos round-trips en rangos grandes)
+BATCH_SIZE = 10_000
+
+# Valor centinela de NaT para datetime64
+_NAT = np.iinfo(np.int64).min
+
+_CODEC_MS = CodecOptions(datetime_conversion=DatetimeConversion.DATETIME_MS)
+
+
+def _schema_detalle():
+    return Schema({
+        "fecha": pa.timestamp("ms"),
+        "zona": pa.string(),
+        "pasillo": pa.string(),
+        "piezas": pa.int32(),
+        "importe": pa.float64(),
+        "devoluciones": pa.int32(),
+    })
+
+
+# ─────────────────────────────────────────────
+# API
+# ─────────────────────────────────────────────
+def aggregate_columnar(collection, pipeline: list) -> pd.DataFrame:
+    """
+    Ejecuta `pipeline` y devuelve el DataFrame de detalle
+    construido columna por columna.
+    """
+    if aggregate_pandas_all is not None:
+        return aggregate_pandas_all(
+            collection,
+            pipeline,
+            schema=_schema_detalle(),
+        )
+
+    return _aggregate_arrays(collection, pipeline)
+
+
+class _Columnas:
+    """
+    Acumulador de columnas tipadas (una fila por documento).
+    """
+
+    def __init__(self):
+        self.fechas = array("q")
+        self.piezas = array("q")
+        self.importes = array("d")
+        self.devoluciones = array("q")
+        self.zonas = []
+        self.pasillos = []
+
+    def __len__(self):
+        return len(self.fechas)
+
+    def agregar(self, doc: dict):
+        f = doc.get("fecha")
+        self.fechas.append(int(f) if f is not None else _NAT)
+        self.zonas.append(doc.get("zona"))
+        self.pasillos.append(doc.get("pasillo"))
+        self.piezas.append(doc.get("piezas") or 0)
+        self.importes.append(doc.get("importe") or 0.0)
+        self.devoluciones.append(doc.get("devoluciones") or 0)
+
+    def dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "fecha": np.frombuffer(self.fechas, dtype=np.int64).view("datetime64[ms]"),
+                "zona": np.array(self.zonas, dtype=object),
+                "pasillo": np.array(self.pasillos, dtype=object),
+                "piezas": np.frombuffer(self.piezas, dtype=np.int64),
+                "importe": np.frombuffer(self.importes, dtype=np.float64),
+                "devoluciones": np.frombuffer(self.devoluciones, dtype=np.int64),
+            },
+            copy=False,
+        )
+
+
+def _cursor_ms(collection, pipeline: list, batch_size: int = BATCH_SIZE):
+    return collection.with_options(codec_options=_CODEC_MS).aggregate(
+        pipeline,
+        batchSize=batch_size,
+    )
+
+
+def _aggregate_arrays(collection, pipeline: list) -> pd.DataFrame:
+    """
+    Fallback sin dependencias: cursor → arreglos tipados.
+    """
+    columnas = _Columnas()
+
+    for doc in _cursor_ms(collection, pipeline):
+        columnas.agregar(doc)
+
+    return columnas.dataframe()
+
+
+def aggregate_columnar_lotes(collection, pipeline: list, tamano_lote: int):
+    """
+    Igual que aggregate_columnar, pero entrega el resultado
+    en DataFrames de como máximo `tamano_lote` filas.
+
+    Solo UN lote vive en memoria a la vez.
+    """
+    columnas = _Columnas()
+
+    for doc in _cursor_ms(collection, pipeline, min(tamano_lote, BATCH_SIZE)):
+        columnas.agregar(doc)
+
+        if len(columnas) >= tamano_lote:
+            yield columnas.dataframe()
+            columnas = _Columnas()
+
+    if len(columnas):
+        yield columnas.dataframe()
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 def rango_fechas(desde=None, hasta=None) -> dict:
@@ -14,6 +14,47 @@ def rango_fechas(desde=None, hasta=None) -> dict:
     return {"fecha": {"$gte": d1, "$lte": d2}}
 
 
+def match_fecha_indexable(filtro_fecha: dict) -> dict:
+    """
+    Filtro sobre el campo `fecha` TAL COMO ESTÁ GUARDADO
+    (puede usar el índice `fecha`).
+
+    Cubre ambos tipos de documento:
+    - fecha Date   → rango exacto
+    - fecha String → rango lexicográfico ISO por días completos,
+                     ampliado UN día a cada lado: un String con
+                     offset (p. ej. "2024-01-31T23:30:00-06:00")
+                     puede caer en otro día UTC. El match exacto
+                     sobre `__fecha` se sigue aplicando después
+
+    ⚠️ Los String que NO empiezan con fecha ISO con ceros
+    ("YYYY-MM-DD...") quedan FUERA, aunque $dateFromString
+    los entienda: un rango no puede cubrirlos sin recorrer
+    todo el índice.
+
+    filtro_fecha: {"$gte": datetime, "$lte": datetime}
+    """
+    if not isinstance(filtro_fecha, dict):
+        return {}
+
+    d1 = filtro_fecha.get("$gte")
+    d2 = filtro_fecha.get("$lte")
+
+    if not isinstance(d1, datetime) or not isinstance(d2, datetime):
+        return {}
+
+    # Offset UTC máximo: ±14 h → basta un día de margen
+    s1 = (d1 - timedelta(days=1)).strftime("%Y-%m-%d")
+    s2 = (d2 + timedelta(days=2)).strftime("%Y-%m-%d")
+
+    return {
+        "$or": [
+            {"fecha": {"$gte": d1, "$lte": d2}},
+            {"fecha": {"$gte": s1, "$lt": s2}},
+        ]
+    }
+
+
 def por_vendedor(vendedor_id=None) -> dict:
     return {"vendedor_id": vendedor_id} if vendedor_id else {}
 
@@ -7,33 +7,61 @@ REGLAS CLAVE:
 - El service NO calcula importes, solo agrega
 - Soporta fecha como Date o String (normalización interna)
 - El casteo de ObjectId SIEMPRE se hace en Python
+- La PRIMERA etapa filtra sobre `fecha` real (usa índice);
+  ninguna etapa calculada corre antes de reducir el rango
 """
 
+from ..collections import DEVOLUCIONES_DIARIAS
+from .filtros import match_fecha_indexable
+
 # ─────────────────────────────────────────────
-# DETALLE ANALÍTICO (BASE DE REPORTES)
+# ETAPAS / EXPRESIONES COMPARTIDAS
 # ─────────────────────────────────────────────
-def pipeline_devoluciones_detalle(filtros: dict) -> list:
-    filtro_fecha = filtros.get("fecha", {})
+def _etapa_normalizar_fecha() -> dict:
+    """
+    Agrega `__fecha` (Date) aunque el documento guarde fecha como String.
+    """
+    return {
+        "$addFields": {
+            "__fecha": {
+                "$cond": [
+                    {"$eq": [{"$type": "$fecha"}, "date"]},
+                    "$fecha",
+                    {"$dateFromString": {"dateString": "$fecha"}}
+                ]
+            }
+        }
+    }
 
-    print("\n🧩 [pipeline_devoluciones_detalle]")
-    print("➡ Filtro fecha recibido:", filtro_fecha)
 
-    return [
-        # 1️⃣ Normalizar fecha
-        {
-            "$addFields": {
-                "__fecha": {
-                    "$cond": [
-                        {"$eq": [{"$type": "$fecha"}, "date"]},
-                        "$fecha",
-                        {"$dateFromString": {"dateString": "$fecha"}}
-                    ]
-                }
-            }
-        },
+def _etapas_fecha(filtro_fecha: dict) -> list:
+    """
+    Filtro de rango en dos pasos:
+
+    1. $match indexable sobre `fecha` (Date o String ISO)
+    2. Normalización a `__fecha` + match exacto, ya sobre
+       el subconjunto reducido por el índice
+    """
+    etapas = []
+
+    match_indice = match_fecha_indexable(filtro_fecha)
+    if match_indice:
+        etapas.append({"$match": match_indice})
 
-        # 2️⃣ Match por fecha
-        {"$match": {"__fecha": filtro_fecha}},
+    etapas.append(_etapa_normalizar_fecha())
+    etapas.append({"$match": {"__fecha": filtro_fecha}})
+
+    return etapas
+
+
+def _etapas_items(filtro_fecha: dict) -> list:
+    """
+    Filtra rango, calcula total de piezas
+    y deja UN documento por artículo (`items`).
+    """
+    return [
+        # 1️⃣ / 2️⃣ Rango de fechas (índice + match exacto)
+        *_etapas_fecha(filtro_fecha),
 
         # 3️⃣ Total piezas
         {
@@ -52,6 +80,75 @@ def pipeline_devoluciones_detalle(filtros: dict) -> list:
 
         # 4️⃣ Unwind
         {"$unwind": "$items"},
+    ]
+
+
+def _expr_pasillo() -> dict:
+    return {"$ifNull": ["$items.pasillo", "—"]}
+
+
+def _expr_piezas() -> dict:
+    return {"$toInt": {"$ifNull": ["$items.cantidad", 0]}}
+
+
+def _expr_importe_prorrateado() -> dict:
+    """
+    Importe del artículo = total de la devolución prorrateado por piezas.
+    """
+    return {
+        "$cond": [
+            {"$gt": ["$total_piezas", 0]},
+            {
+                "$multiply": [
+                    {
+                        "$divide": [
+                            {"$toDouble": {"$ifNull": ["$items.cantidad", 0]}},
+                            {"$toDouble": "$total_piezas"}
+                        ]
+                    },
+                    {"$toDouble": {"$ifNull": ["$total", 0]}}
+                ]
+            },
+            0.0
+        ]
+    }
+
+
+def _etapa_bucket_diario() -> dict:
+    """
+    $group por (día, zona, pasillo) sumando los KPIs del artículo.
+    """
+    return {
+        "$group": {
+            "_id": {
+                "fecha": {
+                    "$dateFromParts": {
+                        "year": {"$year": "$__fecha"},
+                        "month": {"$month": "$__fecha"},
+                        "day": {"$dayOfMonth": "$__fecha"},
+                    }
+                },
+                "zona": "$zona",
+                "pasillo": _expr_pasillo(),
+            },
+            "piezas": {"$sum": _expr_piezas()},
+            "importe": {"$sum": _expr_importe_prorrateado()},
+            "devoluciones": {"$sum": 1},
+        }
+    }
+
+
+# ─────────────────────────────────────────────
+# DETALLE ANALÍTICO (BASE DE REPORTES)
+# ─────────────────────────────────────────────
+def pipeline_devoluciones_detalle(filtros: dict) -> list:
+    filtro_fecha = filtros.get("fecha", {})
+
+    print("\n🧩 [pipeline_devoluciones_detalle]")
+    print("➡ Filtro fecha recibido:", filtro_fecha)
+
+    return [
+        *_etapas_items(filtro_fecha),
 
         # 5️⃣ Proyección
         {
@@ -59,25 +156,9 @@ def pipeline_devoluciones_detalle(filtros: dict) -> list:
                 "_id": 0,
                 "fecha": "$__fecha",
                 "zona": 1,
-                "pasillo": {"$ifNull": ["$items.pasillo", "—"]},
-                "piezas": {"$toInt": {"$ifNull": ["$items.cantidad", 0]}},
-                "importe": {
-                    "$cond": [
-                        {"$gt": ["$total_piezas", 0]},
-                        {
-                            "$multiply": [
-                                {
-                                    "$divide": [
-                                        {"$toDouble": {"$ifNull": ["$items.cantidad", 0]}},
-                                        {"$toDouble": "$total_piezas"}
-                                    ]
-                                },
-                                {"$toDouble": {"$ifNull": ["$total", 0]}}
-                            ]
-                        },
-                        0.0
-                    ]
-                },
+                "pasillo": _expr_pasillo(),
+                "piezas": _expr_piezas(),
+                "importe": _expr_importe_prorrateado(),
                 "devoluciones": {"$literal": 1}
             }
         }
@@ -85,28 +166,120 @@ def pipeline_devoluciones_detalle(filtros: dict) -> list:
 
 
 # ─────────────────────────────────────────────
-# RESUMEN POR DEVOLUCIÓN
+# DETALLE PRE-AGREGADO (DÍA × ZONA × PASILLO)
 # ─────────────────────────────────────────────
-def pipeline_devoluciones_resumen(filtros: dict) -> list:
+def pipeline_devoluciones_diario(filtros: dict) -> list:
+    """
+    Mismo prorrateo que `pipeline_devoluciones_detalle`,
+    pero agrupado en Mongo por (día, zona, pasillo).
+
+    - Devuelve las MISMAS columnas que el detalle
+    - `fecha` queda truncada al día (00:00)
+    - `devoluciones` = artículos del bucket (igual que sumar el detalle)
+    """
     filtro_fecha = filtros.get("fecha", {})
 
-    print("\n🧩 [pipeline_devoluciones_resumen]")
+    print("\n🧩 [pipeline_devoluciones_diario]")
     print("➡ Filtro fecha recibido:", filtro_fecha)
 
     return [
+        *_etapas_items(filtro_fecha),
+
+        # 5️⃣ Bucket diario
+        _etapa_bucket_diario(),
+
+        # 6️⃣ Aplanar
+        {
+            "$project": {
+                "_id": 0,
+                "fecha": "$_id.fecha",
+                "zona": "$_id.zona",
+                "pasillo": "$_id.pasillo",
+                "piezas": 1,
+                "importe": 1,
+                "devoluciones": 1,
+            }
+        },
+
+        {"$sort": {"fecha": 1}}
+    ]
+
+
+# ─────────────────────────────────────────────
+# ROLLUP DIARIO MATERIALIZADO
+# ─────────────────────────────────────────────
+def pipeline_rollup_diario(filtros: dict, corrida) -> list:
+    """
+    Recalcula los buckets diarios del rango y los escribe
+    (upsert por _id) en la colección de rollups.
+
+    - `_id` = {fecha, zona, pasillo}
+    - `actualizado` = `corrida` (permite borrar buckets obsoletos)
+    """
+    filtro_fecha = filtros.get("fecha", {})
+
+    print("\n🧩 [pipeline_rollup_diario]")
+    print("➡ Filtro fecha recibido:", filtro_fecha)
+
+    return [
+        *_etapas_items(filtro_fecha),
+
+        _etapa_bucket_diario(),
+
         {
             "$addFields": {
-                "__fecha": {
-                    "$cond": [
-                        {"$eq": [{"$type": "$fecha"}, "date"]},
-                        "$fecha",
-                        {"$dateFromString": {"dateString": "$fecha"}}
-                    ]
-                }
+                "fecha": "$_id.fecha",
+                "zona": "$_id.zona",
+                "pasillo": "$_id.pasillo",
+                "actualizado": corrida,
             }
         },
 
-        {"$match": {"__fecha": filtro_fecha}},
+        {
+            "$merge": {
+                "into": DEVOLUCIONES_DIARIAS,
+                "on": "_id",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert",
+            }
+        }
+    ]
+
+
+def pipeline_rollup_lectura(filtros: dict) -> list:
+    """
+    Lee buckets del rollup (misma forma que el pipeline diario).
+
+    Se ejecuta sobre la colección de rollups, NO sobre devoluciones.
+    """
+    return [
+        {"$match": {"fecha": filtros.get("fecha", {})}},
+        {
+            "$project": {
+                "_id": 0,
+                "fecha": 1,
+                "zona": 1,
+                "pasillo": 1,
+                "piezas": 1,
+                "importe": 1,
+                "devoluciones": 1,
+            }
+        },
+        {"$sort": {"fecha": 1}}
+    ]
+
+
+# ─────────────────────────────────────────────
+# RESUMEN POR DEVOLUCIÓN
+# ─────────────────────────────────────────────
+def pipeline_devoluciones_resumen(filtros: dict) -> list:
+    filtro_fecha = filtros.get("fecha", {})
+
+    print("\n🧩 [pipeline_devoluciones_resumen]")
+    print("➡ Filtro fecha recibido:", filtro_fecha)
+
+    return [
+        *_etapas_fecha(filtro_fecha),
 
         {
             "$addFields": {
@@ -1,13 +1,30 @@
 import pandas as pd
 from typing import Dict, List
 
+from ..collections import DEVOLUCIONES_DIARIAS, ROLLUPS_ESTADO
+from .cache import cache_dimensiones
+from .columnar import aggregate_columnar, aggregate_columnar_lotes
+from .rollups import leer_corte
 from .pipelines import (
     pipeline_devoluciones_detalle,
+    pipeline_devoluciones_diario,
+    pipeline_rollup_lectura,
     pipeline_devoluciones_resumen,
     pipeline_devolucion_articulos,
 )
 
 
+# Columnas comunes de detalle / pre-agregado diario
+COLUMNAS_DETALLE = [
+    "fecha",
+    "zona",
+    "pasillo",
+    "piezas",
+    "importe",
+    "devoluciones",
+]
+
+
 class ReportesQueries:
     """
     Ejecuta consultas especializadas para REPORTES.
@@ -26,19 +43,25 @@ class ReportesQueries:
     # ─────────────────────────────
     # INIT
     # ─────────────────────────────
-    def __init__(self, provider):
+    def __init__(self, provider, cache=None):
         """
         provider: MongoClientProvider
+        cache: CacheDimensiones (default: compartido por proceso)
         """
         print("\n🧩 [ReportesQueries] inicializando...")
 
         self.provider = provider
+        self.cache = cache if cache is not None else cache_dimensiones
 
         # 🔑 Colecciones REALES (PyMongo Collection)
         self.devoluciones = provider.get_collection("devoluciones")
         self.personas = provider.get_collection("personal")
         self.asignaciones = provider.get_collection("asignaciones")
 
+        # 🔑 Rollup diario (derivada, mantenida por RollupDiario)
+        self.rollup_diario = provider.get_collection(DEVOLUCIONES_DIARIAS)
+        self.rollups_estado = provider.get_collection(ROLLUPS_ESTADO)
+
         print("   ✔ Colecciones conectadas:")
         print("     - devoluciones :", self.devoluciones.full_name)
         print("     - personas     :", self.personas.full_name)
@@ -47,10 +70,17 @@ class ReportesQueries:
     # ─────────────────────────────
     # DEVOLUCIONES (BASE ANALÍTICA)
     # ─────────────────────────────
-    def devoluciones_detalle(self, filtros: Dict) -> pd.DataFrame:
+    def devoluciones_detalle(
+        self,
+        filtros: Dict,
+        columnar: bool = True,
+    ) -> pd.DataFrame:
         """
         Devuelve eventos base de devoluciones
         (UNA FILA POR ARTÍCULO).
+
+        columnar=True  → lectura columnar (sin lista de dicts)
+        columnar=False → lectura clásica list(aggregate) + DataFrame
         """
         print("\n📊 [ReportesQueries] devoluciones_detalle()")
         print("➡ Filtros:", filtros)
@@ -58,26 +88,86 @@ class ReportesQueries:
         pipeline = pipeline_devoluciones_detalle(filtros)
         print("🧩 Pipeline etapas:", len(pipeline))
 
+        if columnar:
+            df = aggregate_columnar(self.devoluciones, pipeline)
+            print("✅ devoluciones_detalle (columnar):", df.shape)
+            return df
+
         data = list(self.devoluciones.aggregate(pipeline))
         print("📦 Filas devueltas por aggregate:", len(data))
 
         if not data:
             print("⚠️ devoluciones_detalle: SIN RESULTADOS")
-            return pd.DataFrame(
-                columns=[
-                    "fecha",
-                    "zona",
-                    "pasillo",
-                    "piezas",
-                    "importe",
-                    "devoluciones",
-                ]
-            )
+            return pd.DataFrame(columns=COLUMNAS_DETALLE)
 
         df = pd.DataFrame(data)
         print("✅ devoluciones_detalle DataFrame creado:", df.shape)
         return df
 
+    def devoluciones_detalle_lotes(self, filtros: Dict, tamano_lote: int):
+        """
+        Igual que devoluciones_detalle(), pero como GENERADOR
+        de DataFrames de a lo más `tamano_lote` filas.
+
+        Permite agregar por lotes sin cargar el rango completo.
+        """
+        print("\n📊 [ReportesQueries] devoluciones_detalle_lotes()")
+        print("➡ Filtros:", filtros, "| lote:", tamano_lote)
+
+        pipeline = pipeline_devoluciones_detalle(filtros)
+
+        return aggregate_columnar_lotes(
+            self.devoluciones,
+            pipeline,
+            tamano_lote,
+        )
+
+    # ─────────────────────────────
+    # DEVOLUCIONES PRE-AGREGADAS (DÍA × ZONA × PASILLO)
+    # ─────────────────────────────
+    def devoluciones_diarias(self, filtros: Dict) -> pd.DataFrame:
+        """
+        Devuelve buckets diarios ya agregados en Mongo
+        (UNA FILA POR DÍA × ZONA × PASILLO).
+
+        Mismas columnas que devoluciones_detalle():
+        las agregaciones del service funcionan igual.
+        """
+        print("\n📊 [ReportesQueries] devoluciones_diarias()")
+        print("➡ Filtros:", filtros)
+
+        pipeline = pipeline_devoluciones_diario(filtros)
+
+        df = aggregate_columnar(self.devoluciones, pipeline)
+        print("✅ devoluciones_diarias DataFrame creado:", df.shape)
+        return df
+
+    # ─────────────────────────────
+    # ROLLUP DIARIO (MATERIALIZADO)
+    # ─────────────────────────────
+    def rollup_corte(self):
+        """
+        Inicio del día del último refresco del rollup (o None).
+        Días anteriores al corte están completos en el rollup.
+        """
+        return leer_corte(self.rollups_estado)
+
+    def devoluciones_rollup(self, filtros: Dict) -> pd.DataFrame:
+        """
+        Lee buckets DÍA × ZONA × PASILLO del rollup materializado.
+
+        Mismas columnas que devoluciones_diarias().
+        """
+        print("\n📊 [ReportesQueries] devoluciones_rollup()")
+        print("➡ Filtros:", filtros)
+
+        df = aggregate_columnar(
+            self.rollup_diario,
+            pipeline_rollup_lectura(filtros),
+        )
+        print("✅ devoluciones_rollup DataFrame creado:", df.shape)
+        return df
+
     # ─────────────────────────────
     # RESUMEN ADMINISTRATIVO
     # ─────────────────────────────
@@ -148,9 +238,18 @@ class ReportesQueries:
         """
         Devuelve un MAPA de personas activas.
 
+        Se sirve desde el cache de dimensiones (TTL).
+
         RETURN:
         { persona_id: nombre }
         """
+        personas = self.cache.obtener(
+            self.personas.full_name,
+            self._leer_personas_activas,
+        )
+        return dict(personas)
+
+    def _leer_personas_activas(self) -> Dict[str, str]:
         print("\n👥 [ReportesQueries] personas_activas()")
 
         cursor = self.personas.find(
@@ -173,7 +272,16 @@ class ReportesQueries:
         """
         Devuelve TODAS las asignaciones de personal
         (SIN lógica temporal).
+
+        Se sirve desde el cache de dimensiones (TTL).
         """
+        asignaciones = self.cache.obtener(
+            self.asignaciones.full_name,
+            self._leer_asignaciones_personal,
+        )
+        return list(asignaciones)
+
+    def _leer_asignaciones_personal(self) -> List[Dict]:
         print("\n🧩 [ReportesQueries] asignaciones_personal()")
 
         cursor = self.asignaciones.find(
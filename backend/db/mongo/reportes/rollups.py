@@ -0,0 +1,143 @@
+"""
+Rollup diario materializado de devoluciones.
+
+RESPONSABILIDAD:
+- Mantener `devoluciones_diarias` (día × zona × pasillo)
+  con importe / piezas / devoluciones ya prorrateados
+- Refrescar INCREMENTALMENTE desde una marca de agua sobre `fecha`
+- Exponer la marca de agua a los lectores (ReportesQueries)
+
+⚠️ ES EL ÚNICO COMPONENTE QUE ESCRIBE EN MONGO.
+Solo escribe colecciones DERIVADAS (rollup + estado);
+`devoluciones` se sigue leyendo en modo solo lectura.
+
+ESTRATEGIA DE REFRESCO:
+- Marca de agua = inicio del día del último refresco (`corte`)
+- Cada refresco recalcula desde `corte - dias_margen` hasta ahora
+  (captura devoluciones registradas tarde en días recientes)
+- Upsert por _id y luego borrado de buckets del rango que no se
+  tocaron en esta corrida: los lectores nunca ven huecos
+- Cambios a días anteriores al margen requieren reconstruir()
+"""
+
+from datetime import datetime, timedelta
+
+from ..collections import DEVOLUCIONES, DEVOLUCIONES_DIARIAS, ROLLUPS_ESTADO
+from .filtros import rango_fechas
+from .pipelines import pipeline_rollup_diario
+
+
+# Fecha desde la que se construye el rollup la primera vez
+DESDE_INICIAL = datetime(2000, 1, 1)
+
+# Días previos a la marca de agua que se recalculan siempre
+DIAS_MARGEN = 3
+
+_ESTADO_ID = DEVOLUCIONES_DIARIAS
+
+
+def _inicio_dia(valor: datetime) -> datetime:
+    return datetime(valor.year, valor.month, valor.day)
+
+
+def _ahora_ms() -> datetime:
+    """
+    now() truncado a milisegundos (precisión de Date en BSON),
+    para que `actualizado < corrida` no atrape lo recién escrito.
+    """
+    now = datetime.now()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+# ─────────────────────────────────────────────
+# LECTURA DEL ESTADO (usada también por queries)
+# ─────────────────────────────────────────────
+def leer_corte(col_estado) -> datetime | None:
+    """
+    Devuelve el inicio del día del último refresco.
+
+    Los buckets con fecha < corte están completos;
+    los días >= corte deben leerse en vivo.
+
+    col_estado: colección ROLLUPS_ESTADO
+    """
+    estado = col_estado.find_one({"_id": _ESTADO_ID})
+    if not estado:
+        return None
+    return estado.get("corte")
+
+
+class RollupDiario:
+    """
+    Mantenimiento del rollup diario (escritura SOLO en derivadas).
+    """
+
+    def __init__(self, db, dias_margen: int = DIAS_MARGEN):
+        """
+        db: pymongo Database
+        """
+        self._db = db
+        self.dias_margen = dias_margen
+
+    # ─────────────────────────────
+    # API
+    # ─────────────────────────────
+    def refrescar(self, ahora: datetime | None = None) -> dict:
+        """
+        Refresco incremental desde la marca de agua.
+        """
+        ahora = ahora or datetime.now()
+        corte = leer_corte(self._db[ROLLUPS_ESTADO])
+
+        if corte is None:
+            desde = DESDE_INICIAL
+        else:
+            desde = corte - timedelta(days=self.dias_margen)
+
+        return self._recalcular(desde, ahora)
+
+    def reconstruir(self, ahora: datetime | None = None) -> dict:
+        """
+        Recalcula TODO el rollup desde DESDE_INICIAL.
+        """
+        return self._recalcular(DESDE_INICIAL, ahora or datetime.now())
+
+    # ─────────────────────────────
+    # INTERNO
+    # ─────────────────────────────
+    def _recalcular(self, desde: datetime, ahora: datetime) -> dict:
+        desde = _inicio_dia(desde)
+        corrida = _ahora_ms()
+
+        print("\n🧮 [RollupDiario] Recalculando")
+        print("   Rango:", desde, "→", ahora)
+
+        filtros = rango_fechas(desde, ahora)
+
+        # 1️⃣ Upsert de buckets del rango
+        list(self._db[DEVOLUCIONES].aggregate(
+            pipeline_rollup_diario(filtros, corrida),
+            allowDiskUse=True,
+        ))
+
+        # 2️⃣ Quitar buckets del rango que ya no existen en origen
+        borrados = self._db[DEVOLUCIONES_DIARIAS].delete_many({
+            "fecha": filtros["fecha"],
+            "actualizado": {"$lt": corrida},
+        }).deleted_count
+
+        # 3️⃣ Avanzar marca de agua
+        corte = _inicio_dia(ahora)
+        self._db[ROLLUPS_ESTADO].update_one(
+            {"_id": _ESTADO_ID},
+            {"$set": {"corte": corte, "refrescado": corrida}},
+            upsert=True,
+        )
+
+        resultado = {
+            "desde": desde,
+            "corte": corte,
+            "obsoletos_borrados": borrados,
+        }
+        print("✅ [RollupDiario] Listo:", resultado)
+        return resultado
@@ -5,6 +5,7 @@ RESPONSABILIDADES:
 - Crear la aplicación FastAPI
 - Configurar middlewares (CORS)
 - Registrar rutas de la API (solo reportes)
+- Registrar el ciclo de vida (pool Mongo compartido)
 - Exponer la app para Uvicorn
 
 NO CONTIENE:
@@ -16,6 +17,7 @@ NO CONTIENE:
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.api.lifespan import lifespan
 from backend.api.routes import reportes
 
 
@@ -27,6 +29,7 @@ def create_app() -> FastAPI:
         title="ReporteSurtido · Dashboard API",
         description="API de solo lectura para reportes y visualización de gráficas",
         version="2.0.0",
+        lifespan=lifespan,
     )
 
     # ─────────────────────────────────────────
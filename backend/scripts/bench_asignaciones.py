@@ -0,0 +1,123 @@
+"""
+Benchmark: resolución pasillo → persona (join temporal).
+
+OBJETIVO:
+- Comparar _resolver_persona (fila a fila, df.apply)
+  contra _resolver_personas (vectorizado)
+- Tamaño: 500k filas de detalle × 2k asignaciones
+
+El camino fila a fila se mide sobre una MUESTRA y se extrapola
+(a tamaño completo tarda horas). Sobre esa muestra se verifica
+también que ambos caminos devuelvan lo mismo.
+
+Datos sintéticos en memoria: no toca Mongo.
+
+USO:
+    python -m backend.scripts.bench_asignaciones
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from backend.services.reportes.data.dataframe import (
+    _resolver_persona,
+    _resolver_personas,
+)
+
+
+# ─────────────────────────────────────────────
+# CONFIGURACIÓN
+# ─────────────────────────────────────────────
+FILAS = 500_000
+ASIGNACIONES = 2_000
+MUESTRA = 2_000
+PASILLOS = 40
+DESDE = datetime(2024, 1, 1)
+DIAS = 365
+
+
+# ─────────────────────────────────────────────
+# DATOS SINTÉTICOS
+# ─────────────────────────────────────────────
+def generar_asignaciones(rnd: random.Random) -> list[dict]:
+    asignaciones = []
+
+    for i in range(ASIGNACIONES):
+        inicio = DESDE + timedelta(days=rnd.randrange(DIAS))
+        fin = inicio + timedelta(days=rnd.randrange(1, 60))
+
+        asignaciones.append({
+            "pasillo": f"P{rnd.randrange(1, PASILLOS)}",
+            "persona_id": f"persona_{i % 150}",
+            "fecha_desde": inicio.strftime("%Y-%m-%d"),
+            "fecha_hasta": fin.strftime("%Y-%m-%d"),
+        })
+
+    return asignaciones
+
+
+def generar_detalle(rnd: random.Random) -> pd.DataFrame:
+    return pd.DataFrame({
+        "pasillo": [f"P{rnd.randrange(1, PASILLOS)}" for _ in range(FILAS)],
+        "fecha": pd.to_datetime([
+            DESDE + timedelta(
+                days=rnd.randrange(DIAS),
+                minutes=rnd.randrange(24 * 60),
+            )
+            for _ in range(FILAS)
+        ]),
+    })
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+def main():
+    print("\n========== BENCH ASIGNACIONES ==========")
+
+    rnd = random.Random(42)
+    asignaciones = generar_asignaciones(rnd)
+    df = generar_detalle(rnd)
+    print(f"Detalle: {len(df):,} filas | Asignaciones: {len(asignaciones):,}")
+
+    # 1️⃣ Fila a fila (muestra)
+    muestra = df.sample(MUESTRA, random_state=0)
+
+    t0 = time.perf_counter()
+    referencia = muestra.apply(
+        lambda r: _resolver_persona(r["pasillo"], r["fecha"], asignaciones),
+        axis=1,
+    )
+    t_fila = time.perf_counter() - t0
+    estimado = t_fila * len(df) / MUESTRA
+
+    # 2️⃣ Vectorizado (completo)
+    t0 = time.perf_counter()
+    personas = _resolver_personas(df["pasillo"], df["fecha"], asignaciones)
+    t_vector = time.perf_counter() - t0
+
+    # 3️⃣ Equivalencia sobre la muestra
+    posiciones = df.index.get_indexer(muestra.index)
+    # apply() puede inferir dtype string (None → NaN): comparar sin nulos
+    iguales = (
+        [None if pd.isna(p) else p for p in referencia]
+        == list(personas[posiciones])
+    )
+
+    asignadas = sum(p is not None for p in personas)
+
+    print(f"\n   fila a fila : {t_fila:.2f}s en {MUESTRA:,} filas "
+          f"(≈ {estimado:,.0f}s para {len(df):,})")
+    print(f"   vectorizado : {t_vector:.2f}s en {len(df):,} filas")
+    print(f"   speedup     : ≈ {estimado / t_vector:,.0f}x")
+    print(f"   con persona : {asignadas:,} filas")
+    print("   equivalencia:", "✅" if iguales else "❌ DIFIERE")
+
+    print("\n========== FIN BENCH ==========\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark: lectura columnar vs list(aggregate) + DataFrame.
+
+OBJETIVO:
+- Medir filas/seg y pico de RSS de ReportesQueries.devoluciones_detalle
+  con columnar=True y columnar=False
+- Tamaños: 100k y 1M filas de artículo
+
+⚠️ ESCRIBE DATOS SINTÉTICOS en una base APARTE
+(MONGO_BENCH_DB, default "<MONGO_DB>_bench") y la borra al terminar.
+Nunca toca la base real de reportes.
+
+Cada medición corre en un subproceso para que el pico de RSS
+no se contamine entre caminos.
+
+USO:
+    python -m backend.scripts.bench_columnar
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from pymongo import MongoClient
+
+from backend.db.factory import _uri_y_db
+from backend.db.mongo.reportes.filtros import rango_fechas
+
+
+# ─────────────────────────────────────────────
+# CONFIGURACIÓN
+# ─────────────────────────────────────────────
+TAMANOS = (100_000, 1_000_000)   # filas de artículo
+ITEMS_POR_DOC = 4
+DESDE = datetime(2024, 1, 1)
+DIAS = 365
+
+
+def _bench_db_name() -> str:
+    _, db_name = _uri_y_db()
+    return os.getenv("MONGO_BENCH_DB", f"{db_name}_bench")
+
+
+# ─────────────────────────────────────────────
+# DATOS SINTÉTICOS
+# ─────────────────────────────────────────────
+def sembrar(db, filas: int):
+    print(f"\n🌱 Sembrando {filas:,} filas de artículo...")
+
+    col = db.devoluciones
+    col.drop()
+    col.create_index("fecha")
+
+    rnd = random.Random(filas)
+    lote = []
+
+    for i in range(filas // ITEMS_POR_DOC):
+        lote.append({
+            "folio": f"B{i}",
+            "fecha": DESDE + timedelta(
+                days=rnd.randrange(DIAS),
+                minutes=rnd.randrange(24 * 60),
+            ),
+            "zona": f"Z{rnd.randrange(1, 15)}",
+            "total": round(rnd.uniform(50, 5000), 2),
+            "items": [
+                {
+                    "pasillo": f"P{rnd.randrange(1, 40)}",
+                    "cantidad": rnd.randrange(1, 10),
+                }
+                for _ in range(ITEMS_POR_DOC)
+            ],
+        })
+
+        if len(lote) == 5_000:
+            col.insert_many(lote)
+            lote = []
+
+    if lote:
+        col.insert_many(lote)
+
+
+# ─────────────────────────────────────────────
+# MEDICIÓN (SUBPROCESO)
+# ─────────────────────────────────────────────
+def medir(camino: str):
+    """
+    Se ejecuta en un proceso hijo: imprime "filas segundos rss_kb".
+    """
+    from backend.db.mongo.reportes.queries import ReportesQueries
+
+    class _Provider:
+        def __init__(self, db):
+            self._db = db
+
+        def get_collection(self, name):
+            return self._db[name]
+
+    uri, _ = _uri_y_db()
+    client = MongoClient(uri)
+    queries = ReportesQueries(_Provider(client[_bench_db_name()]))
+
+    filtros = rango_fechas(DESDE, DESDE + timedelta(days=DIAS))
+
+    t0 = time.perf_counter()
+    df = queries.devoluciones_detalle(
+        filtros,
+        columnar=(camino == "columnar"),
+    )
+    segundos = time.perf_counter() - t0
+
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    sys.__stdout__.write(f"{len(df)} {segundos} {rss_kb}\n")
+
+
+def _lanzar(camino: str) -> tuple[int, float, int]:
+    salida = subprocess.run(
+        [sys.executable, "-m", "backend.scripts.bench_columnar", "--medir", camino],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip().splitlines()[-1]
+
+    filas, segundos, rss = salida.split()
+    return int(filas), float(segundos), int(rss)
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+def main():
+    print("\n========== BENCH LECTURA COLUMNAR ==========")
+
+    uri, _ = _uri_y_db()
+    client = MongoClient(uri)
+    nombre = _bench_db_name()
+    db = client[nombre]
+    print("Base de benchmark:", nombre)
+
+    try:
+        for tamano in TAMANOS:
+            sembrar(db, tamano)
+
+            print(f"\n📐 {tamano:,} filas")
+            print(f"   {'camino':10}{'filas':>12}{'filas/s':>14}{'RSS pico MB':>14}")
+
+            for camino in ("dicts", "columnar"):
+                filas, segundos, rss_kb = _lanzar(camino)
+                print(
+                    f"   {camino:10}{filas:>12,}"
+                    f"{filas / segundos:>14,.0f}{rss_kb / 1024:>14.1f}"
+                )
+    finally:
+        client.drop_database(nombre)
+        print("\n🧹 Base de benchmark eliminada")
+
+    print("\n========== FIN BENCH ==========\n")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--medir":
+        medir(sys.argv[2])
+    else:
+        main()
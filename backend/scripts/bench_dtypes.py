@@ -0,0 +1,131 @@
+"""
+Benchmark: dtypes del DataFrame de reportes.
+
+OBJETIVO:
+- Comparar el frame "objeto" (dimensiones como texto Python,
+  enteros int64) contra el frame compacto (dimensiones
+  categóricas, enteros angostos)
+- Medir memoria (memory_usage deep) y tiempo de los groupby
+  típicos de las agregaciones
+
+Datos sintéticos en memoria: no toca Mongo.
+
+USO:
+    python -m backend.scripts.bench_dtypes
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.services.reportes.normalization.dtypes import (
+    como_categoria,
+    entero_compacto,
+)
+
+
+# ─────────────────────────────────────────────
+# CONFIGURACIÓN
+# ─────────────────────────────────────────────
+FILAS = 1_000_000
+REPETICIONES = 3
+
+KPIS = ["importe", "piezas", "devoluciones"]
+
+GROUPBYS = {
+    "zona": ["zona"],
+    "pasillo × fecha": ["pasillo", "fecha"],
+    "persona": ["persona_id"],
+    "tabla": ["fecha", "zona", "pasillo", "persona_nombre"],
+}
+
+
+# ─────────────────────────────────────────────
+# DATOS SINTÉTICOS
+# ─────────────────────────────────────────────
+def frame_objeto() -> pd.DataFrame:
+    rnd = np.random.default_rng(0)
+    persona = rnd.integers(0, 150, FILAS)
+
+    return pd.DataFrame({
+        "fecha": np.datetime64("2024-01-01", "D")
+        + rnd.integers(0, 365, FILAS).astype("timedelta64[D]"),
+        "zona": np.array(
+            [f"Z{i}" for i in rnd.integers(1, 15, FILAS)], dtype=object
+        ),
+        "pasillo": np.array(
+            [f"P{i}" for i in rnd.integers(1, 40, FILAS)], dtype=object
+        ),
+        "persona_id": np.array(
+            [f"{i:024x}" for i in persona], dtype=object
+        ),
+        "persona_nombre": np.array(
+            [f"Persona {i}" for i in persona], dtype=object
+        ),
+        "piezas": rnd.integers(1, 10, FILAS),
+        "importe": rnd.random(FILAS) * 1000,
+        "devoluciones": np.ones(FILAS, dtype=np.int64),
+    })
+
+
+def compactar(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+
+    for col in ("zona", "pasillo", "persona_id", "persona_nombre"):
+        df[col] = como_categoria(df[col])
+
+    for col in ("piezas", "devoluciones"):
+        df[col] = entero_compacto(df[col])
+
+    return df
+
+
+# ─────────────────────────────────────────────
+# MEDICIÓN
+# ─────────────────────────────────────────────
+def _mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(index=True, deep=True).sum() / 1024 / 1024
+
+
+def _tiempo_groupby(df: pd.DataFrame, claves: list[str]) -> float:
+    mejor = float("inf")
+
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter()
+        df.groupby(claves, observed=True, sort=True)[KPIS].sum()
+        mejor = min(mejor, time.perf_counter() - t0)
+
+    return mejor
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+def main():
+    print("\n========== BENCH DTYPES ==========")
+
+    objeto = frame_objeto()
+    compacto = compactar(objeto)
+
+    mb_obj, mb_cmp = _mb(objeto), _mb(compacto)
+    print(f"\n📦 Memoria ({FILAS:,} filas)")
+    print(f"   objeto   : {mb_obj:8.1f} MB")
+    print(f"   compacto : {mb_cmp:8.1f} MB   ({mb_obj / mb_cmp:.1f}x menos)")
+
+    print("\n⏱️  groupby (mejor de", REPETICIONES, ")")
+    print(f"   {'claves':18}{'objeto':>10}{'compacto':>10}{'speedup':>10}")
+
+    for nombre, claves in GROUPBYS.items():
+        t_obj = _tiempo_groupby(objeto, claves)
+        t_cmp = _tiempo_groupby(compacto, claves)
+        print(
+            f"   {nombre:18}{t_obj:>9.3f}s{t_cmp:>9.3f}s"
+            f"{t_obj / t_cmp:>9.1f}x"
+        )
+
+    print("\n========== FIN BENCH ==========\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: filtro de fechas indexable vs filtro calculado (BD real).
+
+OBJETIVO:
+- Comparar documentos EXAMINADOS vs DEVUELTOS en los pipelines
+  de reportes, antes y después del $match indexable sobre `fecha`
+- Usa explain("executionStats"): NO modifica la BD
+
+USO:
+    python -m backend.scripts.bench_indice_fecha 2025-11-01 2025-11-30
+"""
+
+import sys
+import time
+
+from backend.db.factory import get_db
+from backend.db.mongo.reportes.filtros import rango_fechas
+from backend.db.mongo.reportes.pipelines import (
+    pipeline_devoluciones_detalle,
+    pipeline_devoluciones_resumen,
+)
+
+
+# ─────────────────────────────────────────────
+# HELPERS
+# ─────────────────────────────────────────────
+def sin_match_indexable(pipeline: list) -> list:
+    """
+    Reconstruye el pipeline ANTERIOR: quita el $match inicial
+    sobre `fecha`, dejando solo el match sobre `__fecha` calculado.
+    """
+    primera = pipeline[0].get("$match", {})
+    if "$or" in primera:
+        return pipeline[1:]
+    return pipeline
+
+
+def _buscar_stats(nodo, acumulado):
+    """
+    Recorre el explain y suma docs/keys examinados
+    (el formato cambia entre versiones de MongoDB).
+    """
+    if isinstance(nodo, dict):
+        stats = nodo.get("executionStats")
+        if isinstance(stats, dict):
+            acumulado["docs"] += stats.get("totalDocsExamined", 0)
+            acumulado["keys"] += stats.get("totalKeysExamined", 0)
+
+        for v in nodo.values():
+            _buscar_stats(v, acumulado)
+
+    elif isinstance(nodo, list):
+        for v in nodo:
+            _buscar_stats(v, acumulado)
+
+
+def medir(db, pipeline: list) -> dict:
+    explain = db.command(
+        "explain",
+        {"aggregate": "devoluciones", "pipeline": pipeline, "cursor": {}},
+        verbosity="executionStats",
+    )
+
+    stats = {"docs": 0, "keys": 0}
+    _buscar_stats(explain, stats)
+
+    t0 = time.perf_counter()
+    devueltos = sum(1 for _ in db.devoluciones.aggregate(pipeline))
+    stats["ms"] = (time.perf_counter() - t0) * 1000
+    stats["devueltos"] = devueltos
+
+    return stats
+
+
+def imprimir(nombre: str, antes: dict, despues: dict):
+    print(f"\n📐 {nombre}")
+    print(f"   {'':10}{'examinados':>12}{'keys':>10}{'devueltos':>12}{'ms':>10}")
+    for etiqueta, s in (("antes", antes), ("después", despues)):
+        print(
+            f"   {etiqueta:10}{s['docs']:>12}{s['keys']:>10}"
+            f"{s['devueltos']:>12}{s['ms']:>10.1f}"
+        )
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+def main():
+    desde = sys.argv[1] if len(sys.argv) > 1 else "2025-11-01"
+    hasta = sys.argv[2] if len(sys.argv) > 2 else "2025-11-30"
+
+    print("\n========== BENCH ÍNDICE FECHA ==========")
+    print(f"Rango: {desde} → {hasta}")
+
+    provider = get_db()
+    db = provider._db
+    filtros = rango_fechas(desde, hasta)
+
+    for nombre, builder in (
+        ("devoluciones_detalle", pipeline_devoluciones_detalle),
+        ("devoluciones_resumen", pipeline_devoluciones_resumen),
+    ):
+        nuevo = builder(filtros)
+        anterior = sin_match_indexable(nuevo)
+
+        imprimir(nombre, medir(db, anterior), medir(db, nuevo))
+
+    print("\n========== FIN BENCH ==========\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark: serialización JSON del payload de reportes.
+
+OBJETIVO:
+- Comparar el camino anterior (limpiar_json + json estándar,
+  como JSONResponse de Starlette) contra serializar_json
+  (orjson si está instalado)
+- Medir tiempo y bytes de un reporte "Dia" de un año
+- Verificar que ambos caminos producen el MISMO JSON
+- Comparar el formato de series "filas" contra "columnas"
+  (secciones de gráficas: general, zonas, pasillos, personas)
+
+Datos sintéticos en memoria: no toca Mongo.
+
+USO:
+    python -m backend.scripts.bench_json
+"""
+
+import contextlib
+import io
+import json
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from backend.services.reportes.service import ReportesService
+from backend.services.reportes.utils.json import (
+    limpiar_json,
+    orjson,
+    serializar_json,
+)
+
+
+# ─────────────────────────────────────────────
+# CONFIGURACIÓN
+# ─────────────────────────────────────────────
+FILAS = 300_000
+DESDE = date(2024, 1, 1)
+HASTA = date(2024, 12, 31)
+AGRUPAR = "Dia"
+REPETICIONES = 5
+
+KPIS = {"importe": True, "piezas": True, "devoluciones": True}
+
+SECCIONES_GRAFICAS = ["general", "por_zona", "por_pasillo", "personas_series"]
+
+
+# ─────────────────────────────────────────────
+# DATOS SINTÉTICOS (MISMAS COLUMNAS QUE EL DETALLE)
+# ─────────────────────────────────────────────
+def reporte(secciones=None, formato="filas") -> dict:
+    rnd = np.random.default_rng(0)
+    ms_anio = 365 * 24 * 3600 * 1000
+
+    raw = pd.DataFrame({
+        "fecha": np.datetime64("2024-01-01", "ms")
+        + rnd.integers(0, ms_anio, FILAS).astype("timedelta64[ms]"),
+        "zona": np.array(
+            [f"Z{i}" for i in rnd.integers(1, 15, FILAS)], dtype=object
+        ),
+        "pasillo": np.array(
+            [f"P{i}" for i in rnd.integers(1, 40, FILAS)], dtype=object
+        ),
+        "piezas": rnd.integers(1, 10, FILAS),
+        "importe": rnd.random(FILAS) * 100,
+        "devoluciones": np.ones(FILAS, dtype=np.int64),
+    })
+
+    asignaciones = [
+        {
+            "pasillo": f"P{i}",
+            "persona_id": f"persona_{i % 12}",
+            "fecha_desde": "2024-01-01",
+            "fecha_hasta": "2024-12-31",
+        }
+        for i in range(1, 40)
+    ]
+    personas_map = {f"persona_{i}": f"Persona {i}" for i in range(12)}
+
+    service = ReportesService(reportes_queries=None)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return service._construir(
+            raw,
+            asignaciones,
+            personas_map,
+            DESDE,
+            HASTA,
+            AGRUPAR,
+            KPIS,
+            service._normalizar_secciones(secciones),
+            formato,
+        )
+
+
+# ─────────────────────────────────────────────
+# CAMINOS
+# ─────────────────────────────────────────────
+def anterior(payload) -> bytes:
+    """
+    limpiar_json + render de JSONResponse (Starlette).
+    """
+    return json.dumps(
+        limpiar_json(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _medir(funcion, payload):
+    mejor = float("inf")
+
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter()
+        cuerpo = funcion(payload)
+        mejor = min(mejor, time.perf_counter() - t0)
+
+    return cuerpo, mejor
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+def main():
+    print("\n========== BENCH JSON ==========")
+    print(f"Reporte {AGRUPAR} {DESDE} → {HASTA} | {FILAS:,} filas de detalle")
+    print("Serializador:", "orjson" if orjson else "json estándar (sin orjson)")
+
+    payload = reporte()
+    print(f"Tabla: {len(payload['tabla']):,} filas | "
+          f"serie: {len(payload['general']['serie'])} puntos")
+
+    viejo, t_viejo = _medir(anterior, payload)
+    nuevo, t_nuevo = _medir(serializar_json, payload)
+
+    print(f"\n⏱️  Serialización (mejor de {REPETICIONES})")
+    print(f"   limpiar_json + json : {t_viejo * 1000:8.1f} ms "
+          f"| {len(viejo) / 1e6:6.2f} MB")
+    print(f"   serializar_json     : {t_nuevo * 1000:8.1f} ms "
+          f"| {len(nuevo) / 1e6:6.2f} MB "
+          f"({t_viejo / t_nuevo:.1f}x)")
+
+    if viejo == nuevo:
+        print("\n✅ Mismo JSON (byte a byte)")
+    elif json.loads(viejo) == json.loads(nuevo):
+        print("\n✅ Mismo JSON (mismo contenido)")
+    else:
+        print("\n❌ Los caminos producen JSON distinto")
+
+    # ─── Formato de series (solo secciones de gráficas)
+    print(f"\n📊 Series de gráficas ({', '.join(SECCIONES_GRAFICAS)})")
+
+    for formato in ("filas", "columnas"):
+        cuerpo, t = _medir(
+            serializar_json, reporte(SECCIONES_GRAFICAS, formato)
+        )
+        print(f"   {formato:<8}: {t * 1000:8.1f} ms "
+              f"| {len(cuerpo) / 1e6:6.2f} MB")
+
+    print("\n========== FIN BENCH ==========\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Refresco del rollup diario de devoluciones (BD real).
+
+OBJETIVO:
+- Mantener `devoluciones_diarias` al día para el modo "rollup"
+- Pensado para cron (ej. cada 15 minutos)
+
+USO:
+    python -m backend.scripts.refrescar_rollups              # incremental
+    python -m backend.scripts.refrescar_rollups --reconstruir
+"""
+
+import sys
+
+from backend.db.factory import get_db
+from backend.db.mongo.indexes import ensure_indexes_rollups
+from backend.db.mongo.reportes.rollups import RollupDiario
+
+
+def main():
+    print("\n========== REFRESCO ROLLUP DIARIO ==========")
+
+    provider = get_db()
+    db = provider._db
+
+    ensure_indexes_rollups(db)
+    rollup = RollupDiario(db)
+
+    if "--reconstruir" in sys.argv:
+        resultado = rollup.reconstruir()
+    else:
+        resultado = rollup.refrescar()
+
+    print("Resultado:", resultado)
+    provider.close()
+
+    print("\n========== FIN REFRESCO ==========\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Test de memoria (tracemalloc) del armado de reportes.
+
+OBJETIVO:
+- Verificar que la normalización NO copia el frame:
+  pico de memoria <= MULTIPLO_NORMALIZACION × tamaño del frame crudo
+- Verificar que el armado completo (normalización + cubo +
+  series + zona + pasillo) queda bajo MULTIPLO_TOTAL × frame crudo
+- Verificar que las agregaciones NO modifican el DataFrame
+
+NO:
+- Toca Mongo (datos sintéticos en memoria)
+- Usa mocks
+
+USO:
+    python -m backend.scripts.test_memoria_reportes
+"""
+
+import contextlib
+import io
+import sys
+import tracemalloc
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from backend.services.reportes.aggregations import (
+    agrupa_por_pasillo,
+    agrupa_por_zona,
+    construir_cubo,
+)
+from backend.services.reportes.data.dataframe import obtener_dataframe
+from backend.services.reportes.normalization import normalizar_reporte
+from backend.services.reportes.temporal.series import serie_por_mes
+
+
+# ─────────────────────────────────────────────
+# CONFIGURACIÓN
+# ─────────────────────────────────────────────
+FILAS = 200_000
+DESDE = date(2024, 1, 1)
+HASTA = date(2024, 12, 31)
+
+# Pico permitido, en múltiplos del frame crudo (memory_usage deep).
+# Las vistas leen el cubo (día × dimensiones), no las filas.
+MULTIPLO_NORMALIZACION = 0.75
+MULTIPLO_TOTAL = 1.5
+
+KPIS = {"importe": True, "piezas": True, "devoluciones": True}
+
+
+# ─────────────────────────────────────────────
+# DATOS SINTÉTICOS (MISMAS COLUMNAS QUE EL DETALLE)
+# ─────────────────────────────────────────────
+def frame_crudo() -> pd.DataFrame:
+    rnd = np.random.default_rng(0)
+    ms_anio = 365 * 24 * 3600 * 1000
+
+    return pd.DataFrame({
+        "fecha": np.datetime64("2024-01-01", "ms")
+        + rnd.integers(0, ms_anio, FILAS).astype("timedelta64[ms]"),
+        "zona": np.array(
+            [f"Z{i}" for i in rnd.integers(1, 15, FILAS)], dtype=object
+        ),
+        "pasillo": np.array(
+            [f"P{i}" for i in rnd.integers(1, 40, FILAS)], dtype=object
+        ),
+        "piezas": rnd.integers(1, 10, FILAS),
+        "importe": rnd.random(FILAS) * 100,
+        "devoluciones": np.ones(FILAS, dtype=np.int64),
+    })
+
+
+def dimensiones():
+    asignaciones = [
+        {
+            "pasillo": f"P{i}",
+            "persona_id": f"persona_{i % 12}",
+            "fecha_desde": "2024-01-01",
+            "fecha_hasta": "2024-12-31",
+        }
+        for i in range(1, 40)
+    ]
+    personas_map = {f"persona_{i}": f"Persona {i}" for i in range(12)}
+    return asignaciones, personas_map
+
+
+# ─────────────────────────────────────────────
+# ETAPAS
+# ─────────────────────────────────────────────
+def normalizar(raw, asignaciones, personas_map):
+    df = obtener_dataframe(
+        raw,
+        asignaciones=asignaciones,
+        personas_map=personas_map,
+        inplace=True,
+    )
+    return normalizar_reporte(df, KPIS)
+
+
+def agregar(df):
+    cubo = construir_cubo(df)
+    serie_por_mes(cubo, DESDE, HASTA)
+    agrupa_por_zona(cubo, KPIS)
+    agrupa_por_pasillo(cubo, KPIS)
+
+
+def _pico(funcion, *args):
+    """
+    Ejecuta `funcion` y devuelve (resultado, pico de bytes).
+    """
+    tracemalloc.reset_peak()
+    inicio = tracemalloc.get_traced_memory()[0]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = funcion(*args)
+
+    return resultado, tracemalloc.get_traced_memory()[1] - inicio
+
+
+# ─────────────────────────────────────────────
+# MAIN
+# ─────────────────────────────────────────────
+def main():
+    print("\n========== TEST MEMORIA REPORTES ==========")
+
+    raw = frame_crudo()
+    asignaciones, personas_map = dimensiones()
+    crudo = int(raw.memory_usage(index=True, deep=True).sum())
+    print(f"Frame crudo: {FILAS:,} filas | {crudo / 1e6:.1f} MB")
+
+    tracemalloc.start()
+    try:
+        df, pico_norm = _pico(normalizar, raw, asignaciones, personas_map)
+        referencia = df.copy()
+
+        _, pico_agg = _pico(agregar, df)
+    finally:
+        tracemalloc.stop()
+
+    pico_total = pico_norm + pico_agg
+
+    errores = []
+
+    print(f"\n📐 Normalización : {pico_norm / crudo:.2f}x "
+          f"(máx {MULTIPLO_NORMALIZACION}x)")
+    if pico_norm > MULTIPLO_NORMALIZACION * crudo:
+        errores.append("la normalización supera su presupuesto")
+
+    print(f"📐 Armado total  : {pico_total / crudo:.2f}x "
+          f"(máx {MULTIPLO_TOTAL}x)")
+    if pico_total > MULTIPLO_TOTAL * crudo:
+        errores.append("el armado completo supera su presupuesto")
+
+    if not df.equals(referencia):
+        errores.append("las agregaciones modificaron el DataFrame")
+    else:
+        print("🔒 Agregaciones de solo lectura")
+
+    if errores:
+        for e in errores:
+            print("❌", e)
+        sys.exit(1)
+
+    print("\n✅ Memoria dentro de presupuesto")
+    print("\n========== FIN TEST ==========\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,16 @@ Este paquete expone funciones de agregación
 que operan sobre DataFrames normalizados.
 """
 
+from .cubo import construir_cubo, partir_cubo, unir_cubos
 from .general import agrupa_general
 from .zona import agrupa_por_zona
 from .pasillo import agrupa_por_pasillo
 from .tabla import tabla_final
 
 __all__ = [
+    "construir_cubo",
+    "partir_cubo",
+    "unir_cubos",
     "agrupa_general",
     "agrupa_por_zona",
     "agrupa_por_pasillo",
@@ -0,0 +1,104 @@
+import pandas as pd
+
+from backend.services.reportes.normalization.dtypes import (
+    DIMENSIONES,
+    como_categoria,
+)
+
+
+# Claves del cubo base: cubren TODAS las vistas del reporte
+# (serie general, zona, pasillo, personas y tabla).
+CLAVES_CUBO = [
+    "fecha",
+    "zona",
+    "pasillo",
+    "persona",
+    "persona_id",
+    "persona_nombre",
+]
+
+KPIS_CUBO = ["importe", "piezas", "devoluciones"]
+
+
+def construir_cubo(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cubo base del reporte: DÍA × zona × pasillo × persona
+    con los KPIs sumados.
+
+    RESPONSABILIDAD:
+    - Recorrer las filas de detalle UNA sola vez
+    - Devolver un DataFrame con las MISMAS columnas que el
+      detalle (una fila por grupo): las vistas se calculan
+      sobre el cubo sin cambios
+
+    - fecha se trunca al día (grano mínimo de todas las vistas)
+    - Los grupos con claves nulas se conservan (dropna=False)
+    - Orden de filas: por día; dentro del día, primera aparición
+      de cada grupo. Así el cubo de un rango es la concatenación
+      de los cubos de sus días (ver CacheDias)
+    """
+    if df is None or df.empty:
+        return df
+
+    claves = [c for c in CLAVES_CUBO if c in df.columns]
+    kpis = [c for c in KPIS_CUBO if c in df.columns]
+
+    agrupadores = [
+        df["fecha"].dt.normalize() if c == "fecha" else c
+        for c in claves
+    ]
+
+    cubo = (
+        df.groupby(agrupadores, dropna=False, sort=False, observed=True)[kpis]
+        .sum()
+        .reset_index()
+    )
+
+    if "fecha" in cubo.columns:
+        cubo = cubo.sort_values("fecha", kind="stable", ignore_index=True)
+
+    return cubo
+
+
+def partir_cubo(cubo: pd.DataFrame, dias: pd.DatetimeIndex) -> dict:
+    """
+    Cubo de un rango → {día: cubo del día} para TODOS los `dias`
+    (los días sin filas quedan como DataFrame vacío).
+
+    Filas con fecha fuera de `dias` (o nula) se descartan.
+    """
+    partes = {dia: pd.DataFrame() for dia in dias}
+
+    if cubo is None or cubo.empty:
+        return partes
+
+    for dia, filas in cubo.groupby("fecha", sort=False):
+        if dia in partes:
+            partes[dia] = filas.reset_index(drop=True)
+
+    return partes
+
+
+def unir_cubos(cubos: list) -> pd.DataFrame | None:
+    """
+    Concatena cubos de días consecutivos (en orden de día):
+    mismo resultado que construir_cubo sobre el rango completo.
+
+    Las dimensiones vuelven a ser categóricas aunque cada día
+    traiga sus propias categorías.
+    """
+    partes = [c for c in cubos if c is not None and not c.empty]
+
+    if not partes:
+        return None
+
+    if len(partes) == 1:
+        return partes[0]
+
+    cubo = pd.concat(partes, ignore_index=True)
+
+    for col in DIMENSIONES:
+        if col in cubo.columns:
+            cubo[col] = como_categoria(cubo[col])
+
+    return cubo
@@ -1,3 +1,9 @@
+import numpy as np
+import pandas as pd
+
+from .segmentos import codigos, segmentos, sumas
+
+
 def agrupa_general(df, kpis):
     """
     Agrupación GENERAL por fecha real (datetime).
@@ -8,6 +14,10 @@ def agrupa_general(df, kpis):
     - Desglosar KPIs por persona
     - NO formatear fechas (eso es del frontend)
 
+    Fecha y (fecha, persona) se resuelven con códigos enteros
+    y dos ordenamientos estables: sin groupby anidados ni
+    un .sum() por grupo.
+
     RETORNA:
     List[dict] compatible con charts.js:
 
@@ -53,65 +63,78 @@ def agrupa_general(df, kpis):
     if not kpi_cols:
         return []
 
-    resultado = []
+    # ─────────────────────────────
+    # Códigos fecha / persona (orden de groupby, nulos al final)
+    # ─────────────────────────────
+    fecha, fechas = codigos(df["fecha"], nulo=pd.NaT)
+    persona, ids = codigos(df["persona_id"])
+
+    valores = {col: df[col].to_numpy() for col in kpi_cols}
+    nombres = (
+        df["persona_nombre"].to_numpy()
+        if "persona_nombre" in df.columns
+        else None
+    )
 
     # ─────────────────────────────
-    # Agrupación GENERAL por fecha
+    # KPIs globales por fecha
     # ─────────────────────────────
-    for fecha, df_fecha in df.groupby("fecha", dropna=False):
-
-        # ───────── KPIs globales
-        kpis_globales = {}
-        for col in kpi_cols:
-            total = df_fecha[col].sum()
-            kpis_globales[col] = (
-                float(total) if col == "importe" else int(total)
-            )
-
-        # ───────── KPIs por persona
-        personas = []
-
-        for persona_id, df_persona in df_fecha.groupby("persona_id", dropna=False):
-
-            # Normalizar ID
-            persona_id_norm = persona_id if persona_id else "SIN_ASIGNACION"
-
-            # Resolver nombre de forma segura
-            nombre = None
-            if "persona_nombre" in df_persona.columns:
-                val = df_persona["persona_nombre"].iloc[0]
-                if val and str(val).strip():
-                    nombre = str(val)
-
-            if not nombre:
-                nombre = "Sin asignación"
-
-            # KPIs por persona
-            kpis_persona = {}
-            for col in kpi_cols:
-                total = df_persona[col].sum()
-                kpis_persona[col] = (
-                    float(total) if col == "importe" else int(total)
-                )
-
-            personas.append({
-                "id": persona_id_norm,
-                "nombre": nombre,
-                "kpis": kpis_persona
-            })
-
-        # ───────── Punto temporal final
+    orden, inicios, fines = segmentos(fecha)
+    puntos = fecha[orden][inicios]
+
+    totales = {
+        col: sumas(valores[col], orden, inicios, fines)
+        for col in kpi_cols
+    }
+
+    resultado = []
+
+    for i, f in enumerate(puntos):
         resultado.append({
-            "fecha": fecha,                  # datetime real
-            "key": fecha.isoformat(),         # clave estable
-            "label": fecha.isoformat(),       # frontend decide formato
-            "kpis": kpis_globales,
-            "personas": personas
+            "fecha": fechas[f],                  # datetime real
+            "key": fechas[f].isoformat(),         # clave estable
+            "label": fechas[f].isoformat(),       # frontend decide formato
+            "kpis": _kpis(kpi_cols, totales, i),
+            "personas": [],
         })
 
     # ─────────────────────────────
-    # Orden cronológico estricto
+    # KPIs por (fecha, persona): un solo ordenamiento
     # ─────────────────────────────
-    resultado.sort(key=lambda x: x["fecha"])
+    orden, inicios, fines = segmentos(fecha * len(ids) + persona)
+    primeras = orden[inicios]
+
+    por_persona = {
+        col: sumas(valores[col], orden, inicios, fines)
+        for col in kpi_cols
+    }
+
+    punto = np.searchsorted(puntos, fecha[primeras])
+
+    for i, (p, fila) in enumerate(zip(punto, primeras)):
+        persona_id = ids[persona[fila]]
+
+        resultado[p]["personas"].append({
+            "id": persona_id if persona_id else "SIN_ASIGNACION",
+            "nombre": _nombre(nombres[fila] if nombres is not None else None),
+            "kpis": _kpis(kpi_cols, por_persona, i),
+        })
 
     return resultado
+
+
+def _kpis(kpi_cols, totales, i):
+    return {
+        col: float(totales[col][i]) if col == "importe" else int(totales[col][i])
+        for col in kpi_cols
+    }
+
+
+def _nombre(val):
+    """
+    Nombre de la persona (primera fila del grupo) o
+    "Sin asignación" si viene vacío.
+    """
+    if val and str(val).strip():
+        return str(val)
+    return "Sin asignación"
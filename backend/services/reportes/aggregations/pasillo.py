@@ -1,44 +1,46 @@
-def agrupa_por_pasillo(df, kpis):
+from backend.services.reportes.normalization.dtypes import categoria_sin_invalidos
+
+
+# Valores de pasillo que no cuentan como pasillo real
+PASILLOS_INVALIDOS = ("nan", "None", "—", "-", "")
+
+
+def _columnas(kpis):
+    """
+    Solo las columnas que se leen: groupby ordena una copia
+    de lo seleccionado, no del frame completo.
+    """
+    return ["fecha"] + [
+        col for col in ("importe", "piezas", "devoluciones")
+        if kpis.get(col)
+    ]
+
+
+def agrupa_por_pasillo(df, kpis, columnas=False):
     """
     Agrupación por pasillo.
 
     - Excluye registros sin pasillo válido
     - Normaliza valores inválidos ('—', None, '')
     - Devuelve claves semánticas consistentes para el frontend
+    - columnas=True: "series" = {"fecha": [...], "<kpi>": [...]}
     """
     if df is None or df.empty or "pasillo" not in df.columns:
         return {}
 
     # ─────────────────────────
     # Normalización de pasillo
+    # (clave aparte: df NO se copia ni se modifica)
     # ─────────────────────────
-    df = df.copy()
-
-    df["pasillo"] = (
-        df["pasillo"]
-        .astype(str)
-        .str.strip()
-        .replace({
-            "nan": None,
-            "None": None,
-            "—": None,
-            "-": None,
-            "": None,
-        })
-    )
-
-    # Eliminar filas sin pasillo válido
-    df = df[df["pasillo"].notna()]
-
-    if df.empty:
-        return {}
+    clave = categoria_sin_invalidos(df["pasillo"], PASILLOS_INVALIDOS)
 
     resultado = {}
 
     # ─────────────────────────
     # Agrupación por pasillo
+    # (groupby descarta las claves nulas = pasillo inválido)
     # ─────────────────────────
-    for pasillo, g in df.groupby("pasillo"):
+    for pasillo, g in df.groupby(clave, observed=True)[_columnas(kpis)]:
 
         resumen = {}
 
@@ -67,7 +69,7 @@ def agrupa_por_pasillo(df, kpis):
             continue
 
         df_agg = (
-            g.groupby("fecha", as_index=False)
+            g.groupby("fecha", as_index=False, observed=True)
             .agg(**agg)
             .sort_values("fecha")
         )
@@ -75,8 +77,14 @@ def agrupa_por_pasillo(df, kpis):
         # Normalizar fecha a string ISO
         df_agg["fecha"] = df_agg["fecha"].dt.strftime("%Y-%m-%d")
 
+        if columnas:
+            series = {"fecha": df_agg["fecha"].tolist()}
+            series.update({col: df_agg[col].to_numpy() for col in agg})
+        else:
+            series = df_agg.to_dict(orient="records")
+
         resultado[str(pasillo)] = {
-            "series": df_agg.to_dict(orient="records"),
+            "series": series,
             "resumen": resumen,
         }
 
@@ -1,9 +1,63 @@
+import numpy as np
+import pandas as pd
+
+
+def columnas_tabla(df):
+    """
+    Claves de la tabla: fecha + dimensiones disponibles.
+    """
+    return ["fecha"] + [
+        col for col in ("zona", "pasillo", "persona")
+        if col in df.columns
+    ]
+
+
+def _persona_resuelta(serie):
+    """
+    persona_id / persona_nombre como texto; sin persona → "".
+    """
+    return serie.astype(object).where(serie.notna(), "")
+
+
+def _sin_nulos(serie):
+    """
+    Columna como object con NaN / NaT → None.
+    """
+    return serie.astype(object).where(serie.notna(), None)
+
+
+def filas_tabla(grp, group_cols, dimensiones=("zona", "pasillo", "persona")):
+    """
+    Filas de salida a partir de un frame YA agrupado y ordenado
+    (una fila por grupo, columnas = group_cols + KPIs).
+
+    Se castea columna por columna y los registros se emiten
+    con un solo to_dict: sin iterrows ni un Series por fila.
+    Los nulos salen como None (limpieza por columna, no por
+    valor al serializar).
+    """
+    columnas = {
+        "fecha": _sin_nulos(grp["fecha"].dt.strftime("%Y-%m-%d")),
+        "devoluciones": grp["devoluciones"].astype(np.int64),
+        "piezas": grp["piezas"].astype(np.int64),
+        "importe": grp["importe"].astype(np.float64),
+    }
+
+    for col in dimensiones:
+        if col in group_cols:
+            columnas[col] = _sin_nulos(grp[col])
+
+    return pd.DataFrame(columnas).to_dict("records")
+
+
 def tabla_final(df):
     """
     Tabla de detalle final.
 
     RESPONSABILIDAD:
     - Mostrar totales por fecha + dimensiones disponibles
+    - persona = persona RESUELTA (obtener_dataframe):
+      persona_id ("" sin asignación) + su nombre
     - NO depende de 'periodo'
     - NO calendariza
     """
@@ -13,19 +67,25 @@ def tabla_final(df):
     if "fecha" not in df.columns:
         raise ValueError("tabla_final requiere columna 'fecha'")
 
-    group_cols = ["fecha"]
-
-    if "zona" in df.columns:
-        group_cols.append("zona")
+    group_cols = columnas_tabla(df)
+    dimensiones = ("zona", "pasillo", "persona")
 
-    if "pasillo" in df.columns:
-        group_cols.append("pasillo")
-
-    if "persona" in df.columns:
-        group_cols.append("persona")
+    if "persona_id" in df.columns:
+        nombres = (
+            df["persona_nombre"] if "persona_nombre" in df.columns
+            else df["persona_id"]
+        )
+        df = df.assign(
+            persona_id=_persona_resuelta(df["persona_id"]),
+            persona=_persona_resuelta(nombres),
+        )
+        group_cols = [
+            c for c in group_cols if c != "persona"
+        ] + ["persona_id", "persona"]
+        dimensiones = ("zona", "pasillo", "persona_id", "persona")
 
     grp = (
-        df.groupby(group_cols, as_index=False)
+        df.groupby(group_cols, as_index=False, observed=True)
         .agg(
             devoluciones=("devoluciones", "sum"),
             piezas=("piezas", "sum"),
@@ -34,26 +94,4 @@ def tabla_final(df):
         .sort_values(group_cols)
     )
 
-    grp["fecha"] = grp["fecha"].dt.strftime("%Y-%m-%d")
-
-    salida = []
-    for _, r in grp.iterrows():
-        row = {
-            "fecha": r["fecha"],
-            "devoluciones": int(r["devoluciones"]),
-            "piezas": int(r["piezas"]),
-            "importe": float(r["importe"]),
-        }
-
-        if "zona" in grp.columns:
-            row["zona"] = r.get("zona")
-
-        if "pasillo" in grp.columns:
-            row["pasillo"] = r.get("pasillo")
-
-        if "persona" in grp.columns:
-            row["persona"] = r.get("persona")
-
-        salida.append(row)
-
-    return salida
+    return filas_tabla(grp, group_cols, dimensiones)
@@ -1,4 +1,15 @@
-def agrupa_por_zona(df, kpis):
+def _columnas(kpis):
+    """
+    Solo las columnas que se leen: groupby ordena una copia
+    de lo seleccionado, no del frame completo.
+    """
+    return ["fecha"] + [
+        col for col in ("importe", "piezas", "devoluciones")
+        if kpis.get(col)
+    ]
+
+
+def agrupa_por_zona(df, kpis, columnas=False):
     """
     Agrupación por zona.
 
@@ -9,13 +20,16 @@ def agrupa_por_zona(df, kpis):
             "resumen": {...}
         }
     }
+
+    columnas=True: "series" = {"fecha": [...], "<kpi>": [...]}
+    (un arreglo por columna en lugar de un dict por fecha).
     """
     if df is None or df.empty or "zona" not in df.columns:
         return {}
 
     resultado = {}
 
-    for zona, g in df.groupby("zona"):
+    for zona, g in df.groupby("zona", observed=True)[_columnas(kpis)]:
         if not zona:
             continue
 
@@ -39,15 +53,21 @@ def agrupa_por_zona(df, kpis):
             continue
 
         df_agg = (
-            g.groupby("fecha", as_index=False)
+            g.groupby("fecha", as_index=False, observed=True)
             .agg(**agg)
             .sort_values("fecha")
         )
 
         df_agg["fecha"] = df_agg["fecha"].dt.strftime("%Y-%m-%d")
 
+        if columnas:
+            series = {"fecha": df_agg["fecha"].tolist()}
+            series.update({col: df_agg[col].to_numpy() for col in agg})
+        else:
+            series = df_agg.to_dict(orient="records")
+
         resultado[zona] = {
-            "series": df_agg.to_dict(orient="records"),
+            "series": series,
             "resumen": resumen,
         }
 
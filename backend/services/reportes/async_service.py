@@ -0,0 +1,187 @@
+import asyncio
+
+import pandas as pd
+
+from backend.db.mongo.reportes.filtros import (
+    rango_fechas,
+    combinar_filtros,
+)
+from backend.services.reportes.service import (
+    ReportesService,
+    MODO_DIARIO,
+    MODO_ROLLUP,
+    SECCIONES,
+    FORMATO_FILAS,
+    tramos_faltantes,
+)
+
+
+class AsyncReportesService(ReportesService):
+    """
+    Servicio de reportes ASÍNCRONO (solo lectura).
+
+    RESPONSABILIDAD:
+    - Esperar las lecturas Mongo SIN bloquear el event loop
+      (detalle + personal + asignaciones en paralelo)
+    - Delegar la construcción pandas (CPU) a un hilo aparte
+    - Producir EXACTAMENTE el mismo payload que ReportesService
+
+    reportes_queries: AsyncReportesQueries
+    """
+
+    # ─────────────────────────────
+    # API PÚBLICA
+    # ─────────────────────────────
+    async def generar(
+        self,
+        desde,
+        hasta,
+        agrupar="Mes",
+        kpis=None,
+        secciones=None,
+        formato=FORMATO_FILAS,
+    ):
+
+        # ─── KPIs / secciones / formato
+        kpis = self._normalizar_kpis(kpis)
+        secciones = self._normalizar_secciones(secciones)
+        formato = self._normalizar_formato(formato)
+
+        # ─── Fechas
+        desde, hasta = self._normalizar_fechas(desde, hasta)
+        if not desde or not hasta or desde > hasta:
+            return self._resultado_error(kpis, "Rango de fechas inválido")
+
+        # ─── Cache de resultados (sin bloquear el event loop:
+        # no se espera a otro cálculo de la misma clave)
+        if self.cache is None:
+            return await self._generar_async(
+                desde, hasta, agrupar, kpis, secciones, formato
+            )
+
+        clave = self._clave_cache(
+            desde, hasta, agrupar, kpis, secciones, formato
+        )
+
+        encontrado, resultado = self.cache.consultar(clave)
+        if encontrado:
+            return resultado
+
+        generacion = self.cache.generacion
+        resultado = await self._generar_async(
+            desde, hasta, agrupar, kpis, secciones, formato
+        )
+        self.cache.guardar(clave, resultado, hasta, generacion)
+
+        return resultado
+
+    async def _generar_async(
+        self,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Pipeline completo para un request YA normalizado.
+        """
+
+        # ─── Cubos por día (solo los días que faltan)
+        if self._usa_cache_dias(agrupar):
+            return await self._generar_por_dias_async(
+                desde, hasta, agrupar, kpis, secciones, formato
+            )
+
+        # ─── Filtros Mongo
+        filtros = combinar_filtros(
+            rango_fechas(desde, hasta)
+        )
+
+        # ─── Query base + dimensiones (CONCURRENTES)
+        raw, asignaciones, personas_map = await asyncio.gather(
+            self._cargar_base_async(filtros),
+            self.reportes_queries.asignaciones_personal(),
+            self.reportes_queries.personas_activas(),
+        )
+
+        if raw is None or raw.empty:
+            return self._resultado_vacio(
+                kpis, desde, hasta, agrupar, secciones, formato
+            )
+
+        # ─── Construcción (CPU) fuera del event loop
+        return await asyncio.to_thread(
+            self._construir,
+            raw,
+            asignaciones,
+            personas_map,
+            desde,
+            hasta,
+            agrupar,
+            kpis,
+            secciones,
+            formato,
+        )
+
+    async def _generar_por_dias_async(
+        self,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Variante async de _generar_por_dias: los tramos faltantes
+        se leen en paralelo; cubos y vistas corren en un hilo.
+        """
+        asignaciones, personas_map = await asyncio.gather(
+            self.reportes_queries.asignaciones_personal(),
+            self.reportes_queries.personas_activas(),
+        )
+
+        firma = self._firma_dias(asignaciones, personas_map, kpis)
+        dias = pd.date_range(desde, hasta, freq="D")
+
+        generacion = self.cache_dias.generacion
+        cubos = self.cache_dias.consultar(firma, dias)
+        tramos = tramos_faltantes(dias, cubos)
+
+        raws = await asyncio.gather(*(
+            self._cargar_base_async(
+                combinar_filtros(rango_fechas(d1, d2))
+            )
+            for d1, d2 in tramos
+        ))
+
+        return await asyncio.to_thread(
+            self._construir_por_dias,
+            firma,
+            generacion,
+            cubos,
+            tramos,
+            list(raws),
+            asignaciones,
+            personas_map,
+            desde,
+            hasta,
+            agrupar,
+            kpis,
+            secciones,
+            formato,
+        )
+
+    # ─────────────────────────────
+    # HELPERS
+    # ─────────────────────────────
+    async def _cargar_base_async(self, filtros):
+        # "streaming" no tiene variante async: se lee el detalle
+        # completo (la construcción ya corre fuera del event loop).
+        # "rollup" tampoco: se leen los buckets diarios en vivo.
+        if self.modo in (MODO_DIARIO, MODO_ROLLUP):
+            return await self.reportes_queries.devoluciones_diarias(filtros)
+
+        return await self.reportes_queries.devoluciones_detalle(filtros)
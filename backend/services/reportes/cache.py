@@ -0,0 +1,454 @@
+"""
+Caches en memoria del pipeline de reportes.
+
+CacheResultados: payload final por request.
+CacheDias: cubo parcial (día × zona × pasillo × persona) por día.
+
+RESPONSABILIDAD (CacheResultados):
+- Evitar re-ejecutar el pipeline completo para el mismo request
+  (mismo mes abierto por varias personas durante el día)
+- Clave = request normalizado (desde, hasta, periodo, kpis, modo)
+- LRU acotado por número de entradas
+- TTL según el rango:
+    · toca días abiertos (hoy y los DIAS_MARGEN previos, donde
+      aún llegan devoluciones tarde) → TTL corto
+    · solo periodos cerrados (no cambian) → TTL largo
+- Seguro bajo concurrencia (threadpool de FastAPI); un solo
+  hilo calcula cada clave
+
+REGLAS:
+- Los payloads cacheados son de SOLO LECTURA para el caller
+- Los resultados con "error" NO se guardan
+- Una invalidación descarta también los cálculos en curso
+- El TTL del rango solo se alarga con `ttl_minimo` explícito
+  (precalentado con REPORTES_PRECALENTAR_TTL_EXTENDIDO, apagado
+  por defecto): con él, un rango con días abiertos puede servir
+  datos de hasta `ttl_minimo` segundos en vez de TTL_RECIENTE
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+import pandas as pd
+
+from backend.db.mongo.reportes.rollups import DIAS_MARGEN
+
+
+# Valores por defecto
+MAX_RESULTADOS = 64
+TTL_RECIENTE = 60.0            # segundos: rangos que tocan días abiertos
+TTL_CERRADO = 12 * 3600.0      # segundos: rangos solo en el pasado
+MAX_DIAS = 3 * 366             # días de cubo parcial en memoria
+
+
+class CacheResultados:
+    """
+    Cache LRU + TTL de payloads de ReportesService.generar().
+    """
+
+    def __init__(
+        self,
+        max_entradas: int = MAX_RESULTADOS,
+        ttl_reciente: float = TTL_RECIENTE,
+        ttl_cerrado: float = TTL_CERRADO,
+        dias_abiertos: int = DIAS_MARGEN,
+    ):
+        self.max_entradas = int(max_entradas)
+        self.ttl_reciente = float(ttl_reciente)
+        self.ttl_cerrado = float(ttl_cerrado)
+        self.dias_abiertos = int(dias_abiertos)
+
+        self._lock = threading.Lock()
+        # clave → (expira, creado, valor, versión)
+        self._datos: "OrderedDict[Hashable, Tuple[float, float, Any, int]]" = OrderedDict()
+        # clave → [lock, hilos usándola] (solo claves en cálculo)
+        self._cargas: Dict[Hashable, list] = {}
+        self._generacion = 0
+        self._version = 0
+        # Distingue las versiones de cada proceso (varios workers)
+        self._instancia = os.urandom(6).hex()
+
+        self.hits = 0
+        self.misses = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+
+    # ─────────────────────────────
+    # TTL
+    # ─────────────────────────────
+    def ttl(self, hasta: date, hoy: date | None = None) -> float:
+        """
+        TTL corto si el rango llega a días que aún cambian.
+        """
+        hoy = hoy or date.today()
+        if hasta >= hoy - timedelta(days=self.dias_abiertos):
+            return self.ttl_reciente
+        return self.ttl_cerrado
+
+    # ─────────────────────────────
+    # LECTURA
+    # ─────────────────────────────
+    def consultar(
+        self,
+        clave: Hashable,
+        vigencia_minima: float = 0.0,
+    ) -> Tuple[bool, Any]:
+        """
+        Devuelve (encontrado, valor) y cuenta hit / miss.
+
+        vigencia_minima: una entrada que vence antes de esos
+        segundos cuenta como miss.
+        """
+        with self._lock:
+            entrada = self._datos.get(clave)
+
+            if entrada and entrada[0] > time.monotonic() + vigencia_minima:
+                self._datos.move_to_end(clave)
+                self.hits += 1
+                return True, entrada[2]
+
+            self.misses += 1
+            return False, None
+
+    def entrada(self, clave: Hashable) -> dict | None:
+        """
+        Edad / TTL de una clave SIN contar hit / miss
+        (observabilidad); None si no está.
+        """
+        ahora = time.monotonic()
+
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            return _describir(entrada, ahora)
+
+    def version(self, clave: Hashable, valor: Any = None) -> str | None:
+        """
+        Versión de la entrada VIGENTE de `clave` (cambia cada vez
+        que se guarda), SIN contar hit / miss; None si no hay.
+
+        Con `valor`: solo si la entrada guarda ESE payload (el
+        que se va a servir).
+        """
+        with self._lock:
+            entrada = self._datos.get(clave)
+
+            if not entrada or entrada[0] <= time.monotonic():
+                return None
+            if valor is not None and entrada[2] is not valor:
+                return None
+            return f"{self._instancia}.{entrada[3]}"
+
+    def obtener(
+        self,
+        clave: Hashable,
+        hasta: date,
+        calcular: Callable[[], Any],
+        vigencia_minima: float = 0.0,
+        ttl_minimo: float | None = None,
+    ) -> Any:
+        """
+        Devuelve el payload vigente o lo calcula con `calcular()`.
+
+        Solo UN hilo calcula cada clave; los demás esperan
+        y reutilizan el resultado.
+
+        vigencia_minima / ttl_minimo: ver consultar() / guardar().
+        """
+        with self._lock:
+            carga = self._cargas.setdefault(clave, [threading.Lock(), 0])
+            carga[1] += 1
+
+        try:
+            with carga[0]:
+                encontrado, valor = self.consultar(clave, vigencia_minima)
+                if encontrado:
+                    return valor
+
+                generacion = self.generacion
+                valor = calcular()
+                self.guardar(clave, valor, hasta, generacion, ttl_minimo)
+                return valor
+        finally:
+            # El lock de la clave vive solo mientras alguien la usa
+            with self._lock:
+                carga[1] -= 1
+                if carga[1] == 0 and self._cargas.get(clave) is carga:
+                    del self._cargas[clave]
+
+    # ─────────────────────────────
+    # ESCRITURA
+    # ─────────────────────────────
+    @property
+    def generacion(self) -> int:
+        with self._lock:
+            return self._generacion
+
+    def guardar(
+        self,
+        clave: Hashable,
+        valor: Any,
+        hasta: date,
+        generacion: int,
+        ttl_minimo: float | None = None,
+    ) -> None:
+        """
+        Guarda `valor` solo si no hubo invalidación desde
+        `generacion` y no es un resultado de error.
+
+        ttl_minimo: alarga el TTL del rango (nunca lo acorta);
+        solo lo pasa el precalentado con TTL extendido.
+        """
+        if not isinstance(valor, dict) or valor.get("error"):
+            return
+
+        ttl = self.ttl(hasta)
+        if ttl <= 0 or self.max_entradas <= 0:
+            return
+
+        if ttl_minimo is not None:
+            ttl = max(ttl, float(ttl_minimo))
+
+        ahora = time.monotonic()
+
+        with self._lock:
+            if generacion != self._generacion:
+                return
+
+            self._version += 1
+            self._datos[clave] = (ahora + ttl, ahora, valor, self._version)
+            self._datos.move_to_end(clave)
+
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self, clave: Hashable | None = None) -> None:
+        """
+        Invalida una clave o TODO el cache (clave=None).
+        """
+        with self._lock:
+            if clave is None:
+                self._datos.clear()
+                self._cargas.clear()
+            else:
+                self._datos.pop(clave, None)
+
+            self._generacion += 1
+            self.invalidaciones += 1
+
+    # ─────────────────────────────
+    # OBSERVABILIDAD
+    # ─────────────────────────────
+    def stats(self) -> dict:
+        ahora = time.monotonic()
+
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "max_entradas": self.max_entradas,
+                "ttl_reciente_segundos": self.ttl_reciente,
+                "ttl_cerrado_segundos": self.ttl_cerrado,
+                "dias_abiertos": self.dias_abiertos,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+                "desalojos": self.desalojos,
+                "invalidaciones": self.invalidaciones,
+                "entradas": {
+                    str(clave): _describir(entrada, ahora)
+                    for clave, entrada in self._datos.items()
+                },
+            }
+
+
+def _describir(entrada, ahora: float) -> dict:
+    expira, creado = entrada[:2]
+    return {
+        "edad_segundos": round(ahora - creado, 3),
+        "ttl_segundos": round(expira - creado, 3),
+        "vigente": expira > ahora,
+    }
+
+
+def firma_dimensiones(asignaciones, personas_map) -> str:
+    """
+    Huella de personas / asignaciones: el cubo de un día depende
+    de ellas (persona_id / persona_nombre de cada fila).
+    """
+    contenido = repr((
+        sorted(personas_map.items(), key=lambda kv: str(kv[0])),
+        [sorted(a.items(), key=lambda kv: kv[0]) for a in asignaciones],
+    ))
+    return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+
+
+class CacheDias:
+    """
+    Cache LRU + TTL de cubos parciales POR DÍA.
+
+    RESPONSABILIDAD:
+    - Guardar el cubo de cada día ya calculado, para que un
+      rango nuevo solo lea de Mongo los días que faltan
+    - Clave = (firma, día); la firma cubre todo lo que cambia
+      el cubo de un día (modo de carga, importe, dimensiones)
+    - Los días sin filas también se guardan (cubo vacío)
+
+    REGLAS:
+    - Los días abiertos (hoy y los `dias_abiertos` previos)
+      NUNCA se guardan: aún pueden cambiar
+    - Los cubos cacheados son de SOLO LECTURA para el caller
+    - Una invalidación descarta también las lecturas en curso
+    """
+
+    def __init__(
+        self,
+        max_dias: int = MAX_DIAS,
+        ttl_segundos: float = TTL_CERRADO,
+        dias_abiertos: int = DIAS_MARGEN,
+    ):
+        self.max_dias = int(max_dias)
+        self.ttl = float(ttl_segundos)
+        self.dias_abiertos = int(dias_abiertos)
+
+        self._lock = threading.Lock()
+        self._datos: "OrderedDict[Hashable, Tuple[float, float, pd.DataFrame]]" = OrderedDict()
+        self._generacion = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+
+    def cerrado(self, dia: pd.Timestamp, hoy: date | None = None) -> bool:
+        hoy = hoy or date.today()
+        return dia.date() < hoy - timedelta(days=self.dias_abiertos)
+
+    # ─────────────────────────────
+    # LECTURA
+    # ─────────────────────────────
+    def consultar(self, firma: str, dias: Iterable[pd.Timestamp]) -> Dict[pd.Timestamp, pd.DataFrame]:
+        """
+        Cubos vigentes de `dias` (solo los encontrados);
+        cuenta un hit / miss por día.
+        """
+        ahora = time.monotonic()
+        encontrados = {}
+
+        with self._lock:
+            for dia in dias:
+                entrada = self._datos.get((firma, dia))
+
+                if entrada and entrada[0] > ahora:
+                    self._datos.move_to_end((firma, dia))
+                    encontrados[dia] = entrada[2]
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+        return encontrados
+
+    # ─────────────────────────────
+    # ESCRITURA
+    # ─────────────────────────────
+    @property
+    def generacion(self) -> int:
+        with self._lock:
+            return self._generacion
+
+    def guardar(
+        self,
+        firma: str,
+        cubos: Dict[pd.Timestamp, pd.DataFrame],
+        generacion: int,
+    ) -> None:
+        """
+        Guarda los cubos de días CERRADOS, solo si no hubo
+        invalidación desde `generacion`.
+        """
+        if self.ttl <= 0 or self.max_dias <= 0:
+            return
+
+        hoy = date.today()
+        ahora = time.monotonic()
+
+        with self._lock:
+            if generacion != self._generacion:
+                return
+
+            for dia, cubo in cubos.items():
+                if not self.cerrado(dia, hoy):
+                    continue
+
+                self._datos[(firma, dia)] = (ahora + self.ttl, ahora, cubo)
+                self._datos.move_to_end((firma, dia))
+
+            while len(self._datos) > self.max_dias:
+                self._datos.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self) -> None:
+        """
+        Invalida TODO el cache.
+        """
+        with self._lock:
+            self._datos.clear()
+            self._generacion += 1
+            self.invalidaciones += 1
+
+    # ─────────────────────────────
+    # OBSERVABILIDAD
+    # ─────────────────────────────
+    def stats(self) -> dict:
+        ahora = time.monotonic()
+
+        with self._lock:
+            total = self.hits + self.misses
+            dias = [dia for _, dia in self._datos]
+            return {
+                "max_dias": self.max_dias,
+                "ttl_segundos": self.ttl,
+                "dias_abiertos": self.dias_abiertos,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0,
+                "desalojos": self.desalojos,
+                "invalidaciones": self.invalidaciones,
+                "dias": len(self._datos),
+                "vigentes": sum(
+                    1 for expira, _, _ in self._datos.values() if expira > ahora
+                ),
+                "firmas": len({firma for firma, _ in self._datos}),
+                "desde": str(min(dias).date()) if dias else None,
+                "hasta": str(max(dias).date()) if dias else None,
+                "filas": sum(len(c) for _, _, c in self._datos.values()),
+            }
+
+
+# ─────────────────────────────────────────────
+# INSTANCIA COMPARTIDA (UNA POR PROCESO)
+# REPORTES_CACHE_RESULTADOS_MAX: entradas (0 = sin cache)
+# REPORTES_CACHE_RESULTADOS_TTL_RECIENTE / _TTL_CERRADO: segundos
+# ─────────────────────────────────────────────
+cache_resultados = CacheResultados(
+    max_entradas=int(os.getenv("REPORTES_CACHE_RESULTADOS_MAX", MAX_RESULTADOS)),
+    ttl_reciente=float(
+        os.getenv("REPORTES_CACHE_RESULTADOS_TTL_RECIENTE", TTL_RECIENTE)
+    ),
+    ttl_cerrado=float(
+        os.getenv("REPORTES_CACHE_RESULTADOS_TTL_CERRADO", TTL_CERRADO)
+    ),
+)
+
+# REPORTES_CACHE_DIAS_MAX: días (0 = sin cache)
+# REPORTES_CACHE_DIAS_TTL: segundos
+cache_dias = CacheDias(
+    max_dias=int(os.getenv("REPORTES_CACHE_DIAS_MAX", MAX_DIAS)),
+    ttl_segundos=float(os.getenv("REPORTES_CACHE_DIAS_TTL", TTL_CERRADO)),
+)
@@ -1,6 +1,15 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+from backend.services.reportes.normalization.dtypes import (
+    como_categoria,
+    entero_compacto,
+)
+
+
+SIN_ASIGNACION = "Sin asignación"
+
 
 # ─────────────────────────────
 # Helpers internos
@@ -24,6 +33,9 @@ def _to_date(value):
 def _resolver_persona(pasillo, fecha, asignaciones):
     """
     Dado un pasillo y una fecha, devuelve persona_id o None.
+
+    Versión FILA A FILA (referencia). obtener_dataframe usa
+    _resolver_personas, que da el mismo resultado por columna.
     """
     for a in asignaciones:
         if a["pasillo"] != pasillo:
@@ -39,6 +51,125 @@ def _resolver_persona(pasillo, fecha, asignaciones):
     return None
 
 
+def _intervalos(asignaciones):
+    """
+    Parsea las asignaciones UNA sola vez.
+
+    Conserva el orden original (`orden`): ante intervalos
+    solapados gana la primera asignación, igual que
+    _resolver_persona. Se descartan las que no tienen
+    pasillo o rango de fechas válido (nunca coinciden).
+    """
+    filas = []
+
+    for orden, a in enumerate(asignaciones):
+        pasillo = a.get("pasillo")
+        desde = _to_date(a.get("fecha_desde"))
+        hasta = _to_date(a.get("fecha_hasta"))
+
+        if pasillo is None or not desde or not hasta:
+            continue
+
+        filas.append((orden, pasillo, desde, hasta))
+
+    intervalos = pd.DataFrame(
+        filas,
+        columns=["orden", "pasillo", "desde", "hasta"],
+    )
+    intervalos["desde"] = pd.to_datetime(intervalos["desde"])
+    intervalos["hasta"] = pd.to_datetime(intervalos["hasta"])
+    return intervalos
+
+
+def _resolver_personas(pasillos: pd.Series, fechas: pd.Series, asignaciones):
+    """
+    persona_id para TODA la columna (join temporal vectorizado).
+
+    1. Pares únicos (pasillo, día) del detalle
+    2. Join con los intervalos del mismo pasillo
+    3. Filtro desde <= día <= hasta y primera asignación por orden
+    4. Vuelta a las filas con un solo get_indexer
+
+    El costo depende de pares únicos × asignaciones por pasillo,
+    no de filas × asignaciones.
+    """
+    persona = np.full(len(pasillos), None, dtype=object)
+
+    intervalos = _intervalos(asignaciones)
+    if intervalos.empty:
+        return persona
+
+    dias = fechas.dt.normalize()
+    if dias.dt.tz is not None:
+        dias = dias.dt.tz_localize(None)
+
+    pares = (
+        pd.DataFrame({"pasillo": pasillos.to_numpy(), "dia": dias.to_numpy()})
+        .dropna()
+        .drop_duplicates()
+    )
+
+    candidatos = pares.merge(intervalos, on="pasillo", how="inner")
+    candidatos = candidatos[
+        (candidatos["desde"] <= candidatos["dia"])
+        & (candidatos["dia"] <= candidatos["hasta"])
+    ]
+
+    if candidatos.empty:
+        return persona
+
+    resueltos = (
+        candidatos
+        .sort_values("orden", kind="stable")
+        .drop_duplicates(["pasillo", "dia"])
+    )
+
+    posicion = pd.MultiIndex.from_frame(
+        resueltos[["pasillo", "dia"]]
+    ).get_indexer(
+        pd.MultiIndex.from_arrays([pasillos.to_numpy(), dias.to_numpy()])
+    )
+
+    # persona_id tal cual viene en la asignación (None incluido)
+    ids = np.empty(len(asignaciones), dtype=object)
+    ids[:] = [a.get("persona_id") for a in asignaciones]
+
+    encontrados = posicion >= 0
+    persona[encontrados] = ids[resueltos["orden"].to_numpy()[posicion[encontrados]]]
+    return persona
+
+
+def _nombres_persona(persona_id: pd.Series, personas_map: dict | None) -> pd.Series:
+    """
+    persona_id (categórica) → persona_nombre (categórica).
+
+    El mapa se consulta una vez por persona, no por fila;
+    sin nombre (o sin persona) → "Sin asignación".
+    """
+    personas_map = personas_map or {}
+
+    nombres = [personas_map.get(pid) for pid in persona_id.cat.categories]
+    nombres = pd.Index(
+        [SIN_ASIGNACION if pd.isna(n) else n for n in nombres],
+        dtype=object,
+    )
+
+    # Recodificación sin pasar por texto fila a fila
+    nombres = nombres.append(pd.Index([SIN_ASIGNACION], dtype=object))
+    categorias = nombres.unique()
+    try:
+        categorias = categorias.sort_values()
+    except TypeError:
+        pass
+
+    codigos = categorias.get_indexer(nombres)[persona_id.cat.codes.to_numpy()]
+
+    return pd.Series(
+        pd.Categorical.from_codes(codigos, categories=categorias),
+        index=persona_id.index,
+    )
+
+
 # ─────────────────────────────
 # API pública
 # ─────────────────────────────
@@ -46,59 +177,61 @@ def obtener_dataframe(
     df_detalle,
     asignaciones: list[dict] | None = None,
     personas_map: dict | None = None,
+    inplace: bool = False,
 ):
     """
     Normaliza y ENRIQUECE el DataFrame base para reportes.
+
+    Dimensiones (zona, pasillo, persona_id, persona_nombre)
+    salen CATEGÓRICAS y piezas / devoluciones con el entero
+    más angosto posible.
+
+    inplace=True: agrega las columnas sobre `df_detalle` sin
+    copiarlo (el caller es dueño del frame).
     """
 
     if df_detalle is None:
         return None
 
     # Convertir a DataFrame
-    df = (
-        df_detalle.copy()
-        if isinstance(df_detalle, pd.DataFrame)
-        else pd.DataFrame(df_detalle)
-    )
+    if isinstance(df_detalle, pd.DataFrame):
+        df = df_detalle if inplace else df_detalle.copy()
+    else:
+        df = pd.DataFrame(df_detalle)
 
     if df.empty:
         return None
 
     # ───────── Normalización mínima
-    if "fecha" in df.columns:
+    if "fecha" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["fecha"]):
         df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
 
     if "devoluciones" not in df.columns:
         df["devoluciones"] = 1
 
     # ───────── Enriquecimiento PERSONA (CLAVE)
-    if asignaciones and "pasillo" in df.columns:
-        df["persona_id"] = df.apply(
-            lambda r: _resolver_persona(
-                r.get("pasillo"),
-                r.get("fecha"),
-                asignaciones
-            ),
-            axis=1
+    if asignaciones and "pasillo" in df.columns and "fecha" in df.columns:
+        persona_id = _resolver_personas(
+            df["pasillo"],
+            df["fecha"],
+            asignaciones,
         )
     else:
-        df["persona_id"] = None
+        persona_id = np.full(len(df), None, dtype=object)
 
-    # ───────── Resolver nombre
-    if personas_map:
-        df["persona_nombre"] = df["persona_id"].map(personas_map)
-    else:
-        df["persona_nombre"] = None
+    df["persona_id"] = pd.Categorical(persona_id)
+
+    # ───────── Resolver nombre (fallback explícito incluido)
+    df["persona_nombre"] = _nombres_persona(df["persona_id"], personas_map)
+
+    # ───────── Tipos compactos
+    for col in ("zona", "pasillo"):
+        if col in df.columns:
+            df[col] = como_categoria(df[col])
+
+    for col in ("piezas", "devoluciones"):
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = entero_compacto(df[col])
 
-    # ───────── Fallback explícito
-    df["persona_nombre"] = df["persona_nombre"].fillna("Sin asignación")
-    
-    print(
-        "[DEBUG DATAFRAME GENERAL]",
-        df[["fecha", "pasillo", "persona_id", "persona_nombre"]]
-        .drop_duplicates()
-        .head(20)
-    )
-    
     return df
     
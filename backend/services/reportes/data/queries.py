@@ -1,3 +1,10 @@
+from datetime import timedelta
+
+import pandas as pd
+
+from backend.db.mongo.reportes.filtros import rango_fechas
+
+
 def cargar_devoluciones_detalle(reportes_queries, filtros):
     """
     Ejecuta la query base de devoluciones detalle.
@@ -5,6 +12,49 @@ def cargar_devoluciones_detalle(reportes_queries, filtros):
     return reportes_queries.devoluciones_detalle(filtros)
 
 
+def cargar_devoluciones_diarias(reportes_queries, filtros):
+    """
+    Ejecuta la query pre-agregada (día × zona × pasillo).
+    """
+    return reportes_queries.devoluciones_diarias(filtros)
+
+
+def cargar_devoluciones_rollup(reportes_queries, desde, hasta):
+    """
+    Buckets diarios combinando rollup materializado + lectura en vivo.
+
+    - Días < corte del rollup → colección de rollups
+    - Días >= corte (aún no refrescados) → pipeline diario en vivo
+    - Sin rollup todavía → todo en vivo
+    """
+    corte = reportes_queries.rollup_corte()
+    corte = corte.date() if corte else None
+
+    partes = []
+
+    if corte and desde < corte:
+        partes.append(
+            reportes_queries.devoluciones_rollup(
+                rango_fechas(desde, min(hasta, corte - timedelta(days=1)))
+            )
+        )
+
+    if corte is None or hasta >= corte:
+        partes.append(
+            cargar_devoluciones_diarias(
+                reportes_queries,
+                rango_fechas(max(desde, corte) if corte else desde, hasta),
+            )
+        )
+
+    partes = [p for p in partes if p is not None and not p.empty]
+
+    if not partes:
+        return None
+
+    return pd.concat(partes, ignore_index=True)
+
+
 def cargar_asignaciones_activas(reportes_queries, desde, hasta):
     """
     Obtiene asignaciones activas para agrupación por persona.
@@ -0,0 +1,93 @@
+import pandas as pd
+
+from backend.services.reportes.aggregations.cubo import construir_cubo
+from backend.services.reportes.data.dataframe import obtener_dataframe
+
+
+class PresupuestoMemoriaExcedido(RuntimeError):
+    """
+    Los grupos del reporte no caben en el presupuesto configurado.
+    """
+
+
+# ─────────────────────────────
+# Helpers internos
+# ─────────────────────────────
+def _bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _compactar(parciales: list[pd.DataFrame]) -> pd.DataFrame:
+    if len(parciales) == 1:
+        return parciales[0]
+    return construir_cubo(pd.concat(parciales, ignore_index=True))
+
+
+# ─────────────────────────────
+# API pública
+# ─────────────────────────────
+def agregar_por_lotes(
+    lotes,
+    asignaciones: list[dict] | None,
+    personas_map: dict | None,
+    limite_bytes: int,
+):
+    """
+    Consume lotes de detalle y devuelve UN DataFrame parcialmente
+    agregado por (día, zona, pasillo, persona): el cubo base
+    (ver construir_cubo).
+
+    - Cada lote se enriquece (persona) y se agrega al llegar
+    - Los parciales se combinan cuando superan la mitad del límite
+    - La memoria queda acotada por el NÚMERO DE GRUPOS,
+      no por el número de artículos del rango
+
+    Mismas columnas que obtener_dataframe(): las agregaciones
+    del service funcionan sin cambios sobre el resultado.
+
+    Lanza PresupuestoMemoriaExcedido si, ya compactados,
+    los grupos superan `limite_bytes`.
+    """
+    parciales: list[pd.DataFrame] = []
+    acumulado = 0
+    filas = 0
+
+    for lote in lotes:
+        filas += len(lote)
+
+        df = obtener_dataframe(
+            lote,
+            asignaciones=asignaciones,
+            personas_map=personas_map,
+            inplace=True,
+        )
+
+        if df is None or df.empty:
+            continue
+
+        parcial = construir_cubo(df)
+        del df
+
+        parciales.append(parcial)
+        acumulado += _bytes(parcial)
+
+        if acumulado > limite_bytes // 2:
+            compacto = _compactar(parciales)
+            parciales = [compacto]
+            acumulado = _bytes(compacto)
+
+            if acumulado > limite_bytes:
+                raise PresupuestoMemoriaExcedido(
+                    f"{len(compacto)} grupos ocupan {acumulado} bytes "
+                    f"(límite {limite_bytes})"
+                )
+
+    if not parciales:
+        return None
+
+    resultado = _compactar(parciales)
+    print(
+        f"[streaming] {filas} filas → {len(resultado)} grupos "
+        f"({_bytes(resultado)} bytes)"
+    )
+    return resultado
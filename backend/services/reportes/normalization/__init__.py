@@ -1,9 +1,11 @@
 from .columnas import normalizar_columnas
 from .ids import normalizar_ids
 from .tipos import normalizar_tipos
+from .reporte import normalizar_reporte
 
 __all__ = [
     "normalizar_columnas",
     "normalizar_ids",
     "normalizar_tipos",
+    "normalizar_reporte",
 ]
@@ -1,7 +1,11 @@
 import pandas as pd
 
 
-def normalizar_columnas(df: pd.DataFrame, kpis: dict) -> pd.DataFrame:
+def normalizar_columnas(
+    df: pd.DataFrame,
+    kpis: dict,
+    inplace: bool = False,
+) -> pd.DataFrame:
     """
     Asegura columnas mínimas requeridas para reportes.
 
@@ -13,11 +17,14 @@ def normalizar_columnas(df: pd.DataFrame, kpis: dict) -> pd.DataFrame:
     - zona
     - pasillo
     - persona (opcional)
+
+    inplace=True: modifica `df` (el caller es dueño del frame).
     """
     if df is None or df.empty:
         return df
 
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
     # ───── piezas ─────
     if "piezas" not in df.columns:
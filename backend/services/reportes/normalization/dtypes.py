@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+
+# Columnas de dimensión del DataFrame de reportes (categóricas)
+DIMENSIONES = ("zona", "pasillo", "persona", "persona_id", "persona_nombre")
+
+
+# ─────────────────────────────
+# Helpers internos
+# ─────────────────────────────
+def _ordenadas(valores: pd.Index) -> pd.Index:
+    """
+    Categorías únicas en orden lexicográfico (mismo orden que
+    un groupby sobre texto). Si no son comparables, se deja
+    el orden de aparición.
+    """
+    unicas = valores.dropna().unique()
+    try:
+        return unicas.sort_values()
+    except TypeError:
+        return unicas
+
+
+def _recodificar(serie: pd.Series, nuevas: pd.Index, nulo) -> pd.Series:
+    """
+    Reemplaza cada categoría por su valor en `nuevas` (misma
+    posición) y los nulos por `nulo`, trabajando SOLO sobre
+    códigos: nunca se materializa la columna como texto.
+
+    Valores que colapsan (p.ej. "P1" y " P1") quedan en una
+    sola categoría; `None` / NaN en `nuevas` → nulo.
+    """
+    nuevas = nuevas.append(pd.Index([nulo], dtype=object))
+    categorias = _ordenadas(nuevas)
+
+    # posición vieja → código nuevo; el último cubre el código -1
+    mapa = categorias.get_indexer(nuevas)
+    codigos = mapa[serie.cat.codes.to_numpy()]
+
+    return pd.Series(
+        pd.Categorical.from_codes(codigos, categories=categorias),
+        index=serie.index,
+        name=serie.name,
+    )
+
+
+# ─────────────────────────────
+# API pública
+# ─────────────────────────────
+def como_categoria(serie: pd.Series) -> pd.Series:
+    """
+    Columna de dimensión → categórica (categorías ordenadas).
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+    return serie.astype("category")
+
+
+def texto_categoria(serie: pd.Series) -> pd.Series:
+    """
+    Equivalente categórico de fillna("").astype(str).str.strip():
+    el strip se aplica una vez por categoría, no por fila.
+    """
+    serie = como_categoria(serie)
+    limpias = pd.Index(serie.cat.categories.astype(str).str.strip(), dtype=object)
+    return _recodificar(serie, limpias, nulo="")
+
+
+def categoria_sin_invalidos(serie: pd.Series, invalidos) -> pd.Series:
+    """
+    Como texto_categoria, pero los valores en `invalidos`
+    (y los nulos) quedan como NaN.
+    """
+    serie = como_categoria(serie)
+    limpias = pd.Index(serie.cat.categories.astype(str).str.strip(), dtype=object)
+    limpias = limpias.where(~limpias.isin(list(invalidos)), None)
+    return _recodificar(serie, limpias, nulo=None)
+
+
+def entero_compacto(serie: pd.Series) -> pd.Series:
+    """
+    Entero más angosto que contiene todos los valores
+    (int8 / int16 / int32 / int64). Las sumas de pandas
+    acumulan en int64, así que no hay desbordes.
+    """
+    if not pd.api.types.is_integer_dtype(serie):
+        serie = serie.astype(np.int64)
+    return pd.to_numeric(serie, downcast="integer")
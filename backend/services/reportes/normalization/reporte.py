@@ -0,0 +1,47 @@
+import pandas as pd
+
+from .columnas import normalizar_columnas
+from .dtypes import como_categoria
+from .ids import normalizar_ids
+from .tipos import normalizar_tipos
+
+
+SIN_ASIGNACION = "Sin asignación"
+
+
+def normalizar_reporte(df: pd.DataFrame, kpis: dict) -> pd.DataFrame:
+    """
+    Normalización COMPLETA del DataFrame de reportes en UNA pasada.
+
+    Equivale a normalizar_ids → normalizar_columnas → normalizar_tipos
+    más los defaults de devoluciones / persona_nombre, pero:
+
+    - MODIFICA `df` en sitio (el caller es dueño del frame)
+    - Ninguna etapa copia el frame completo; solo se reemplazan
+      las columnas que cambian
+
+    Las agregaciones posteriores SOLO leen el resultado.
+    """
+    if df is None or df.empty:
+        return df
+
+    normalizar_ids(df, inplace=True)
+    normalizar_columnas(df, kpis, inplace=True)
+    normalizar_tipos(df, inplace=True)
+
+    if "persona_nombre" in df.columns:
+        nombre = como_categoria(df["persona_nombre"])
+        if nombre.hasnans:
+            if SIN_ASIGNACION not in nombre.cat.categories:
+                nombre = nombre.cat.add_categories(SIN_ASIGNACION)
+            nombre = nombre.fillna(SIN_ASIGNACION)
+        df["persona_nombre"] = nombre
+    else:
+        df["persona_nombre"] = pd.Categorical([SIN_ASIGNACION] * len(df))
+
+    # Dimensiones categóricas aunque el frame venga de otra fuente
+    # (p.ej. parciales concatenados en modo streaming)
+    if "persona_id" in df.columns:
+        df["persona_id"] = como_categoria(df["persona_id"])
+
+    return df
@@ -1,40 +1,47 @@
 import pandas as pd
 
+from .dtypes import entero_compacto, texto_categoria
 
-def normalizar_tipos(df: pd.DataFrame) -> pd.DataFrame:
+
+def _numerico(serie: pd.Series, entero: bool) -> pd.Series:
+    """
+    to_numeric + fillna(0) sin asignar memoria si ya está limpio.
+    """
+    if not pd.api.types.is_numeric_dtype(serie):
+        serie = pd.to_numeric(serie, errors="coerce")
+
+    if serie.hasnans:
+        serie = serie.fillna(0)
+
+    return entero_compacto(serie) if entero else serie
+
+
+def normalizar_tipos(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
     """
     Normaliza tipos de datos del DataFrame.
 
-    - Numéricos: importe, piezas, devoluciones
-    - Texto: zona, pasillo, persona
+    - Numéricos: importe, piezas, devoluciones (enteros angostos)
+    - Texto: zona, pasillo, persona (categóricas, sin espacios)
+
+    inplace=True: modifica `df` (el caller es dueño del frame).
     """
     if df is None or df.empty:
         return df
 
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
 
     # ───── numéricos ─────
     if "importe" in df.columns:
-        df["importe"] = pd.to_numeric(
-            df["importe"], errors="coerce"
-        ).fillna(0.0)
+        df["importe"] = _numerico(df["importe"], entero=False)
 
     for col in ("piezas", "devoluciones"):
         if col in df.columns:
-            df[col] = (
-                pd.to_numeric(df[col], errors="coerce")
-                .fillna(0)
-                .astype(int)
-            )
+            df[col] = _numerico(df[col], entero=True)
 
     # ───── texto ─────
     for col in ("zona", "pasillo", "persona"):
         if col in df.columns:
-            df[col] = (
-                df[col]
-                .fillna("")
-                .astype(str)
-                .str.strip()
-            )
+            df[col] = texto_categoria(df[col])
 
     return df
@@ -1,66 +1,41 @@
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional, List
-from datetime import date, datetime
+from typing import Dict, Any
 
-from backend.services.reportes.aggregations.tabla import tabla_final
-
-
-# ─────────────────────────────
-# Utilidades
-# ─────────────────────────────
-def normalizar_fecha(valor) -> Optional[date]:
-    """
-    Convierte valores de fecha provenientes de Mongo a `datetime.date`.
-
-    Acepta:
-    - None
-    - datetime.date
-    - datetime.datetime
-    - str ISO (YYYY-MM-DD o YYYY-MM-DDTHH:MM:SS)
-
-    Retorna:
-    - date o None
-    """
-    if valor is None:
-        return None
-
-    if isinstance(valor, date) and not isinstance(valor, datetime):
-        return valor
-
-    if isinstance(valor, datetime):
-        return valor.date()
-
-    if isinstance(valor, str):
-        try:
-            return datetime.fromisoformat(valor).date()
-        except ValueError:
-            return None
-
-    return None
+from backend.services.reportes.aggregations.segmentos import (
+    codigos,
+    segmentos,
+    sumas,
+)
+from backend.services.reportes.aggregations.tabla import (
+    columnas_tabla,
+    filas_tabla,
+)
 
 
 # ─────────────────────────────
 # Agrupación principal
 # ─────────────────────────────
 def agrupar_por_persona(
-    reportes_queries,
     df: pd.DataFrame,
-    desde: date,
-    hasta: date,
     kpis: Dict[str, bool],
 ) -> Dict[str, Any]:
     """
-    Agrupa devoluciones por persona usando asignaciones históricas.
+    Resumen y tabla por persona.
 
     RESPONSABILIDAD:
-    - Cruza devoluciones (DataFrame ya normalizado)
-    - Aplica lógica temporal de asignaciones activas
-    - Calcula KPIs y genera tablas finales
+    - Agrupar por la columna `persona_id` que obtener_dataframe
+      ya resolvió (asignación vigente en la FECHA de cada fila)
+    - Calcular KPIs y tablas de TODAS las personas con un
+      solo groupby; las filas se emiten una vez (filas_tabla)
+      y se reparten por tramos
 
     REGLAS:
-    - NO consulta Mongo directamente
-    - NO construye pipelines
-    - Queries SOLO proveen datos crudos
+    - NO consulta Mongo
+    - NO vuelve a cruzar asignaciones
+    - Filas sin persona asignada no aparecen
+
+    Orden de personas: primera aparición en `df`.
     """
 
     # ─────────────────────────────
@@ -72,151 +47,207 @@ def agrupar_por_persona(
     if not kpis:
         return {}
 
-    if not isinstance(desde, date) or not isinstance(hasta, date):
-        raise ValueError("`desde` y `hasta` deben ser datetime.date")
-
-    # ─────────────────────────────
-    # Obtener asignaciones CRUDAS
-    # ─────────────────────────────
-    asignaciones: List[Dict] = reportes_queries.asignaciones_personal()
-
-    if not asignaciones:
+    if "persona_id" not in df.columns or "fecha" not in df.columns:
         return {}
 
-    # ─────────────────────────────
-    # Filtrar asignaciones activas
-    # (lógica temporal VIVE AQUÍ)
-    # ─────────────────────────────
-    asignaciones_activas: List[Dict[str, str]] = []
-
-    for a in asignaciones:
-        pasillo = (a.get("pasillo") or "").strip()
-        persona_id = (a.get("persona_id") or "").strip()
-
-        if not pasillo or not persona_id:
-            continue
-
-        fecha_desde = normalizar_fecha(a.get("fecha_desde"))
-        fecha_hasta = normalizar_fecha(a.get("fecha_hasta"))
-
-        # Si empieza después del rango, no aplica
-        if fecha_desde and fecha_desde > hasta:
-            continue
-
-        # Si terminó antes del rango, no aplica
-        if fecha_hasta and fecha_hasta < desde:
-            continue
-
-        asignaciones_activas.append({
-            "pasillo": pasillo,
-            "persona_id": persona_id,
-        })
+    personas = [
+        pid for pid in df["persona_id"].dropna().unique()
+        if str(pid).strip()
+    ]
 
-    if not asignaciones_activas:
+    if not personas:
         return {}
 
     # ─────────────────────────────
-    # Mapa pasillo → persona
+    # Un groupby: persona × claves de tabla
     # ─────────────────────────────
-    pasillo_a_persona: Dict[str, str] = {
-        a["pasillo"]: a["persona_id"]
-        for a in asignaciones_activas
-    }
+    group_cols = columnas_tabla(df)
+
+    grp = (
+        df.groupby(["persona_id"] + group_cols, as_index=False, observed=True)
+        .agg(
+            devoluciones=("devoluciones", "sum"),
+            piezas=("piezas", "sum"),
+            importe=("importe", "sum"),
+        )
+        .sort_values(["persona_id"] + group_cols)
+    )
 
-    # ─────────────────────────────
-    # Agrupar índices por persona
-    # ─────────────────────────────
-    indices_por_persona: Dict[str, List[int]] = {}
+    # grp viene ordenado por persona: cada persona es un tramo
+    # contiguo de filas (orden = identidad)
+    persona, ids = codigos(grp["persona_id"])
+    orden, inicios, fines = segmentos(persona)
 
-    for idx, row in df.iterrows():
-        pasillo = str(row.get("pasillo", "")).strip()
-        persona_id = pasillo_a_persona.get(pasillo)
+    filas = filas_tabla(grp, group_cols)
 
-        if not persona_id:
-            continue
-
-        indices_por_persona.setdefault(persona_id, []).append(idx)
+    totales = {
+        c: sumas(grp[c].to_numpy(), orden, inicios, fines)
+        for c in ("importe", "piezas", "devoluciones")
+        if kpis.get(c)
+    }
 
-    if not indices_por_persona:
-        return {}
+    tramos = {
+        ids[persona[i]]: (k, i, f)
+        for k, (i, f) in enumerate(zip(inicios, fines))
+    }
 
     # ─────────────────────────────
     # Construir resultado final
     # ─────────────────────────────
     resultado: Dict[str, Any] = {}
 
-    for persona_id, idxs in indices_por_persona.items():
-        df_persona = df.loc[idxs]
+    for persona_id in personas:
+        k, i, f = tramos[persona_id]
 
         resumen: Dict[str, Any] = {}
 
-        if kpis.get("importe") and "importe" in df_persona:
-            resumen["importe"] = float(df_persona["importe"].sum())
+        if kpis.get("importe"):
+            resumen["importe"] = float(totales["importe"][k])
 
-        if kpis.get("piezas") and "piezas" in df_persona:
-            resumen["piezas"] = int(df_persona["piezas"].sum())
+        if kpis.get("piezas"):
+            resumen["piezas"] = int(totales["piezas"][k])
 
-        if kpis.get("devoluciones") and "devoluciones" in df_persona:
-            resumen["devoluciones"] = int(df_persona["devoluciones"].sum())
+        if kpis.get("devoluciones"):
+            resumen["devoluciones"] = int(totales["devoluciones"][k])
 
-        resultado[persona_id] = {
+        resultado[str(persona_id)] = {
             "resumen": resumen,
-            "tabla": tabla_final(df_persona),
+            "tabla": filas[i:f],
         }
 
     return resultado
 
-def agrupar_personas_por_fecha(df, kpis):
+def agrupar_personas_por_fecha(df, kpis, columnas=False):
     """
     Agrupa por PERSONA y FECHA (series temporales).
     Pensado EXCLUSIVAMENTE para charts.
+
+    Un solo ordenamiento por (persona, fecha) produce todos los
+    KPIs como arreglos; la salida se arma en una pasada.
+
+    columnas=True: ver _personas_columnas.
     """
+    vacio = _personas_columnas_vacio if columnas else dict
 
     if df is None or df.empty:
-        return {}
+        return vacio()
 
     if "persona_id" not in df.columns or "fecha" not in df.columns:
-        return {}
+        return vacio()
 
     kpi_cols = [
         c for c in ("importe", "piezas", "devoluciones")
         if kpis.get(c) and c in df.columns
     ]
 
+    # ─────────────────────────────
+    # Códigos persona / fecha (sin nulos)
+    # ─────────────────────────────
+    persona, ids = codigos(df["persona_id"])
+    fecha, fechas = codigos(df["fecha"], nulo=pd.NaT)
+
+    filas = np.flatnonzero((persona < len(ids) - 1) & (fecha < len(fechas) - 1))
+
+    if not len(filas):
+        return vacio()
+
+    persona = persona[filas]
+    fecha = fecha[filas]
+
+    # Nombre = primera fila de cada persona
+    _, primeras = np.unique(persona, return_index=True)
+    nombres = (
+        df["persona_nombre"].to_numpy()[filas][primeras]
+        if "persona_nombre" in df.columns
+        else ["Sin nombre"] * len(primeras)
+    )
+
+    # ─────────────────────────────
+    # KPIs por (persona, fecha)
+    # ─────────────────────────────
+    orden, inicios, fines = segmentos(persona * len(fechas) + fecha)
+    valores = {
+        c: sumas(df[c].to_numpy()[filas], orden, inicios, fines)
+        for c in kpi_cols
+    }
+
+    nombre_de = dict(zip(persona[primeras], nombres))
+
+    if columnas:
+        return _personas_columnas(
+            persona[orden][inicios],
+            fecha[orden][inicios],
+            ids,
+            fechas,
+            nombre_de,
+            valores,
+        )
+
     resultado = {}
 
-    for persona_id, df_persona in df.groupby("persona_id"):
+    for i, fila in enumerate(orden[inicios]):
+        persona_id = ids[persona[fila]]
 
         if not persona_id:
             continue
 
-        nombre = (
-            df_persona["persona_nombre"].iloc[0]
-            if "persona_nombre" in df_persona.columns
-            else "Sin nombre"
-        )
+        if persona_id not in resultado:
+            resultado[persona_id] = {
+                "nombre": nombre_de[persona[fila]],
+                "series": [],
+            }
+
+        dia = fechas[fecha[fila]]
+
+        resultado[persona_id]["series"].append({
+            "fecha": dia,
+            "key": dia.isoformat(),
+            "label": dia.isoformat(),
+            "kpis": {
+                c: float(valores[c][i]) if c == "importe" else int(valores[c][i])
+                for c in kpi_cols
+            },
+        })
 
-        series = []
+    return resultado
 
-        for fecha, df_fecha in df_persona.groupby("fecha"):
-            kpis_fecha = {}
 
-            for c in kpi_cols:
-                total = df_fecha[c].sum()
-                kpis_fecha[c] = float(total) if c == "importe" else int(total)
+def _personas_columnas(persona, fecha, ids, fechas, nombre_de, valores):
+    """
+    Series por persona como matrices persona × fecha:
 
-            series.append({
-                "fecha": fecha,
-                "key": fecha.isoformat(),
-                "label": fecha.isoformat(),
-                "kpis": kpis_fecha
-            })
+    {
+      "id": [...], "nombre": [...],
+      "key": [...], "label": [...],          # fechas presentes
+      "kpis": {"importe": [[...]], ...}
+    }
 
-        series.sort(key=lambda x: x["fecha"])
+    `persona` / `fecha`: códigos de cada grupo (persona, fecha).
+    Mismas personas (y orden) que la salida en filas;
+    0 = la persona no tiene filas en esa fecha.
+    """
+    validos = np.array([bool(i) for i in ids], dtype=bool)[persona]
 
-        resultado[persona_id] = {
-            "nombre": nombre,
-            "series": series
-        }
+    presentes, fila = np.unique(persona[validos], return_inverse=True)
+    dias, columna = np.unique(fecha[validos], return_inverse=True)
+    claves = [fechas[f].isoformat() for f in dias]
 
-    return resultado
+    matrices = {}
+    for c, sumas_c in valores.items():
+        matrices[c] = np.zeros(
+            (len(presentes), len(dias)),
+            dtype=np.float64 if c == "importe" else np.int64,
+        )
+        matrices[c][fila, columna] = np.asarray(sumas_c)[validos]
+
+    return {
+        "id": [ids[p] for p in presentes],
+        "nombre": [nombre_de[p] for p in presentes],
+        "key": claves,
+        "label": claves,
+        "kpis": matrices,
+    }
+
+
+def _personas_columnas_vacio():
+    return {"id": [], "nombre": [], "key": [], "label": [], "kpis": {}}
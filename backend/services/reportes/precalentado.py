@@ -0,0 +1,320 @@
+"""
+Precalentado del cache de reportes.
+
+RESPONSABILIDAD:
+- Calcular en segundo plano los rangos más usados del dashboard
+  para que el primer usuario del día no espere un reporte frío:
+    · mes actual (filtro por defecto del frontend)
+    · mes anterior
+    · últimos 12 meses (desde el día 1 de hace 11 meses)
+- Por rango, los requests que hace el dashboard (una pestaña =
+  sus secciones, formato "filas"):
+    · cada pestaña con el `agrupar` por defecto ("Mes")
+    · la pestaña por defecto ("general") con cada `agrupar`
+- Repetirlo cada `intervalo` segundos (los rangos se recalculan
+  con la fecha del día en cada vuelta)
+- Exponer el estado: claves calentadas y su edad en el cache
+
+REGLAS:
+- Pasa por cache.obtener(): un request en vivo de la misma
+  clave espera el cálculo en curso en vez de repetirlo
+- Respeta el TTL del cache por rango: las entradas que tocan
+  días abiertos duran TTL_RECIENTE, igual que las de un
+  request en vivo; de ellas queda caliente CacheDias (el
+  request en vivo solo lee de Mongo los días abiertos)
+- Solo recalcula las entradas que vencen antes de la vuelta
+  siguiente (rangos cerrados: TTL largo, casi nunca)
+- `ttl_extendido` (apagado por defecto): las entradas viven
+  2 × `intervalo`, también las de días abiertos → siguen en
+  cache hasta la vuelta siguiente, a cambio de servir datos
+  de hasta ~`intervalo` segundos
+- No compite con el tráfico en vivo:
+    · corre en el executor por defecto del event loop, NO en
+      el threadpool de las rutas síncronas
+    · a lo sumo `concurrencia` reportes a la vez
+    · `pausa` segundos tras cada reporte recalculado
+- Un error en un rango NUNCA detiene la tarea
+
+NO HACE:
+- Acceso directo a Mongo (usa el service que se le inyecta)
+"""
+
+import asyncio
+import contextlib
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable
+
+
+# Valores por defecto
+INTERVALO = 15 * 60.0       # segundos entre vueltas
+CONCURRENCIA = 1            # reportes calculándose a la vez
+PAUSA = 1.0                 # segundos entre reportes
+RETRASO_INICIAL = 5.0       # segundos tras el arranque
+
+# "Mes" primero: es el filtro por defecto del dashboard
+AGRUPACIONES = ("Mes", "Dia", "Semana", "Anio")
+
+# Secciones que pide cada pestaña del dashboard
+# (frontend/assets/js/reportes/); "general" es la inicial
+SECCIONES_PESTANAS = (
+    ("general",),
+    ("por_pasillo",),
+    ("por_persona",),
+    ("por_zona",),
+    ("tabla",),
+)
+
+
+def rangos_comunes(hoy: date) -> list:
+    """
+    [(nombre, desde, hasta)] de los rangos a precalentar.
+    """
+    inicio_mes = hoy.replace(day=1)
+    fin_anterior = inicio_mes - timedelta(days=1)
+
+    anio, mes = divmod(hoy.year * 12 + hoy.month - 1 - 11, 12)
+
+    return [
+        ("mes_actual", inicio_mes, hoy),
+        ("mes_anterior", fin_anterior.replace(day=1), fin_anterior),
+        ("ultimos_12_meses", date(anio, mes + 1, 1), hoy),
+    ]
+
+
+def requests_dashboard() -> list:
+    """
+    [(agrupar, secciones)] a precalentar por rango, en orden
+    de prioridad (vista inicial primero).
+    """
+    agrupar_inicial = AGRUPACIONES[0]
+    pestana_inicial = SECCIONES_PESTANAS[0]
+
+    return [
+        (agrupar_inicial, secciones) for secciones in SECCIONES_PESTANAS
+    ] + [
+        (agrupar, pestana_inicial) for agrupar in AGRUPACIONES[1:]
+    ]
+
+
+class PrecalentadorReportes:
+    """
+    Tarea de fondo (asyncio) que precalienta el cache de
+    resultados; se inicia / detiene desde el lifespan.
+    """
+
+    def __init__(
+        self,
+        activo: bool = True,
+        intervalo: float = INTERVALO,
+        concurrencia: int = CONCURRENCIA,
+        pausa: float = PAUSA,
+        retraso_inicial: float = RETRASO_INICIAL,
+        ttl_extendido: bool = False,
+    ):
+        self.activo = bool(activo)
+        self.intervalo = float(intervalo)
+        self.concurrencia = max(int(concurrencia), 1)
+        self.pausa = float(pausa)
+        self.retraso_inicial = float(retraso_inicial)
+        self.ttl_extendido = bool(ttl_extendido)
+
+        self._tarea = None
+        self._crear_service = None
+        self._cache = None
+        self._claves = {}
+
+        self.en_curso = False
+        self.ejecuciones = 0
+        self.errores = 0
+        self.ultima_ejecucion = None
+        self.ultima_duracion = None
+
+    # ─────────────────────────────
+    # CICLO DE VIDA
+    # ─────────────────────────────
+    def iniciar(self, crear_service: Callable) -> None:
+        """
+        Lanza la tarea de fondo en el event loop actual.
+
+        crear_service: fábrica del ReportesService (sync) a usar.
+        """
+        if not self.activo or self.intervalo <= 0:
+            print("⏸️  [precalentado] Desactivado")
+            return
+
+        if self._tarea is not None and not self._tarea.done():
+            return
+
+        self._crear_service = crear_service
+        self._tarea = asyncio.get_running_loop().create_task(self._bucle())
+
+        print(
+            f"🔥 [precalentado] Cada {self.intervalo:.0f}s | "
+            f"concurrencia {self.concurrencia}"
+        )
+
+    async def detener(self) -> None:
+        if self._tarea is None:
+            return
+
+        self._tarea.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._tarea
+
+        self._tarea = None
+
+    async def _bucle(self):
+        await asyncio.sleep(self.retraso_inicial)
+
+        while True:
+            try:
+                await self.calentar()
+            except Exception as e:
+                self.errores += 1
+                print("❌ [precalentado] Vuelta fallida:", e)
+
+            await asyncio.sleep(self.intervalo)
+
+    # ─────────────────────────────
+    # CALENTADO
+    # ─────────────────────────────
+    async def calentar(self, hoy: date | None = None) -> None:
+        """
+        Una vuelta: cada rango × cada request del dashboard.
+        """
+        service = self._crear_service()
+
+        if service.cache is None:
+            print("⏸️  [precalentado] Sin cache de resultados: nada que calentar")
+            return
+
+        self._cache = service.cache
+        semaforo = asyncio.Semaphore(self.concurrencia)
+
+        trabajos = [
+            (rango, desde, hasta, agrupar, secciones)
+            for rango, desde, hasta in rangos_comunes(hoy or date.today())
+            for agrupar, secciones in requests_dashboard()
+        ]
+
+        t0 = time.monotonic()
+        self.en_curso = True
+
+        try:
+            await asyncio.gather(*(
+                self._calentar_uno(service, semaforo, *trabajo)
+                for trabajo in trabajos
+            ))
+        finally:
+            self.en_curso = False
+
+        self.ejecuciones += 1
+        self.ultima_ejecucion = datetime.now()
+        self.ultima_duracion = time.monotonic() - t0
+
+        print(
+            f"🔥 [precalentado] {len(trabajos)} reportes "
+            f"en {self.ultima_duracion:.1f}s"
+        )
+
+    async def _calentar_uno(
+        self, service, semaforo, rango, desde, hasta, agrupar, secciones
+    ):
+        async with semaforo:
+            t0 = time.monotonic()
+            recalculado = False
+            error = None
+
+            try:
+                recalculado = await asyncio.to_thread(
+                    service.precalentar,
+                    desde,
+                    hasta,
+                    agrupar,
+                    secciones,
+                    self.intervalo,
+                    2 * self.intervalo if self.ttl_extendido else None,
+                )
+            except Exception as e:
+                error = str(e)
+                self.errores += 1
+                print(f"❌ [precalentado] {rango} / {agrupar} / {secciones}:", e)
+
+            self._claves[(rango, agrupar, secciones)] = {
+                "rango": rango,
+                "desde": desde.isoformat(),
+                "hasta": hasta.isoformat(),
+                "agrupar": agrupar,
+                "secciones": list(secciones),
+                "clave": service.clave_cache(desde, hasta, agrupar, secciones=secciones),
+                "revisado": datetime.now().isoformat(timespec="seconds"),
+                "recalculado": recalculado,
+                "duracion_segundos": round(time.monotonic() - t0, 3),
+                "error": error,
+            }
+
+            if recalculado:
+                await asyncio.sleep(self.pausa)
+
+    # ─────────────────────────────
+    # OBSERVABILIDAD
+    # ─────────────────────────────
+    def estado(self) -> dict:
+        """
+        Configuración, contadores y cada clave calentada con su
+        edad / vigencia ACTUAL en el cache de resultados.
+        """
+        claves = []
+
+        for info in self._claves.values():
+            entrada = (
+                self._cache.entrada(info["clave"])
+                if self._cache is not None and info["clave"] is not None
+                else None
+            )
+
+            claves.append({
+                **{k: v for k, v in info.items() if k != "clave"},
+                "en_cache": entrada is not None,
+                **(entrada or {}),
+            })
+
+        return {
+            "activo": self.activo,
+            "corriendo": self._tarea is not None and not self._tarea.done(),
+            "en_curso": self.en_curso,
+            "intervalo_segundos": self.intervalo,
+            "concurrencia": self.concurrencia,
+            "pausa_segundos": self.pausa,
+            "ttl_extendido": self.ttl_extendido,
+            "ejecuciones": self.ejecuciones,
+            "errores": self.errores,
+            "ultima_ejecucion": (
+                self.ultima_ejecucion.isoformat(timespec="seconds")
+                if self.ultima_ejecucion else None
+            ),
+            "ultima_duracion_segundos": (
+                round(self.ultima_duracion, 3)
+                if self.ultima_duracion is not None else None
+            ),
+            "claves": claves,
+        }
+
+
+# ─────────────────────────────────────────────
+# INSTANCIA COMPARTIDA (UNA POR PROCESO)
+# REPORTES_PRECALENTAR: "0" desactiva
+# REPORTES_PRECALENTAR_INTERVALO / _PAUSA: segundos
+# REPORTES_PRECALENTAR_CONCURRENCIA: reportes a la vez
+# REPORTES_PRECALENTAR_TTL_EXTENDIDO: "1" activa (ver REGLAS)
+# ─────────────────────────────────────────────
+precalentador = PrecalentadorReportes(
+    activo=os.getenv("REPORTES_PRECALENTAR", "1").lower() not in ("0", "false", "no"),
+    intervalo=float(os.getenv("REPORTES_PRECALENTAR_INTERVALO", INTERVALO)),
+    concurrencia=int(os.getenv("REPORTES_PRECALENTAR_CONCURRENCIA", CONCURRENCIA)),
+    pausa=float(os.getenv("REPORTES_PRECALENTAR_PAUSA", PAUSA)),
+    ttl_extendido=os.getenv("REPORTES_PRECALENTAR_TTL_EXTENDIDO", "0").lower()
+    in ("1", "true", "si", "sí"),
+)
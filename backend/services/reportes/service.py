@@ -1,3 +1,5 @@
+import hashlib
+
 import pandas as pd
 
 from backend.db.mongo.reportes.filtros import (
@@ -8,21 +10,27 @@ from backend.db.mongo.reportes.filtros import (
 # ─── DATA ─────────────────────────────────────────────
 from backend.services.reportes.data.queries import (
     cargar_devoluciones_detalle,
+    cargar_devoluciones_diarias,
+    cargar_devoluciones_rollup,
 )
 
 from backend.services.reportes.data.dataframe import (
     obtener_dataframe,
 )
 
-# ─── NORMALIZATION ────────────────────────────────────
-from backend.services.reportes.normalization import (
-    normalizar_ids,
-    normalizar_columnas,
-    normalizar_tipos,
+from backend.services.reportes.data.streaming import (
+    agregar_por_lotes,
+    PresupuestoMemoriaExcedido,
 )
 
+# ─── NORMALIZATION ────────────────────────────────────
+from backend.services.reportes.normalization import normalizar_reporte
+
 # ─── AGGREGATIONS ─────────────────────────────────────
 from backend.services.reportes.aggregations import (
+    construir_cubo,
+    partir_cubo,
+    unir_cubos,
     agrupa_por_zona,
     agrupa_por_pasillo,
     tabla_final,
@@ -42,9 +50,13 @@ from backend.services.reportes.personas.agrupacion import (
     agrupar_personas_por_fecha,   # 📈 SERIES
 )
 
+# ─── CACHE ────────────────────────────────────────────
+from backend.services.reportes.cache import firma_dimensiones
+
 # ─── TEMPORAL ─────────────────────────────────────────
 from backend.services.reportes.temporal import (
     map_periodo,
+    serie_vacia_columnas,
     serie_por_dia,
     serie_por_semana,
     serie_por_mes,
@@ -52,6 +64,58 @@ from backend.services.reportes.temporal import (
 )
 
 
+# ─── MODOS DE CARGA ───────────────────────────────────
+MODO_DETALLE = "detalle"   # una fila por artículo
+MODO_DIARIO = "diario"     # buckets día × zona × pasillo (agregados en Mongo)
+MODO_STREAMING = "streaming"  # detalle por lotes, agregado al vuelo
+MODO_ROLLUP = "rollup"     # Semana/Mes/Anio desde el rollup materializado
+
+MODOS = (MODO_DETALLE, MODO_DIARIO, MODO_STREAMING, MODO_ROLLUP)
+
+# ─── SECCIONES DEL PAYLOAD ────────────────────────────
+# (kpis / resumen / personas se devuelven siempre)
+SECCIONES = (
+    "general",
+    "por_zona",
+    "por_pasillo",
+    "por_persona",
+    "personas_series",
+    "tabla",
+)
+
+# ─── FORMATO DE LAS SERIES ────────────────────────────
+FORMATO_FILAS = "filas"          # un dict por punto (contrato original)
+FORMATO_COLUMNAS = "columnas"    # arreglo por KPI, matrices por persona
+
+FORMATOS = (FORMATO_FILAS, FORMATO_COLUMNAS)
+
+# ─── STREAMING ────────────────────────────────────────
+TAMANO_LOTE = 50_000        # filas de artículo por lote
+LIMITE_MEMORIA_MB = 256     # techo para los grupos parciales
+
+# ─── TABLA EN STREAMING ───────────────────────────────
+DIAS_POR_BLOQUE = 7         # días por query / por chunk emitido
+
+
+def tramos_faltantes(dias, encontrados):
+    """
+    Días que NO están en `encontrados` → [(desde, hasta)] de
+    días consecutivos (un query Mongo por tramo).
+    """
+    tramos = []
+
+    for dia in dias:
+        if dia in encontrados:
+            continue
+
+        if tramos and tramos[-1][1] == dia - pd.Timedelta(days=1):
+            tramos[-1][1] = dia
+        else:
+            tramos.append([dia, dia])
+
+    return [(d1.date(), d2.date()) for d1, d2 in tramos]
+
+
 class ReportesService:
     """
     Servicio central de reportes (solo lectura).
@@ -61,124 +125,757 @@ class ReportesService:
     - Normalizar datos
     - Construir agregaciones
     - Preparar payload FINAL para frontend
+
+    MODOS:
+    - "detalle": Mongo devuelve una fila por artículo
+    - "diario":  Mongo devuelve buckets día × zona × pasillo;
+                 todas las vistas se construyen igual sobre ellos
+                 (las fechas quedan a resolución de día)
+    - "streaming": el detalle se consume en lotes de `tamano_lote`
+                 filas y se agrega al vuelo; la memoria depende del
+                 número de grupos y se acota con `limite_memoria_mb`
+    - "rollup":  Semana/Mes/Anio se sirven del rollup diario
+                 materializado (+ días recientes en vivo);
+                 "Dia" usa el detalle completo
+
+    CACHE:
+    - Con `cache` (CacheResultados), generar() reutiliza el
+      payload de un request idéntico ya normalizado
+    - Con `cache_dias` (CacheDias), los modos "detalle" / "diario"
+      (y "Dia" en "rollup") solo leen de Mongo los días que no
+      están cacheados y unen sus cubos con los ya calculados
+
+    SECCIONES:
+    - generar(..., secciones=[...]) calcula y devuelve SOLO esas
+      secciones (ver SECCIONES); None = todas
+
+    FORMATO:
+    - formato="columnas" devuelve general.serie, por_zona /
+      por_pasillo[*].series y personas_series en columnas
+      (arreglos paralelos por KPI; personas como matrices),
+      armadas directo de los arreglos de NumPy
+
+    TABLA EN STREAMING:
+    - tabla_por_bloques() entrega la tabla de detalle por bloques
+      de días, sin construir el payload completo
     """
 
-    def __init__(self, reportes_queries):
+    def __init__(
+        self,
+        reportes_queries,
+        modo=MODO_DETALLE,
+        tamano_lote=TAMANO_LOTE,
+        limite_memoria_mb=LIMITE_MEMORIA_MB,
+        cache=None,
+        cache_dias=None,
+    ):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de reportes inválido: {modo!r}")
+
         self.reportes_queries = reportes_queries
+        self.modo = modo
+        self.tamano_lote = int(tamano_lote)
+        self.limite_memoria_bytes = int(limite_memoria_mb * 1024 * 1024)
+
+        # CacheResultados / CacheDias opcionales (None = sin cache)
+        self.cache = cache
+        self.cache_dias = cache_dias
 
     # ─────────────────────────────
     # API PÚBLICA
     # ─────────────────────────────
-    def generar(self, desde, hasta, agrupar="Mes", kpis=None):
-
-        # ─── KPIs
+    def generar(
+        self,
+        desde,
+        hasta,
+        agrupar="Mes",
+        kpis=None,
+        secciones=None,
+        formato=FORMATO_FILAS,
+    ):
+
+        # ─── KPIs / secciones / formato
         kpis = self._normalizar_kpis(kpis)
+        secciones = self._normalizar_secciones(secciones)
+        formato = self._normalizar_formato(formato)
 
         # ─── Fechas
         desde, hasta = self._normalizar_fechas(desde, hasta)
         if not desde or not hasta or desde > hasta:
             return self._resultado_error(kpis, "Rango de fechas inválido")
 
+        # ─── Cache de resultados
+        if self.cache is None:
+            return self._generar(
+                desde, hasta, agrupar, kpis, secciones, formato
+            )
+
+        return self.cache.obtener(
+            self._clave_cache(
+                desde, hasta, agrupar, kpis, secciones, formato
+            ),
+            hasta,
+            lambda: self._generar(
+                desde, hasta, agrupar, kpis, secciones, formato
+            ),
+        )
+
+    def clave_cache(
+        self,
+        desde,
+        hasta,
+        agrupar="Mes",
+        kpis=None,
+        secciones=None,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Clave del cache de resultados que usaría generar() con
+        los mismos argumentos (None si el rango es inválido).
+        """
+        kpis = self._normalizar_kpis(kpis)
+        secciones = self._normalizar_secciones(secciones)
+        formato = self._normalizar_formato(formato)
+
+        desde, hasta = self._normalizar_fechas(desde, hasta)
+        if not desde or not hasta or desde > hasta:
+            return None
+
+        return self._clave_cache(
+            desde, hasta, agrupar, kpis, secciones, formato
+        )
+
+    def etag(
+        self,
+        desde,
+        hasta,
+        agrupar="Mes",
+        kpis=None,
+        secciones=None,
+        formato=FORMATO_FILAS,
+        resultado=None,
+    ):
+        """
+        ETag (débil) de la entrada VIGENTE del cache de resultados
+        para estos argumentos, SIN calcular el reporte.
+
+        Huella de: request normalizado + versión de la entrada
+        (cambia cada vez que el payload se recalcula). Caduca con
+        la entrada (TTL del cache): un 304 nunca sobrevive a los
+        datos que valida.
+
+        Con `resultado`: solo si la entrada es ESE payload.
+        None si el rango es inválido, no hay cache o la entrada
+        no está / venció.
+        """
+        if self.cache is None:
+            return None
+
+        clave = self.clave_cache(desde, hasta, agrupar, kpis, secciones, formato)
+        if clave is None:
+            return None
+
+        version = self.cache.version(clave, resultado)
+        if version is None:
+            return None
+
+        huella = repr((clave, version))
+        return 'W/"' + hashlib.sha1(huella.encode("utf-8")).hexdigest() + '"'
+
+    def precalentar(
+        self,
+        desde,
+        hasta,
+        agrupar="Mes",
+        secciones=None,
+        vigencia_minima=0.0,
+        ttl_minimo=None,
+    ) -> bool:
+        """
+        Deja en el cache de resultados el payload que devolvería
+        generar() con estos argumentos (formato "filas").
+
+        Pasa por cache.obtener(): un request en vivo de la misma
+        clave espera este cálculo en vez de repetirlo.
+
+        - vigencia_minima: recalcula si la entrada vence antes
+        - ttl_minimo: alarga el TTL guardado (None = TTL del rango)
+
+        Devuelve True si recalculó.
+        """
+        if self.cache is None:
+            return False
+
+        kpis = self._normalizar_kpis(None)
+        secciones = self._normalizar_secciones(secciones)
+
+        desde, hasta = self._normalizar_fechas(desde, hasta)
+        if not desde or not hasta or desde > hasta:
+            return False
+
+        clave = self._clave_cache(
+            desde, hasta, agrupar, kpis, secciones, FORMATO_FILAS
+        )
+        version = self.cache.version(clave)
+
+        self.cache.obtener(
+            clave,
+            hasta,
+            lambda: self._generar(
+                desde, hasta, agrupar, kpis, secciones, FORMATO_FILAS
+            ),
+            vigencia_minima=vigencia_minima,
+            ttl_minimo=ttl_minimo,
+        )
+
+        return self.cache.version(clave) != version
+
+    def _generar(
+        self,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Pipeline completo para un request YA normalizado.
+        """
+
+        # ─── Cubos por día (solo los días que faltan)
+        if self._usa_cache_dias(agrupar):
+            return self._generar_por_dias(
+                desde, hasta, agrupar, kpis, secciones, formato
+            )
+
         # ─── Filtros Mongo
         filtros = combinar_filtros(
             rango_fechas(desde, hasta)
         )
 
+        # ─── Streaming (lotes + agregación parcial)
+        if self.modo == MODO_STREAMING:
+            return self._generar_streaming(
+                filtros, desde, hasta, agrupar, kpis, secciones, formato
+            )
+
         # ─── Query base
-        raw = cargar_devoluciones_detalle(
-            self.reportes_queries,
-            filtros
-        )
+        raw = self._cargar_base(filtros, desde, hasta, agrupar)
 
         if raw is None or raw.empty:
-            return self._resultado_vacio(kpis, desde, hasta, agrupar)
+            return self._resultado_vacio(
+                kpis, desde, hasta, agrupar, secciones, formato
+            )
 
         # ─── Dimensiones (LECTURA PURA)
         asignaciones = self.reportes_queries.asignaciones_personal()
         personas_map = self.reportes_queries.personas_activas()
 
+        return self._construir(
+            raw,
+            asignaciones,
+            personas_map,
+            desde,
+            hasta,
+            agrupar,
+            kpis,
+            secciones,
+            formato,
+        )
+
+    # ─────────────────────────────
+    # CONSTRUCCIÓN (CPU, SIN I/O)
+    # ─────────────────────────────
+    def _construir(
+        self,
+        raw,
+        asignaciones,
+        personas_map,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Construye el payload a partir de datos YA cargados.
+
+        No consulta Mongo: se puede ejecutar en un hilo aparte
+        (ver AsyncReportesService).
+        """
+
         # ─── DataFrame enriquecido
         df = obtener_dataframe(
             raw,
             asignaciones=asignaciones,
             personas_map=personas_map,
+            inplace=True,
         )
 
         if df is None or df.empty:
-            return self._resultado_vacio(kpis, desde, hasta, agrupar)
-
-        # ─── Normalización
-        df = normalizar_ids(df)
-        df = normalizar_columnas(df, kpis)
-        df = normalizar_tipos(df)
+            return self._resultado_vacio(
+                kpis, desde, hasta, agrupar, secciones, formato
+            )
 
-        df["devoluciones"] = df.get("devoluciones", 1)
-        df["persona_nombre"] = (
-            df.get("persona_nombre", "Sin asignación")
-              .fillna("Sin asignación")
+        return self._construir_df(
+            df,
+            personas_map,
+            desde,
+            hasta,
+            agrupar,
+            kpis,
+            secciones,
+            formato,
         )
 
-        # ─── KPIs globales
-        resumen = {
-            "importe_total": float(df["importe"].sum()) if kpis.get("importe") else 0.0,
-            "piezas_total": int(df["piezas"].sum()) if kpis.get("piezas") else 0,
-            "devoluciones_total": int(df["devoluciones"].sum()) if kpis.get("devoluciones") else 0,
-        }
+    def _generar_streaming(
+        self,
+        filtros,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Dimensiones primero; luego el detalle por lotes,
+        agregado parcialmente lote a lote.
+        """
+        asignaciones = self.reportes_queries.asignaciones_personal()
+        personas_map = self.reportes_queries.personas_activas()
 
-        # ─── GENERAL (serie temporal)
-        periodo = map_periodo(agrupar)
+        lotes = self.reportes_queries.devoluciones_detalle_lotes(
+            filtros,
+            self.tamano_lote,
+        )
 
-        if periodo == "dia":
-            general = serie_por_dia(df, desde, hasta)
-        elif periodo == "semana":
-            general = serie_por_semana(df, desde, hasta)
-        elif periodo == "anio":
-            general = serie_por_anio(df, desde, hasta)
-        else:
-            general = serie_por_mes(df, desde, hasta)
+        try:
+            df = agregar_por_lotes(
+                lotes,
+                asignaciones,
+                personas_map,
+                self.limite_memoria_bytes,
+            )
+        except PresupuestoMemoriaExcedido as e:
+            print("❌ [ReportesService] streaming:", e)
+            return self._resultado_error(
+                kpis,
+                "El reporte excede el límite de memoria configurado; "
+                "reduce el rango de fechas",
+            )
 
-        # ─── PERSONAS
-        por_persona = agrupar_por_persona(
-            self.reportes_queries,
+        if df is None or df.empty:
+            return self._resultado_vacio(
+                kpis, desde, hasta, agrupar, secciones, formato
+            )
+
+        return self._construir_df(
             df,
+            personas_map,
             desde,
             hasta,
+            agrupar,
             kpis,
+            secciones,
+            formato,
         )
 
-        personas_series = agrupar_personas_por_fecha(
+    # ─────────────────────────────
+    # CUBOS POR DÍA (CacheDias)
+    # ─────────────────────────────
+    def _usa_cache_dias(self, agrupar):
+        if self.cache_dias is None or self.modo == MODO_STREAMING:
+            return False
+        if self.modo == MODO_ROLLUP:
+            return map_periodo(agrupar) == "dia"
+        return True
+
+    def _firma_dias(self, asignaciones, personas_map, kpis):
+        """
+        Todo lo que cambia el cubo de un día (ver CacheDias).
+        """
+        return "|".join((
+            self.modo,
+            "importe" if kpis.get("importe") else "sin_importe",
+            firma_dimensiones(asignaciones, personas_map),
+        ))
+
+    def _generar_por_dias(
+        self,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Igual que el camino normal, pero el cubo del rango se arma
+        con los cubos por día: de Mongo solo se leen los tramos de
+        días que no están en cache_dias.
+        """
+        asignaciones = self.reportes_queries.asignaciones_personal()
+        personas_map = self.reportes_queries.personas_activas()
+
+        firma = self._firma_dias(asignaciones, personas_map, kpis)
+        dias = pd.date_range(desde, hasta, freq="D")
+
+        generacion = self.cache_dias.generacion
+        cubos = self.cache_dias.consultar(firma, dias)
+        tramos = tramos_faltantes(dias, cubos)
+
+        raws = [
+            self._cargar_base(
+                combinar_filtros(rango_fechas(d1, d2)), d1, d2, agrupar
+            )
+            for d1, d2 in tramos
+        ]
+
+        return self._construir_por_dias(
+            firma,
+            generacion,
+            cubos,
+            tramos,
+            raws,
+            asignaciones,
+            personas_map,
+            desde,
+            hasta,
+            agrupar,
+            kpis,
+            secciones,
+            formato,
+        )
+
+    def _construir_por_dias(
+        self,
+        firma,
+        generacion,
+        cubos,
+        tramos,
+        raws,
+        asignaciones,
+        personas_map,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Cubos de los tramos leídos → cache_dias; luego el payload
+        sobre la unión de TODOS los días (CPU, sin I/O).
+        """
+        nuevos = self._cubos_tramos(
+            tramos, raws, asignaciones, personas_map, kpis
+        )
+
+        self.cache_dias.guardar(firma, nuevos, generacion)
+        cubos = {**cubos, **nuevos}
+
+        cubo = unir_cubos([
+            cubos[dia] for dia in pd.date_range(desde, hasta, freq="D")
+        ])
+
+        if cubo is None or cubo.empty:
+            return self._resultado_vacio(
+                kpis, desde, hasta, agrupar, secciones, formato
+            )
+
+        return self._vistas(
+            cubo,
+            personas_map,
+            desde,
+            hasta,
+            agrupar,
+            kpis,
+            secciones,
+            formato,
+        )
+
+    def _cubos_tramos(self, tramos, raws, asignaciones, personas_map, kpis):
+        """
+        Filas crudas de cada tramo → {día: cubo del día}.
+        """
+        nuevos = {}
+
+        for (d1, d2), raw in zip(tramos, raws):
+            nuevos.update(partir_cubo(
+                self._cubo(raw, asignaciones, personas_map, kpis),
+                pd.date_range(d1, d2, freq="D"),
+            ))
+
+        return nuevos
+
+    def _cubo(self, raw, asignaciones, personas_map, kpis):
+        """
+        Filas crudas → cubo base (enriquecer + normalizar + agrupar).
+        """
+        if raw is None or raw.empty:
+            return None
+
+        df = obtener_dataframe(
+            raw,
+            asignaciones=asignaciones,
+            personas_map=personas_map,
+            inplace=True,
+        )
+
+        if df is None or df.empty:
+            return None
+
+        return construir_cubo(normalizar_reporte(df, kpis))
+
+    # ─────────────────────────────
+    # TABLA EN STREAMING
+    # ─────────────────────────────
+    def tabla_por_bloques(self, desde, hasta, dias_por_bloque=DIAS_POR_BLOQUE):
+        """
+        Tabla de detalle del rango como generador de bloques
+        (lista de filas por bloque de `dias_por_bloque` días).
+
+        - Mismas filas y orden que la sección "tabla" de
+          generar(desde, hasta, "Dia")
+        - Cada bloque se lee (o se toma de cache_dias), se agrega
+          y se entrega ANTES de leer el siguiente: la memoria
+          depende del bloque, no del rango
+        - Rango inválido → no produce bloques
+        """
+        desde, hasta = self._normalizar_fechas(desde, hasta)
+        if not desde or not hasta or desde > hasta:
+            return
+
+        kpis = self._normalizar_kpis(None)
+
+        # ─── Dimensiones (una vez para todo el rango)
+        asignaciones = self.reportes_queries.asignaciones_personal()
+        personas_map = self.reportes_queries.personas_activas()
+
+        firma = (
+            self._firma_dias(asignaciones, personas_map, kpis)
+            if self._usa_cache_dias("Dia") else None
+        )
+
+        dias = pd.date_range(desde, hasta, freq="D")
+        paso = max(int(dias_por_bloque), 1)
+
+        for i in range(0, len(dias), paso):
+            cubo = self._cubo_bloque(
+                dias[i:i + paso],
+                firma,
+                asignaciones,
+                personas_map,
+                kpis,
+            )
+
+            filas = tabla_final(cubo)
+            if filas:
+                yield filas
+
+    def _cubo_bloque(self, dias, firma, asignaciones, personas_map, kpis):
+        """
+        Cubo de un bloque de días consecutivos.
+
+        Con `firma` (cache_dias activo) solo se leen de Mongo
+        los días que faltan, y se guardan para otros requests.
+        """
+        if firma is None:
+            d1, d2 = dias[0].date(), dias[-1].date()
+            raw = self._cargar_base(
+                combinar_filtros(rango_fechas(d1, d2)), d1, d2, "Dia"
+            )
+            return self._cubo(raw, asignaciones, personas_map, kpis)
+
+        generacion = self.cache_dias.generacion
+        cubos = self.cache_dias.consultar(firma, dias)
+        tramos = tramos_faltantes(dias, cubos)
+
+        nuevos = self._cubos_tramos(
+            tramos,
+            [
+                self._cargar_base(
+                    combinar_filtros(rango_fechas(d1, d2)), d1, d2, "Dia"
+                )
+                for d1, d2 in tramos
+            ],
+            asignaciones,
+            personas_map,
+            kpis,
+        )
+
+        self.cache_dias.guardar(firma, nuevos, generacion)
+        cubos = {**cubos, **nuevos}
+
+        return unir_cubos([cubos[dia] for dia in dias])
+
+    # ─────────────────────────────
+    # VISTAS
+    # ─────────────────────────────
+    def _construir_df(
+        self,
+        df,
+        personas_map,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Construye el payload a partir del DataFrame YA enriquecido
+        (persona_id / persona_nombre resueltos).
+        """
+
+        # ─── Normalización (una pasada, en sitio)
+        df = normalizar_reporte(df, kpis)
+
+        # ─── Cubo base: única pasada sobre las filas de detalle.
+        # Todas las vistas (y el resumen) leen el cubo.
+        df = construir_cubo(df)
+
+        return self._vistas(
             df,
-            kpis
+            personas_map,
+            desde,
+            hasta,
+            agrupar,
+            kpis,
+            secciones,
+            formato,
         )
 
-        # ─── OTRAS DIMENSIONES
-        por_zona = agrupa_por_zona(df, kpis)
-        por_pasillo = agrupa_por_pasillo(df, kpis)
+    def _vistas(
+        self,
+        df,
+        personas_map,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Payload final a partir del cubo base (solo lectura).
+
+        Cada sección se calcula SOLO si está en `secciones`;
+        las series salen en el `formato` pedido.
+        """
 
-        # ─── RESULTADO FINAL (CONTRATO FRONTEND)
-        return {
-            "kpis": kpis,
-            "resumen": resumen,
+        # ─── KPIs globales
+        resumen = {
+            "importe_total": float(df["importe"].sum()) if kpis.get("importe") else 0.0,
+            "piezas_total": int(df["piezas"].sum()) if kpis.get("piezas") else 0,
+            "devoluciones_total": int(df["devoluciones"].sum()) if kpis.get("devoluciones") else 0,
+        }
+
+        # ─── SECCIONES (perezosas)
+        periodo = map_periodo(agrupar)
+        columnas = formato == FORMATO_COLUMNAS
 
-            "general": {
+        constructores = {
+            "general": lambda: {
                 "periodo": periodo,
-                "serie": general,
+                "serie": self._serie_general(df, periodo, desde, hasta, columnas),
             },
+            "por_zona": lambda: agrupa_por_zona(df, kpis, columnas),
+            "por_pasillo": lambda: agrupa_por_pasillo(df, kpis, columnas),
+            "por_persona": lambda: agrupar_por_persona(df, kpis),     # tablas / resumen
+            "personas_series": lambda: agrupar_personas_por_fecha(df, kpis, columnas),
+            "tabla": lambda: tabla_final(df),
+        }
 
-            "por_zona": por_zona,
-            "por_pasillo": por_pasillo,
+        # ─── RESULTADO FINAL (CONTRATO FRONTEND, mismo orden de claves)
+        resultado = {
+            "kpis": kpis,
+            "resumen": resumen,
+        }
 
-            # 🔑 PERSONAS (CLAVE PARA UI)
-            "personas": personas_map,          # 👈 MAPA id → nombre
-            "por_persona": por_persona,        # tablas / resumen
-            "personas_series": personas_series,
+        for seccion in SECCIONES:
+            if seccion == "por_persona":
+                # 🔑 PERSONAS (CLAVE PARA UI): siempre
+                resultado["personas"] = personas_map   # 👈 MAPA id → nombre
 
-            "tabla": tabla_final(df),
-        }
+            if seccion in secciones:
+                resultado[seccion] = constructores[seccion]()
+
+        return resultado
+
+    def _serie_general(self, df, periodo, desde, hasta, columnas=False):
+        if periodo == "dia":
+            return serie_por_dia(df, desde, hasta, columnas)
+        if periodo == "semana":
+            return serie_por_semana(df, desde, hasta, columnas)
+        if periodo == "anio":
+            return serie_por_anio(df, desde, hasta, columnas)
+        return serie_por_mes(df, desde, hasta, columnas)
 
     # ─────────────────────────────
     # HELPERS
     # ─────────────────────────────
+    def _cargar_base(self, filtros, desde, hasta, agrupar):
+        if self.modo == MODO_ROLLUP and map_periodo(agrupar) != "dia":
+            return cargar_devoluciones_rollup(
+                self.reportes_queries,
+                desde,
+                hasta
+            )
+
+        if self.modo == MODO_DIARIO:
+            return cargar_devoluciones_diarias(
+                self.reportes_queries,
+                filtros
+            )
+
+        return cargar_devoluciones_detalle(
+            self.reportes_queries,
+            filtros
+        )
+
+    def _clave_cache(
+        self,
+        desde,
+        hasta,
+        agrupar,
+        kpis,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Request normalizado → clave del cache de resultados.
+        """
+        return (
+            desde,
+            hasta,
+            map_periodo(agrupar),
+            tuple(sorted(kpis.items())),
+            secciones,
+            formato,
+            self.modo,
+        )
+
+    def _normalizar_secciones(self, secciones):
+        """
+        Secciones pedidas → tupla en el orden de SECCIONES
+        (sin repetidos ni desconocidas). Vacío / None = todas.
+        """
+        if not secciones:
+            return SECCIONES
+
+        pedidas = set(secciones)
+        return tuple(s for s in SECCIONES if s in pedidas) or SECCIONES
+
+    def _normalizar_formato(self, formato):
+        """
+        Formato desconocido / None → "filas" (contrato original).
+        """
+        return formato if formato in FORMATOS else FORMATO_FILAS
+
     def _normalizar_kpis(self, kpis):
         if not kpis:
             return {
@@ -199,26 +896,54 @@ class ReportesService:
             return None, None
         return d.date(), h.date()
 
-    def _resultado_vacio(self, kpis, desde, hasta, agrupar):
-        return {
+    def _resultado_vacio(
+        self,
+        kpis,
+        desde,
+        hasta,
+        agrupar,
+        secciones=SECCIONES,
+        formato=FORMATO_FILAS,
+    ):
+        """
+        Payload de un rango sin filas: mismas claves que
+        _vistas() para las mismas `secciones`.
+        """
+        columnas = formato == FORMATO_COLUMNAS
+
+        vacias = {
+            "general": lambda: {
+                "periodo": map_periodo(agrupar),
+                "serie": serie_vacia_columnas() if columnas else [],
+            },
+            "por_zona": dict,
+            "por_pasillo": dict,
+            "por_persona": dict,
+            "personas_series": lambda: (
+                agrupar_personas_por_fecha(None, kpis, columnas=True)
+                if columnas else {}
+            ),
+            "tabla": list,
+        }
+
+        resultado = {
             "kpis": kpis,
             "resumen": {
                 "importe_total": 0.0,
                 "piezas_total": 0,
                 "devoluciones_total": 0,
             },
-            "general": {
-                "periodo": map_periodo(agrupar),
-                "serie": [],
-            },
-            "por_zona": {},
-            "por_pasillo": {},
-            "personas": {},
-            "por_persona": {},
-            "personas_series": {},
-            "tabla": [],
         }
 
+        for seccion in SECCIONES:
+            if seccion == "por_persona":
+                resultado["personas"] = {}
+
+            if seccion in secciones:
+                resultado[seccion] = vacias[seccion]()
+
+        return resultado
+
     def _resultado_error(self, kpis, mensaje):
         return {
             "kpis": kpis,
@@ -1,5 +1,6 @@
 from .periodo import map_periodo
 from .series import (
+    serie_vacia_columnas,
     serie_por_dia,
     serie_por_semana,
     serie_por_mes,
@@ -9,6 +10,7 @@ from .series import (
 
 __all__ = [
     "map_periodo",
+    "serie_vacia_columnas",
     "serie_por_dia",
     "serie_por_semana",
     "serie_por_mes",
@@ -1,6 +1,14 @@
+
 from datetime import date
+import numpy as np
 import pandas as pd
 
+from backend.services.reportes.aggregations.segmentos import segmentos, sumas
+from backend.services.reportes.normalization.dtypes import como_categoria
+
+
+KPIS_SERIE = ["importe", "piezas", "devoluciones"]
+
 
 # ======================================================
 # Helpers internos
@@ -19,71 +27,220 @@ def _punto_vacio(key: str, label: str) -> dict:
     }
 
 
-def _construir_punto(key: str, label: str, bloque: pd.DataFrame) -> dict:
-    personas = []
+def _kpis(importe, piezas, devoluciones) -> dict:
+    return {
+        "importe": float(importe),
+        "piezas": int(piezas),
+        "devoluciones": int(devoluciones),
+    }
+
+
+def _dtype(col: str):
+    return np.float64 if col == "importe" else np.int64
 
-    for pid, p in bloque.groupby("persona_id", dropna=False):
-        personas.append({
-            "id": pid,
-            "nombre": p["persona_nombre"].iloc[0],
-            "kpis": {
-                "importe": float(p["importe"].sum()),
-                "piezas": int(p["piezas"].sum()),
-                "devoluciones": int(p["devoluciones"].sum()),
-            }
-        })
 
+def serie_vacia_columnas() -> dict:
+    """
+    Serie en columnas sin puntos (equivalente a []).
+    """
     return {
-        "key": key,
-        "label": label,
-        "kpis": {
-            "importe": float(bloque["importe"].sum()),
-            "piezas": int(bloque["piezas"].sum()),
-            "devoluciones": int(bloque["devoluciones"].sum()),
+        "key": [],
+        "label": [],
+        "kpis": {c: [] for c in KPIS_SERIE},
+        "personas": {
+            "id": [],
+            "nombre": [],
+            "kpis": {c: [] for c in KPIS_SERIE},
         },
-        "personas": personas
     }
 
 
-# ======================================================
-# SERIE POR DÍA
-# ======================================================
-
-def serie_por_dia(df: pd.DataFrame, desde: date, hasta: date) -> list[dict]:
-    if df is None or df.empty:
-        return []
+def _serie(
+    df: pd.DataFrame,
+    slot: pd.Series,
+    calendario: pd.Index,
+    claves: list[str],
+    etiquetas: list[str],
+    columnas: bool = False,
+) -> list[dict] | dict:
+    """
+    Motor de bucketing temporal.
+
+    - `slot`: a qué punto del calendario pertenece cada fila
+      (se calcula UNA vez por fila)
+    - Se agrupa por punto (totales) y por (punto, persona)
+      con dos ordenamientos estables, sin recorrer el frame
+      por cada punto
+    - Los puntos del calendario sin filas salen vacíos
+    - columnas=True: ver _serie_columnas
+
+    Filas fuera del calendario se ignoran.
+    """
+    # ─── Punto del calendario de cada fila (-1 = fuera)
+    pos = calendario.get_indexer(slot)
+    filas = np.flatnonzero(pos >= 0)
+    pos = pos[filas]
+
+    if not len(filas) and not columnas:
+        return [_punto_vacio(k, l) for k, l in zip(claves, etiquetas)]
+
+    kpis = {c: df[c].to_numpy()[filas] for c in KPIS_SERIE}
+
+    # ─── persona_id en orden de categoría, nulos al final
+    persona_id = como_categoria(df["persona_id"])
+    persona = persona_id.cat.codes.to_numpy()[filas].astype(np.int64)
+    ids = persona_id.cat.categories
+    persona[persona < 0] = len(ids)
+
+    ids = ids.tolist() + [np.nan]
+    nombres = df["persona_nombre"].to_numpy()[filas]
+
+    if columnas:
+        return _serie_columnas(pos, kpis, persona, ids, nombres, claves, etiquetas)
+
+    # ─── Totales por punto
+    orden, inicios, fines = segmentos(pos)
+    totales = {
+        p: tuple(valores)
+        for p, *valores in zip(
+            pos[orden][inicios],
+            *(sumas(kpis[c], orden, inicios, fines) for c in KPIS_SERIE),
+        )
+    }
 
-    df = df.copy()
-    df["dia"] = df["fecha"].dt.date
+    # ─── Desglose por (punto, persona)
+    orden, inicios, fines = segmentos(pos * (len(ids) + 1) + persona)
+    personas = [[] for _ in calendario]
+
+    for p, pid, nombre, importe, piezas, devoluciones in zip(
+        pos[orden][inicios],
+        persona[orden][inicios],
+        nombres[orden][inicios],
+        *(sumas(kpis[c], orden, inicios, fines) for c in KPIS_SERIE),
+    ):
+        personas[p].append({
+            "id": ids[pid],
+            "nombre": nombre,
+            "kpis": _kpis(importe, piezas, devoluciones),
+        })
 
+    # ─── Calendario completo
     salida = []
 
-    for d in pd.date_range(desde, hasta, freq="D").date:
-        bloque = df[df["dia"] == d]
+    for p, (key, label) in enumerate(zip(claves, etiquetas)):
+        if p not in totales:
+            salida.append(_punto_vacio(key, label))
+            continue
 
-        if bloque.empty:
-            salida.append(_punto_vacio(str(d), str(d)))
-        else:
-            salida.append(
-                _construir_punto(str(d), str(d), bloque)
-            )
+        salida.append({
+            "key": key,
+            "label": label,
+            "kpis": _kpis(*totales[p]),
+            "personas": personas[p],
+        })
 
     return salida
 
 
+def _serie_columnas(pos, kpis, persona, ids, nombres, claves, etiquetas) -> dict:
+    """
+    Misma serie en columnas, directo de los arreglos de sumas:
+
+    {
+      "key": [...], "label": [...],
+      "kpis": {"importe": [...], "piezas": [...], "devoluciones": [...]},
+      "personas": {
+        "id": [...], "nombre": [...],
+        "kpis": {"importe": [[...]], ...}    # persona × punto
+      }
+    }
+
+    - Un arreglo por KPI, alineado con el calendario
+    - Desglose por persona como matriz (0 = sin filas)
+    - Personas en el orden de la serie en filas
+      (categoría, nulos al final)
+    """
+    n = len(claves)
+
+    if not len(pos):
+        vacia = serie_vacia_columnas()
+        vacia.update({
+            "key": claves,
+            "label": etiquetas,
+            "kpis": {c: np.zeros(n, dtype=_dtype(c)) for c in KPIS_SERIE},
+        })
+        return vacia
+
+    # ─── Totales por punto
+    orden, inicios, fines = segmentos(pos)
+    puntos = pos[orden][inicios]
+
+    totales = {}
+    for c in KPIS_SERIE:
+        totales[c] = np.zeros(n, dtype=_dtype(c))
+        totales[c][puntos] = sumas(kpis[c], orden, inicios, fines)
+
+    # ─── Matrices persona × punto
+    orden, inicios, fines = segmentos(pos * (len(ids) + 1) + persona)
+    primeras = orden[inicios]
+
+    presentes, fila = np.unique(persona[primeras], return_inverse=True)
+    _, primera = np.unique(fila, return_index=True)
+
+    matrices = {}
+    for c in KPIS_SERIE:
+        matrices[c] = np.zeros((len(presentes), n), dtype=_dtype(c))
+        matrices[c][fila, pos[primeras]] = sumas(kpis[c], orden, inicios, fines)
+
+    return {
+        "key": claves,
+        "label": etiquetas,
+        "kpis": totales,
+        "personas": {
+            "id": [ids[p] for p in presentes],
+            "nombre": nombres[primeras][primera].tolist(),
+            "kpis": matrices,
+        },
+    }
+
+
+# ======================================================
+# SERIE POR DÍA
+# ======================================================
+
+def serie_por_dia(
+    df: pd.DataFrame, desde: date, hasta: date, columnas: bool = False
+) -> list[dict] | dict:
+    if df is None or df.empty:
+        return serie_vacia_columnas() if columnas else []
+
+    calendario = pd.date_range(desde, hasta, freq="D")
+    claves = [str(d) for d in calendario.date]
+
+    return _serie(
+        df,
+        df["fecha"].dt.normalize(),
+        calendario,
+        claves,
+        claves,
+        columnas,
+    )
+
+
 # ======================================================
 # SERIE POR SEMANA (ISO - lunes)
 # ======================================================
 
-def serie_por_semana(df: pd.DataFrame, desde: date, hasta: date) -> list[dict]:
+def serie_por_semana(
+    df: pd.DataFrame, desde: date, hasta: date, columnas: bool = False
+) -> list[dict] | dict:
     if df is None or df.empty:
-        return []
+        return serie_vacia_columnas() if columnas else []
 
-    df = df.copy()
-    df["semana"] = (
-        df["fecha"] -
+    semana = (
+        df["fecha"].dt.normalize() -
         pd.to_timedelta(df["fecha"].dt.weekday, unit="D")
-    ).dt.date
+    )
 
     inicio = pd.to_datetime(desde) - pd.to_timedelta(
         pd.to_datetime(desde).weekday(), unit="D"
@@ -92,76 +249,60 @@ def serie_por_semana(df: pd.DataFrame, desde: date, hasta: date) -> list[dict]:
         6 - pd.to_datetime(hasta).weekday(), unit="D"
     )
 
-    salida = []
-
-    for s in pd.date_range(inicio, fin, freq="W-MON").date:
-        bloque = df[df["semana"] == s]
-
-        label = f"Semana {s}"
+    calendario = pd.date_range(inicio, fin, freq="W-MON")
+    claves = [str(s) for s in calendario.date]
 
-        if bloque.empty:
-            salida.append(_punto_vacio(str(s), label))
-        else:
-            salida.append(
-                _construir_punto(str(s), label, bloque)
-            )
-
-    return salida
+    return _serie(
+        df,
+        semana,
+        calendario,
+        claves,
+        [f"Semana {s}" for s in claves],
+        columnas,
+    )
 
 
 # ======================================================
 # SERIE POR MES
 # ======================================================
 
-def serie_por_mes(df: pd.DataFrame, desde: date, hasta: date) -> list[dict]:
+def serie_por_mes(
+    df: pd.DataFrame, desde: date, hasta: date, columnas: bool = False
+) -> list[dict] | dict:
     if df is None or df.empty:
-        return []
-
-    df = df.copy()
-    df["mes"] = df["fecha"].dt.to_period("M")
-
-    salida = []
-
-    for m in pd.period_range(desde, hasta, freq="M"):
-        bloque = df[df["mes"] == m]
-
-        key = str(m)
-        label = str(m)
-
-        if bloque.empty:
-            salida.append(_punto_vacio(key, label))
-        else:
-            salida.append(
-                _construir_punto(key, label, bloque)
-            )
-
-    return salida
+        return serie_vacia_columnas() if columnas else []
+
+    calendario = pd.period_range(desde, hasta, freq="M")
+    claves = [str(m) for m in calendario]
+
+    return _serie(
+        df,
+        df["fecha"].dt.to_period("M"),
+        calendario,
+        claves,
+        claves,
+        columnas,
+    )
 
 
 # ======================================================
 # SERIE POR AÑO
 # ======================================================
 
-def serie_por_anio(df: pd.DataFrame, desde: date, hasta: date) -> list[dict]:
+def serie_por_anio(
+    df: pd.DataFrame, desde: date, hasta: date, columnas: bool = False
+) -> list[dict] | dict:
     if df is None or df.empty:
-        return []
-
-    df = df.copy()
-    df["anio"] = df["fecha"].dt.year
-
-    salida = []
-
-    for a in range(desde.year, hasta.year + 1):
-        bloque = df[df["anio"] == a]
-
-        key = str(a)
-        label = str(a)
-
-        if bloque.empty:
-            salida.append(_punto_vacio(key, label))
-        else:
-            salida.append(
-                _construir_punto(key, label, bloque)
-            )
-
-    return salida
+        return serie_vacia_columnas() if columnas else []
+
+    calendario = pd.Index(range(desde.year, hasta.year + 1))
+    claves = [str(a) for a in calendario]
+
+    return _serie(
+        df,
+        df["fecha"].dt.year,
+        calendario,
+        claves,
+        claves,
+        columnas,
+    )
@@ -0,0 +1,228 @@
+"""
+Serialización Arrow IPC del payload de reportes.
+
+RESPONSABILIDAD:
+- Convertir un payload en formato "columnas" (ver ReportesService)
+  en UNA tabla Arrow por sección, en formato largo (tidy)
+- Los arreglos NumPy de las series pasan a Arrow SIN copia;
+  las matrices persona × punto se aplanan como vista
+
+FORMATO DE SALIDA:
+- Streams IPC concatenados, uno por sección; la metadata del
+  schema lleva {"seccion": <nombre>} (+ "periodo" en general)
+- Lectura (cliente):
+
+      buf = pa.BufferReader(cuerpo)
+      while buf.tell() < buf.size():
+          r = pa.ipc.open_stream(buf)
+          seccion = r.schema.metadata[b"seccion"].decode()
+          tablas[seccion] = r.read_all()
+
+NO HACE:
+- Calcular secciones (recibe el payload ya armado)
+- Resúmenes derivables (por zona / pasillo / persona):
+  se obtienen agrupando la tabla de la sección
+"""
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+MEDIA_TYPE_ARROW = "application/vnd.apache.arrow.stream"
+
+KPIS = ("importe", "piezas", "devoluciones")
+
+
+# ─────────────────────────────
+# HELPERS
+# ─────────────────────────────
+def _texto(valores) -> list:
+    """
+    ids / nombres → str o None (NaN / None = nulo).
+    """
+    return [
+        v if isinstance(v, str)
+        else None if v is None or v != v
+        else str(v)
+        for v in valores
+    ]
+
+
+def _tabla(seccion: str, columnas: dict, **metadata) -> "pa.Table":
+    return pa.table(
+        {nombre: pa.array(valores) for nombre, valores in columnas.items()},
+        metadata={"seccion": seccion, **metadata},
+    )
+
+
+def _largo(ids, nombres, claves, matrices, clave="key") -> dict:
+    """
+    Matrices persona × punto → columnas en formato largo
+    (una fila por persona y punto; 0 = sin filas).
+    """
+    n = len(claves)
+
+    columnas = {
+        "persona_id": np.repeat(np.array(_texto(ids), dtype=object), n),
+        "nombre": np.repeat(np.array(_texto(nombres), dtype=object), n),
+        clave: np.tile(np.array(claves, dtype=object), len(ids)),
+    }
+
+    for kpi in KPIS:
+        if kpi in matrices:
+            columnas[kpi] = np.asarray(matrices[kpi]).reshape(-1)
+
+    return columnas
+
+
+# ─────────────────────────────
+# SECCIONES
+# ─────────────────────────────
+def _resumen(resumen: dict):
+    return _tabla("resumen", {k: [v] for k, v in resumen.items()})
+
+
+def _general(general: dict):
+    serie = general["serie"]
+
+    tabla = _tabla(
+        "general",
+        {
+            "key": serie["key"],
+            "label": serie["label"],
+            **{kpi: serie["kpis"][kpi] for kpi in KPIS},
+        },
+        periodo=general["periodo"],
+    )
+
+    personas = serie["personas"]
+    desglose = _tabla(
+        "general_personas",
+        _largo(
+            personas["id"],
+            personas["nombre"],
+            serie["key"],
+            personas["kpis"],
+        ),
+        periodo=general["periodo"],
+    )
+
+    return tabla, desglose
+
+
+def _por_dimension(seccion: str, dimension: str, grupos: dict):
+    """
+    por_zona / por_pasillo → (dimension, fecha, KPIs).
+    """
+    series = [g["series"] for g in grupos.values()]
+    kpis = [k for k in KPIS if series and k in series[0]]
+
+    columnas = {
+        dimension: np.repeat(
+            np.array(list(grupos), dtype=object),
+            [len(s["fecha"]) for s in series],
+        ),
+        "fecha": [f for s in series for f in s["fecha"]],
+    }
+
+    for kpi in kpis:
+        columnas[kpi] = np.concatenate([s[kpi] for s in series])
+
+    return _tabla(seccion, columnas)
+
+
+def _personas(personas: dict):
+    return _tabla("personas", {
+        "persona_id": _texto(personas.keys()),
+        "nombre": _texto(personas.values()),
+    })
+
+
+def _por_persona(por_persona: dict):
+    """
+    Tabla de cada persona, concatenada con su persona_id.
+    """
+    filas = []
+    ids = []
+
+    for persona_id, datos in por_persona.items():
+        filas.extend(datos["tabla"])
+        ids.extend([persona_id] * len(datos["tabla"]))
+
+    tabla = pa.Table.from_pylist(filas)
+    tabla = tabla.add_column(0, "persona_id", pa.array(_texto(ids), pa.string()))
+
+    return tabla.replace_schema_metadata({"seccion": "por_persona"})
+
+
+def _personas_series(series: dict):
+    return _tabla(
+        "personas_series",
+        _largo(
+            series["id"],
+            series["nombre"],
+            series["key"],
+            series["kpis"],
+        ),
+    )
+
+
+def _tabla_detalle(filas: list):
+    return pa.Table.from_pylist(filas).replace_schema_metadata({"seccion": "tabla"})
+
+
+# ─────────────────────────────
+# API
+# ─────────────────────────────
+def tablas_arrow(payload: dict) -> list:
+    """
+    Payload (formato "columnas") → [pa.Table], una por sección
+    presente, en el orden del payload.
+    """
+    tablas = [_resumen(payload["resumen"])]
+
+    if payload.get("general"):
+        tablas.extend(_general(payload["general"]))
+
+    if "por_zona" in payload:
+        tablas.append(_por_dimension("por_zona", "zona", payload["por_zona"]))
+
+    if "por_pasillo" in payload:
+        tablas.append(
+            _por_dimension("por_pasillo", "pasillo", payload["por_pasillo"])
+        )
+
+    if "personas" in payload:
+        tablas.append(_personas(payload["personas"]))
+
+    if "por_persona" in payload:
+        tablas.append(_por_persona(payload["por_persona"]))
+
+    if "personas_series" in payload:
+        tablas.append(_personas_series(payload["personas_series"]))
+
+    if "tabla" in payload:
+        tablas.append(_tabla_detalle(payload["tabla"]))
+
+    return tablas
+
+
+def serializar_arrow(payload: dict) -> bytes:
+    """
+    Payload (formato "columnas") → bytes Arrow IPC
+    (un stream por sección, ver docstring del módulo).
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow no está instalado")
+
+    sink = pa.BufferOutputStream()
+
+    for tabla in tablas_arrow(payload):
+        with pa.ipc.new_stream(sink, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+
+    return sink.getvalue().to_pybytes()
@@ -1,3 +1,4 @@
+import json
 import math
 import numpy as np
 from datetime import datetime, date
@@ -8,6 +9,19 @@ try:
 except ImportError:
     pd = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# numpy (escalares y arrays) y claves no-str sin pasar por Python
+OPCIONES_ORJSON = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if orjson
+    else 0
+)
+
 
 def limpiar_json(obj):
     """
@@ -15,7 +29,7 @@ def limpiar_json(obj):
     reportes existentes.
 
     - Convierte NaN / inf / -inf → None
-    - Soporta numpy scalar
+    - Soporta numpy scalar / ndarray
     - Soporta datetime / date
     - Soporta pandas Timestamp / Period (solo si pandas existe)
     - Soporta Decimal
@@ -31,6 +45,10 @@ def limpiar_json(obj):
     if isinstance(obj, np.generic):
         return limpiar_json(obj.item())
 
+    # ───────── numpy array (series en columnas) ─────────
+    if isinstance(obj, np.ndarray):
+        return limpiar_json(obj.tolist())
+
     # ───────── datetime estándar ─────────
     if isinstance(obj, (datetime, date)):
         return obj.isoformat()
@@ -54,3 +72,46 @@ def limpiar_json(obj):
         return [limpiar_json(v) for v in obj]
 
     return obj
+
+
+def _por_defecto(obj):
+    """
+    Tipos que orjson no conoce: mismo resultado que limpiar_json.
+    """
+    if pd:
+        if isinstance(obj, pd.Timestamp) or obj is pd.NaT:
+            return obj.isoformat()
+        if isinstance(obj, pd.Period):
+            return str(obj)
+
+    if isinstance(obj, Decimal):
+        return float(obj)
+
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return limpiar_json(obj)
+
+    raise TypeError(f"Tipo no serializable: {type(obj).__name__}")
+
+
+def serializar_json(obj) -> bytes:
+    """
+    Serializa el payload de un reporte a bytes JSON (UTF-8).
+
+    - Con orjson: numpy, datetime / date y NaN / inf → null
+      se resuelven en código nativo, sin recorrer el payload
+      en Python
+    - Sin orjson: limpiar_json + json estándar (mismo formato
+      que JSONResponse de Starlette)
+
+    Ambos caminos producen el MISMO JSON.
+    """
+    if orjson:
+        return orjson.dumps(obj, default=_por_defecto, option=OPCIONES_ORJSON)
+
+    return json.dumps(
+        limpiar_json(obj),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
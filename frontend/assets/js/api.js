@@ -63,9 +63,14 @@ export async function apiGet(path, params = {}) {
   const url = new URL(API_CONFIG.BASE_URL + path);
 
   Object.entries(params).forEach(([key, value]) => {
-    if (value !== undefined && value !== '') {
-      url.searchParams.append(key, value);
-    }
+    // Arrays → clave repetida (?k=a&k=b), como espera FastAPI
+    const valores = Array.isArray(value) ? value : [value];
+
+    valores.forEach(v => {
+      if (v !== undefined && v !== '') {
+        url.searchParams.append(key, v);
+      }
+    });
   });
 
   return fetchBase(url.toString(), { method: 'GET' });
@@ -93,7 +98,20 @@ export async function generarReporte(filtros = {}) {
     agrupar: filtros.agrupar
   };
 
-  const resultado = await apiPost('/reportes', payload);
+  // Secciones opcionales: cada vista puede pedir solo lo que pinta
+  if (Array.isArray(filtros.secciones) && filtros.secciones.length) {
+    payload.secciones = filtros.secciones;
+  }
+
+  // Formato opcional: 'columnas' = series como arreglos paralelos
+  if (filtros.formato) {
+    payload.formato = filtros.formato;
+  }
+
+  // GET: el navegador guarda la respuesta y revalida con
+  // If-None-Match (304 sin recalcular mientras el reporte
+  // siga vigente en el cache del backend)
+  const resultado = await apiGet('/reportes', payload);
 
   /* =====================================================
      🔑 INYECCIÓN DE CONTEXTO (CLAVE PARA PASILLOS)
@@ -1,3 +1,6 @@
+// Secciones del backend que pinta esta vista
+export const SECCIONES_DETALLE = ['tabla'];
+
 // ─────────────────────────────
 // ESTADO INTERNO
 // ─────────────────────────────
@@ -17,6 +17,9 @@
 
 import { renderLineChart } from '/assets/js/charts.js';
 
+// Secciones del backend que pinta esta vista
+export const SECCIONES_GENERAL = ['general'];
+
 // ─────────────────────────────
 // Estado interno persistente
 // ─────────────────────────────
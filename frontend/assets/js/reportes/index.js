@@ -6,7 +6,8 @@
  * RESPONSABILIDADES:
  * - Renderizar estructura base del dashboard
  * - Inicializar filtros
- * - Pedir datos al backend
+ * - Pedir al backend SOLO las secciones de la pestaña visible
+ *   (las demás se piden al activar su pestaña)
  * - Distribuir resultados a las vistas
  *
  * NO HACE:
@@ -19,17 +20,29 @@
 // ─────────────────────────────
 
 // Vistas legacy (event-driven)
-import './general.js';
-import './pasillos.js';
-import './zonas.js';
-import './detalle.js';
+import { SECCIONES_GENERAL } from './general.js';
+import { SECCIONES_PASILLOS } from './pasillos.js';
+import { SECCIONES_ZONAS } from './zonas.js';
+import { SECCIONES_DETALLE } from './detalle.js';
 
 // Personas (arquitectura nueva)
-import { cargarResultadoPersonas } from './personas/index.js';
+import {
+  cargarResultadoPersonas,
+  SECCIONES_PERSONAS
+} from './personas/index.js';
 
 // Infraestructura
 import { generarReporte } from '../api.js';
-import { iniciarTabsReportes } from '../router.js';
+import { iniciarTabsReportes, getTabActiva } from '../router.js';
+
+// Secciones del backend que necesita cada pestaña
+const SECCIONES_POR_TAB = {
+  general: SECCIONES_GENERAL,
+  pasillos: SECCIONES_PASILLOS,
+  personas: SECCIONES_PERSONAS,
+  zonas: SECCIONES_ZONAS,
+  detalle: SECCIONES_DETALLE
+};
 
 /* ======================================================
    ESTADO ÚNICO (fuente de verdad)
@@ -38,6 +51,9 @@ let resultadoActual = null;
 let filtrosActuales = null;
 let inicializado = false;
 
+// Secciones ya presentes en resultadoActual (filtros actuales)
+let seccionesCargadas = new Set();
+
 // Candado de concurrencia
 let cargando = false;
 
@@ -152,6 +168,11 @@ function initEventosGlobales() {
 
     actualizarReportes();
   });
+
+  // Pestaña nueva: pedir solo las secciones que le faltan
+  window.addEventListener('reportes:tab-activada', () => {
+    if (filtrosActuales) cargarSeccionesFaltantes();
+  });
 }
 
 /* ======================================================
@@ -160,27 +181,68 @@ function initEventosGlobales() {
 async function actualizarReportes() {
   if (cargando) return;
 
+  // Filtros nuevos: lo cargado ya no sirve
+  resultadoActual = null;
+  seccionesCargadas = new Set();
+
+  await cargarSeccionesFaltantes();
+}
+
+function seccionesFaltantes() {
+  const secciones = SECCIONES_POR_TAB[getTabActiva()] ?? [];
+  return secciones.filter(s => !seccionesCargadas.has(s));
+}
+
+async function cargarSeccionesFaltantes() {
+  if (cargando) return;
+
   cargando = true;
 
   try {
-    resultadoActual = await generarReporte(filtrosActuales);
-    if (!resultadoActual) return;
+    // Se repite: la pestaña o los filtros pueden cambiar
+    // mientras hay un fetch en curso
+    let faltantes = seccionesFaltantes();
+
+    while (faltantes.length) {
+      const filtros = filtrosActuales;
+
+      const parcial = await generarReporte({
+        ...filtros,
+        secciones: faltantes
+      });
+      if (!parcial) return;
 
-    // Vistas legacy
-    window.dispatchEvent(
-      new CustomEvent('reportes:actualizados', {
-        detail: resultadoActual
-      })
-    );
+      if (filtros !== filtrosActuales) {
+        resultadoActual = null;
+        seccionesCargadas = new Set();
+      } else {
+        // Fusionar con las secciones de pestañas anteriores
+        resultadoActual = { ...(resultadoActual ?? {}), ...parcial };
+        faltantes.forEach(s => seccionesCargadas.add(s));
 
-    // Personas
-    cargarResultadoPersonas(resultadoActual);
+        distribuirResultado();
+      }
+
+      faltantes = seccionesFaltantes();
+    }
 
   } finally {
     cargando = false;
   }
 }
 
+function distribuirResultado() {
+  // Vistas legacy
+  window.dispatchEvent(
+    new CustomEvent('reportes:actualizados', {
+      detail: resultadoActual
+    })
+  );
+
+  // Personas
+  cargarResultadoPersonas(resultadoActual);
+}
+
 /* ======================================================
    FILTROS POR DEFECTO
 ====================================================== */
@@ -10,6 +10,9 @@ import { renderLineChart } from '../charts.js';
 const MODOS = ['Individual', 'Comparación', 'Todos separados'];
 const PASILLOS_VALIDOS = ['P1', 'P2', 'P3', 'P4'];
 
+// Secciones del backend que pinta esta vista
+export const SECCIONES_PASILLOS = ['por_pasillo'];
+
 const COLORES = ['#2563eb', '#059669', '#d97706', '#dc2626'];
 const COLORES_BG = [
   'rgba(37,99,235,.15)',
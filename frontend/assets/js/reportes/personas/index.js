@@ -22,6 +22,10 @@ import {
   setKpiActual
 } from './statePersona.js';
 
+// Secciones del backend que pinta esta vista
+// (el mapa `personas` llega siempre)
+export const SECCIONES_PERSONAS = ['por_persona'];
+
 /* ─────────────────────────────
    Render seguro (ENTRY POINT)
 ───────────────────────────── */
@@ -1,3 +1,6 @@
+// Secciones del backend que pinta esta vista
+export const SECCIONES_ZONAS = ['por_zona'];
+
 // ─────────────────────────────
 // ESTADO INTERNO
 // ─────────────────────────────
@@ -28,6 +28,10 @@ export async function iniciarTabsReportes(tabInicial = 'general') {
   await activarTab(tabInicial);
 }
 
+export function getTabActiva() {
+  return tabActiva;
+}
+
 export async function activarTab(tab) {
   if (!TABS.includes(tab)) return;
 